@@ -0,0 +1,143 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# ADIF-to-Cabrillo and ADIF-to-VHFlog log file conversion
+# Version 1.0 (in development)
+#
+# Converts ADIF files (e.g. the wsjtx_log.adi of WSJT-X) to a Cabrillo log or to a VCL .VHFlog logbook. The ADIF
+# records are read and written one at a time, so a 100,000-QSO ADIF file is converted in constant memory. Bands are
+# taken from the ADIF band field or from the frequency, modes are mapped to the Cabrillo modes (the digital modes to
+# DG), and the distance of each QSO is calculated from the grid squares, as done by the logger.
+# Several input files are written one after the other to the same output. .VHFlog logbooks can be given as inputs
+# too, e.g. to merge the WSJT-X QSOs of a rover with the ones logged in VCL into one Cabrillo file:
+#   python3 ADIF-Cab_Convert.py wsjtx_log.adi June_VHF.VHFlog -f cabrillo -c 2 --callsign VE2ZAZ/R -o June_VHF.cab
+#
+# Usage: python3 ADIF-Cab_Convert.py FILE ... [-f cabrillo|vhflog] [-o OUTPUT] [-c CONTEST] [--callsign CALL]
+#                                             [--gridsquare GRID]
+#
+# Website: http://ve2zaz.net
+# Github: https://github.com/VE2ZAZ/VHF_Contest_Logger_Software
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from adif import read_records       # Streaming ADIF reader, shared with the logger
+from log_import import adif_qso_record     # ADIF record to QSO record mapping, shared with the logger import
+from qso_store import QSO_Store
+from log_journal import Log_Journal
+from cabrillo import write_cabrillo
+from contest_tables import CONTESTS
+
+VHFLOG_EXTENSION = ".vhflog"
+OUTPUT_EXTENSIONS = {"cabrillo": ".cab", "vhflog": ".VHFlog"}
+
+
+# Conversion counters of one input file
+class Conversion_Stats:
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.qsos = 0
+        self.skipped = 0        # ADIF records without call sign, date or band
+        self.no_distance = 0    # QSOs without a valid grid square pair, written without distance
+        self.seconds = 0.0
+
+
+# Yields the QSO records of an input file: an ADIF file, streamed, or a .VHFlog logbook (its journal included)
+def input_records(filename, stats, own_gridsquare=""):
+    if (filename.lower().endswith(VHFLOG_EXTENSION)):
+        store = QSO_Store()
+        Log_Journal(store).load(filename, compact=False)
+        for record in store:
+            stats.qsos += 1
+            yield record
+        return
+    with open(filename, 'rb') as file:
+        for fields in read_records(file):
+            record = adif_qso_record(fields, own_gridsquare)
+            if (record is None):
+                stats.skipped += 1
+                continue
+            stats.qsos += 1
+            if (record.distance_stale): stats.no_distance += 1
+            yield record
+
+# Yields the QSO records of all the input files in order, timing each file. The files that cannot be read are
+# reported on stderr and counted in failures.
+def all_records(filenames, stats_list, failures, own_gridsquare=""):
+    for filename in filenames:
+        stats = Conversion_Stats(filename)
+        start = time.perf_counter()
+        try:
+            yield from input_records(filename, stats, own_gridsquare)
+        except OSError as error:
+            print(filename + ": Error: " + (error.strerror or str(error)), file=sys.stderr)
+            failures.append(filename)
+            continue
+        stats.seconds = time.perf_counter() - start
+        stats_list.append(stats)
+
+# Converts the input files to one output file. Returns the list of Conversion_Stats and the list of files not read.
+def convert(filenames, output, output_format, contest_number=0, callsign="", own_gridsquare=""):
+    stats_list = []
+    failures = []
+    records = all_records(filenames, stats_list, failures, own_gridsquare)
+    with open(output, 'w') as file:
+        if (output_format == "vhflog"):
+            file.writelines(record.to_csv_line() for record in records)
+        else:
+            write_cabrillo(file, records, callsign, contest_number, "")    # The claimed score is left to fill in
+    return stats_list, failures
+
+# Station call sign of the Cabrillo header: the station_callsign (or operator) field of the first ADIF record
+def first_station_callsign(filenames):
+    for filename in filenames:
+        if (filename.lower().endswith(VHFLOG_EXTENSION)): continue
+        try:
+            with open(filename, 'rb') as file:
+                for fields in itertools.islice(read_records(file), 1):
+                    return (fields.get('station_callsign', "") or fields.get('operator', "")).strip().upper()
+        except OSError:
+            continue
+    return ""
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converts ADIF files (and VCL .VHFlog logbooks) to a Cabrillo log or a VCL .VHFlog logbook.")
+    parser.add_argument("files", nargs="+", help="ADIF (.adi) files, and .VHFlog logbooks")
+    parser.add_argument("-f", "--format", choices=sorted(OUTPUT_EXTENSIONS), default="cabrillo", help="output format (default cabrillo)")
+    parser.add_argument("-o", "--output", help="output file (default: the first input file with the output format extension)")
+    parser.add_argument("-c", "--contest", type=int, default=0, help="contest number of the Cabrillo header (see VCL_Score.py --list-contests)")
+    parser.add_argument("--callsign", default="", help="station call sign of the Cabrillo header (default: from the first ADIF record)")
+    parser.add_argument("--gridsquare", default="", help="station grid square of the ADIF records without my_gridsquare")
+    args = parser.parse_args(argv)
+    if not(0 <= args.contest < len(CONTESTS)):
+        parser.error("contest number must be between 0 and " + str(len(CONTESTS) - 1))
+    output = args.output or os.path.splitext(args.files[0])[0] + OUTPUT_EXTENSIONS[args.format]
+    if (os.path.abspath(output) in [os.path.abspath(filename) for filename in args.files]):
+        parser.error("the output file is also an input file: " + output)
+    callsign = (args.callsign or first_station_callsign(args.files)).upper()
+    if (args.format == "cabrillo") and (callsign == ""):
+        parser.error("no station call sign in the first ADIF record, give it with --callsign")
+    start = time.perf_counter()
+    stats_list, failures = convert(args.files, output, args.format, args.contest, callsign, args.gridsquare)
+    for stats in stats_list:
+        notes = []
+        if (stats.skipped > 0): notes.append("%d incomplete records skipped" % stats.skipped)
+        if (stats.no_distance > 0): notes.append("%d without distance" % stats.no_distance)
+        print("%s: %d QSOs%s, %.3f s" % (stats.filename, stats.qsos, " (" + ", ".join(notes) + ")" if (notes) else "",
+                                         stats.seconds))
+    print("%d QSOs written to %s in %.3f s" % (sum(stats.qsos for stats in stats_list), output, time.perf_counter() - start))
+    return 1 if (len(failures) > 0) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,12 @@
 # Basic conversion of Cabrillo file to ADIF file. This script is fine-tuned for a typical VHF contest.
 # Note: This script considers FT8 as the only digital mode used during the contest.
 #
+# Usage:
+#   python3 Cab-ADIF_Convert.py                  A file dialog asks for one Cabrillo file
+#   python3 Cab-ADIF_Convert.py FILE|DIR ...     Batch mode: converts all the files given, and the Cabrillo files of the
+#                                                directories given, in parallel. See --help for the options.
+# Each ADIF file is written next to its Cabrillo file (or in --output-dir), with the same name and the .adi extension.
+#
 # Website: http://ve2zaz.net
 # Github: https://github.com/VE2ZAZ/VHF_Contest_Logger_Software
 # Note: Please be forgiving about the coding style and its quality. The author's expertise is hardware, not software...
@@ -17,71 +23,151 @@
 #  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
 #  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
 #  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
-    
+
 # Release History
 #  - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Version 1.1 (in development):
+# - Added a batch mode: files and directories on the command line, converted in parallel by a process pool, with the
+#   QSO count and time of each file. The file dialog remains when no file is given.
+# - The ADIF files now start with an ADIF header, and include the grid squares and the station call sign.
+# - The conversion no longer loops forever on a file without an "END-OF-LOG:" line.
+# - Band and mode names are looked up in tables shared with the logger (band_plan.py). HF QSO frequencies in kHz are
+#   converted to their band.
+# - The files are read and written as streams, without a flush after each QSO and without printing each QSO.
 # Version 1.0 (January 2023):
-# - Initial release.    
+# - Initial release.
 #  - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-import tkinter
-from tkinter import filedialog as fd
+import argparse
+import glob
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from band_plan import cabrillo_to_adif, adif_band     # Cabrillo and ADIF band names, shared with the logger
+from adif import ADIF_Writer    # ADIF record writer, shared with the logger
+from adif_export import CAB_TO_ADIF_MODE    # Cabrillo to ADIF modes, shared with the logger ADIF export
+
+CABRILLO_EXTENSIONS = [".cab", ".log", ".txt"]     # Files converted when a directory is given
+PROGRAM_ID = "VCL Cab-ADIF_Convert"
+PROGRAM_VERSION = "1.1"
+
+
+# ADIF band name and frequency (MHz, "" if none) of the frequency field of a Cabrillo QSO line: a VHF and up band
+# name (e.g. "144", "1.2G") or an HF frequency in kHz (e.g. "14074")
+def cabrillo_frequency(frequency):
+    band = cabrillo_to_adif(frequency)
+    if (band != "") or not(frequency.isdigit()): return band or frequency, ""
+    return adif_band(frequency, 'kHz', frequency), str(int(frequency) / 1000)
 
-cab_band_list = ["1800","3500","5300","7000","10100","14000","18068","21000","24890","28000","50","70","144","222"  ,"432" ,"902" ,"1.2G","2.3G","3.4G","5.7G","10G","24G"   ,"47G","75G","122G" ]
-adi_band_list = ["160m","80m" ,"60m" ,"40m" ,"30m"  ,"20m"  ,"17m"  ,"15m"  ,"12m"  ,"10m"  ,"6m","4m","2m" ,"1.25m","70cm","33cm","23cm","13cm","9cm" ,"6cm" ,"3cm","1.25cm","6mm","4mm","2.5mm"]
-cab_mode_list = ["CW","PH" ,"FM","RY"  ,"DG" ]
-adi_mode_list = ["CW","SSB","FM","RTTY","FT8"]
+# ADIF fields of a Cabrillo QSO line:
+#   QSO: freq mo date       time mycall  mygrid call   grid
+#   QSO: 144  DG 2023-01-21 1927 VA2IW   FN25BK AA2DT  FN12
+# Returns None if the line is not a complete QSO line.
+def cabrillo_qso_fields(line):
+    parts = line.split()
+    if (len(parts) < 8) or (parts[0].upper() != "QSO:"): return None
+    band, frequency = cabrillo_frequency(parts[1].upper())
+    return [("call", parts[7].upper()), ("band", band), ("freq", frequency),
+            ("mode", CAB_TO_ADIF_MODE.get(parts[2].upper(), parts[2].upper())), ("qso_date", parts[3].replace("-", "")),
+            ("time_on", parts[4]), ("gridsquare", parts[8].upper() if (len(parts) > 8) else ""),
+            ("station_callsign", parts[5].upper()), ("my_gridsquare", parts[6].upper())]
 
-root = tkinter.Tk()
-root.withdraw()
+# Converts one Cabrillo file to ADIF. Returns (Cabrillo file name, ADIF file name, QSOs converted, QSO lines
+# skipped, seconds, error message or "").
+def convert_file(cab_filename, adi_filename):
+    start = time.perf_counter()
+    qsos = 0
+    skipped = 0
+    try:
+        with open(cab_filename, "r", errors="replace") as f_cab, open(adi_filename, "w") as f_adi:
+            adi_writer = ADIF_Writer(f_adi, PROGRAM_ID, PROGRAM_VERSION)
+            adi_writer.write_header("Converted from " + os.path.basename(cab_filename))
+            for f_cab_line in f_cab:    # Conversion loop, one QSO entry at a time
+                if (f_cab_line.strip().upper() == "END-OF-LOG:"): break
+                if (f_cab_line[0:4].upper() != "QSO:"): continue    # Header lines
+                fields = cabrillo_qso_fields(f_cab_line)
+                if (fields is None): skipped += 1
+                else:
+                    adi_writer.write_record(fields)
+                    qsos += 1
+    except OSError as error:
+        return cab_filename, adi_filename, qsos, skipped, time.perf_counter() - start, str(error)
+    return cab_filename, adi_filename, qsos, skipped, time.perf_counter() - start, ""
 
-# Select Cabrillo input file using a popup window and open it
-cab_filename = fd.askopenfilename(title="Select Cabrillo File...", filetypes=(("Cabrillo files","*.cab"),("Text files","*.txt"),("All files","*.*")))
-f_cab = open(cab_filename, "t+r")
-# Open and ADIF output file with the same name prefix as the Cabrillo file. 
-adi_filename = os.path.splitext(cab_filename)[0] + ".adi"
-f_adi = open(adi_filename,"t+w")
+# ADIF file name of a Cabrillo file
+def adif_filename(cab_filename, output_dir=None):
+    adi_filename = os.path.splitext(cab_filename)[0] + ".adi"
+    if (output_dir): adi_filename = os.path.join(output_dir, os.path.basename(adi_filename))
+    return adi_filename
 
-# Read first line
-f_cab_line = f_cab.readline()
-#Conversion loop, one QSO entry at a time
-while (f_cab_line != "END-OF-LOG:\n"):
-    if (f_cab_line[0:4] == "QSO:"):     #Search for a QSO entry line
+# Cabrillo files of the command line arguments: the files given, and the Cabrillo files of the directories given
+def cabrillo_files(paths):
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files += sorted(name for name in glob.glob(os.path.join(path, "*"))
+                            if (os.path.splitext(name)[1].lower() in CABRILLO_EXTENSIONS))
+        else: files.append(path)
+    return files
 
-        # Parse cabrillo QSO entry
-        " ".join(f_cab_line.split())        # Remove extra spaces
-        f_cab_line = f_cab_line.replace("\n", "")
-        f_cab_line_list = f_cab_line.split(' ')      # Create list by splitting string by space separator
-        print(f_cab_line_list)        
+# Batch conversion. Returns the program exit status: 0 if all the files were converted, 1 otherwise.
+def batch_convert(paths, output_dir=None, jobs=None):
+    files = cabrillo_files(paths)
+    if (output_dir): os.makedirs(output_dir, exist_ok=True)
+    jobs = min(jobs or os.cpu_count() or 1, max(1, len(files)))
+    start = time.perf_counter()
+    tasks = [(cab_filename, adif_filename(cab_filename, output_dir)) for cab_filename in files]
+    if (jobs == 1): results = [convert_file(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(convert_file, *zip(*tasks)))
+    failures = 0
+    total_qsos = 0
+    for cab_filename, adi_filename, qsos, skipped, seconds, error in results:
+        if (error != ""):
+            print(cab_filename + ": Error: " + error, file=sys.stderr)
+            failures += 1
+            continue
+        total_qsos += qsos
+        print("%s -> %s: %d QSOs%s, %.3f s" % (cab_filename, adi_filename, qsos,
+                                               " (%d incomplete QSO lines skipped)" % skipped if (skipped > 0) else "",
+                                               seconds))
+    print("%d files, %d QSOs converted in %.3f s (%d processes)%s" % (len(results) - failures, total_qsos,
+                                                                     time.perf_counter() - start, jobs,
+                                                                     ", %d files failed" % failures if (failures > 0) else ""))
+    return 1 if (failures > 0) else 0
 
-        # Do some string format conversion (adif different from cabrillo)
-        # Mode replacement using the mode lists
-        for i in range(len(cab_band_list)):
-            if (cab_band_list[i] == f_cab_line_list[1]): f_cab_line_list[1] = adi_band_list[i]
-        # Band replacement using the band lists
-        for i in range(len(cab_mode_list)):
-            if (cab_mode_list[i] == f_cab_line_list[2]): f_cab_line_list[2] = adi_mode_list[i]
-        # Date formatting, no dashes used in ADIF.
-        f_cab_line_list[3] = f_cab_line_list[3].replace("-", "")
-        
-        # Write ADIF line to adi file
-        f_adi_line =    "<call:" + str(len(f_cab_line_list[7])) + ">" + f_cab_line_list[7] \
-                      + "<band:" + str(len(f_cab_line_list[1])) + ">" + f_cab_line_list[1] \
-                      + "<mode:" + str(len(f_cab_line_list[2])) + ">" + f_cab_line_list[2] \
-                      + "<qso_date:" + str(len(f_cab_line_list[3])) + ">" + f_cab_line_list[3] \
-                      + "<time_on:" + str(len(f_cab_line_list[4])) + ">" + f_cab_line_list[4] \
-                      + "<eor>\n"
-        print(f_adi_line)
-        f_adi.write(f_adi_line)
-        f_adi.flush()
-    f_cab_line = f_cab.readline()   # Read next line
-f_adi.close
-f_cab.close
+# Interactive conversion of one file, selected with a file dialog
+def dialog_convert():
+    import tkinter
+    from tkinter import filedialog as fd
+    from tkinter import messagebox
+    root = tkinter.Tk()
+    root.withdraw()
+    # Select Cabrillo input file using a popup window
+    cab_filename = fd.askopenfilename(title="Select Cabrillo File...", filetypes=(("Cabrillo files","*.cab"),("Text files","*.txt"),("All files","*.*")))
+    if not(cab_filename): return 0
+    # The ADIF output file has the same name prefix as the Cabrillo file.
+    cab_filename, adi_filename, qsos, skipped, seconds, error = convert_file(cab_filename, adif_filename(cab_filename))
+    # Display result popup window
+    if (error != ""):
+        messagebox.showerror(title="Conversion Error", message="Conversion Error:\n" + error)
+        return 1
+    messagebox.showinfo(title="Conversion Completed" , message="Conversion Completed.\n" + str(qsos) + " QSOs\nFile Saved:\n" + os.path.basename(adi_filename))
+    print("Conversion Completed.")
+    return 0
 
-# Display result popup window
-tkinter.messagebox.showinfo(title="Conversion Completed" , message="Conversion Completed.\nFile Saved:\n" + os.path.basename(adi_filename))
-print("Conversion Completed.")        
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Converts Cabrillo log files to ADIF. Without file, a file dialog asks for one file.")
+    parser.add_argument("paths", nargs="*", help="Cabrillo files, or directories of Cabrillo files (" + ", ".join(CABRILLO_EXTENSIONS) + ")")
+    parser.add_argument("-o", "--output-dir", help="directory of the ADIF files (default: next to each Cabrillo file)")
+    parser.add_argument("-j", "--jobs", type=int, help="number of files converted in parallel (default: number of CPUs)")
+    args = parser.parse_args(argv)
+    if (len(args.paths) == 0): return dialog_convert()
+    return batch_convert(args.paths, args.output_dir, args.jobs)
 
-# End program
-quit() 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Command-line Cabrillo export: writes the Cabrillo file of a .VHFlog file, without any window (no display needed),
+# with the same claimed score and QSO checks as the logger. The contest, call sign and grid square default to the
+# station settings saved by the logger (config.sav), and the log file to the log open in the logger.
+#
+# Usage: python3 VCL_Cabrillo.py [<log file>] [-c <contest number>] [--callsign CALL] [--gridsquare GRID]
+#                                [-o <Cabrillo file>] [--config <config.sav file>]
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import sys
+import time
+
+from contest_tables import CONTESTS
+from cabrillo import export_cabrillo, cabrillo_filename
+from station_settings import Station_Settings, read_station_settings, CONFIG_FILE
+from VCL_Score import score_log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Writes the Cabrillo file of a VCL .VHFlog file, without opening the logger.")
+    parser.add_argument("log", nargs="?", metavar="LOGFILE", help=".VHFlog file (default: the log open in the logger)")
+    parser.add_argument("-c", "--contest", type=int, choices=range(1, len(CONTESTS)), metavar="NUMBER",
+                        help="contest number (default: the logger's contest, see VCL_Score.py --list-contests)")
+    parser.add_argument("--callsign", help="station call sign (default: the logger's)")
+    parser.add_argument("--gridsquare", help="station grid square of the header (default: the logger's)")
+    parser.add_argument("-o", "--output", help="Cabrillo file (default: the log file with the .cablog extension)")
+    parser.add_argument("--config", default=CONFIG_FILE, help="logger config file (default " + CONFIG_FILE + ")")
+    args = parser.parse_args(argv)
+    try:
+        settings = read_station_settings(args.config)
+    except (OSError, ValueError):
+        settings = Station_Settings()   # Everything must then be given on the command line
+    log_file = args.log or settings.log_file
+    contest_number = args.contest or settings.contest_number
+    callsign = (args.callsign or settings.callsign).upper()
+    gridsquare = (args.gridsquare or settings.gridsquare).upper()
+    if (log_file == ""): parser.error("no log file given, and no log open in the logger")
+    if not(1 <= contest_number < len(CONTESTS)): parser.error("no contest number given, and no contest selected in the logger")
+    if (callsign == ""): parser.error("no call sign given, and none in the logger settings")
+    output = args.output or cabrillo_filename(log_file)
+    start = time.perf_counter()
+    try:
+        store, dupe_index, engine = score_log(log_file, contest_number)
+        errors = export_cabrillo(output, store, callsign, contest_number, engine.score(), gridsquare)
+    except (OSError, UnicodeDecodeError) as error:
+        print("Error: " + str(error), file=sys.stderr)
+        return 1
+    for record, message in errors: print("  " + message + ": " + record.to_listbox_line().rstrip(), file=sys.stderr)
+    print(str(len(store)) + " QSOs of " + log_file + " (" + CONTESTS[contest_number] + ") written to " + output
+          + " in %.3f s" % (time.perf_counter() - start) + (", " + str(len(errors)) + " QSO errors" if (errors) else ""))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Command-line log checker: scores one or more .VHFlog files for a contest, without any window (no display needed).
+# For each log, prints the dupes, the QSO points, the multiplier, the total distance and the claimed score, with the
+# same contest tables and score engine as the logger. The log files are never modified; a journal left by a crash
+# is replayed in memory.
+#
+# Usage: python3 VCL_Score.py -c <contest number> <log file> [<log file> ...]
+#        python3 VCL_Score.py --list-contests
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import sys
+
+from contest_tables import CONTESTS, CONTEST_DIST
+from qso_store import QSO_Store
+from dupe_index import Dupe_Index
+from score_engine import Score_Engine
+from log_journal import Log_Journal
+
+
+# Loads a log file and scores it. Returns the QSO store, its dupe index and its score engine.
+# Raises IOError if the file cannot be read.
+def score_log(filename, contest_number):
+    store = QSO_Store()
+    dupe_index = Dupe_Index(store, contest_number)
+    engine = Score_Engine(store, dupe_index, contest_number)
+    Log_Journal(store).load(filename, compact=False)
+    return store, dupe_index, engine
+
+# Prints the score report of a log
+def print_report(filename, store, dupe_index, engine, out=sys.stdout):
+    print(filename + ":", file=out)
+    dupes = [record for record in store if dupe_index.is_dupe(record.id)]
+    for record in dupes: print("  Dupe: " + record.to_listbox_line().rstrip(), file=out)
+    for record in store:
+        if (record.id in engine.band_error_ids): print("  Band not in contest: " + record.to_listbox_line().rstrip(), file=out)
+        elif (record.id in engine.dist_error_ids): print("  Invalid grid square: " + record.to_listbox_line().rstrip(), file=out)
+    print("  QSOs: " + str(engine.number_qsos()) + "   Dupes: " + str(len(dupes)) + "   Bands: " + str(engine.number_bands())
+          + "   Activated grids: " + str(engine.number_activ_grids()), file=out)
+    print("  QSO points: " + str(engine.points()) + "   Multiplier: " + str(engine.multiplier())
+          + "   Total distance: " + str(engine.total_dist) + " km", file=out)
+    if (CONTEST_DIST[engine.contest_number]) and (engine.contest_number != 5):
+        print("  Band factor distance: " + str(engine.tot_band_factor_dist) + " km", file=out)
+    print("  Claimed score: " + str(engine.score()) + ("  (with errors, see above)" if engine.error() else ""), file=out)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scores VCL .VHFlog files for a contest, without opening the logger.")
+    parser.add_argument("-c", "--contest", type=int, choices=range(1, len(CONTESTS)), metavar="NUMBER",
+                        help="contest number (see --list-contests)")
+    parser.add_argument("--list-contests", action="store_true", help="lists the contest numbers and exits")
+    parser.add_argument("logs", nargs="*", metavar="LOGFILE", help=".VHFlog file(s) to score")
+    args = parser.parse_args(argv)
+    if (args.list_contests):
+        for i in range(1, len(CONTESTS)): print(str(i) + ": " + CONTESTS[i])
+        return 0
+    if (args.contest is None) or (len(args.logs) == 0): parser.error("a contest number and at least one log file are required")
+    print("Contest: " + CONTESTS[args.contest])
+    status = 0
+    for filename in args.logs:
+        try:
+            store, dupe_index, engine = score_log(filename, args.contest)
+        except (IOError, UnicodeDecodeError) as error:
+            print(filename + ": cannot be read (" + str(error) + ")", file=sys.stderr)
+            status = 1
+            continue
+        print_report(filename, store, dupe_index, engine)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
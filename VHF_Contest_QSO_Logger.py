@@ -15,6 +15,79 @@
     
 # Release History
 #  - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+# Version 1.7 (in development):
+# - QSOs are now kept in memory as typed records (qso_store.py). The QSO list is only a view of them, so saving,
+#   sorting, dupe checking and scoring no longer re-parse the QSO list text lines.
+# - Dupe detection now uses a hash index of the QSOs (dupe_index.py), updated as each QSO is added, edited or erased.
+#   The first (valid) QSO of a dupe group is now the earliest one by date/time, whatever the QSO list sort order.
+# - QSO Capture window: the dupe check done at each keystroke now looks up the dupe index instead of scanning the
+#   QSO list, and only changes the window colors when the dupe state changes. Typing speed no longer depends on log size.
+# - The score is now kept up to date by an incremental score engine (score_engine.py) as QSOs are added, edited or
+#   erased. The Statistics window is refreshed when the log changes instead of every 500 ms. The contest tables moved
+#   to contest_tables.py. 10G+ Contest QSO points now use the band of each callsign.
+# - Grid square distances and headings now use a cache of decoded grid squares (grid_geometry.py), holding their
+#   coordinates and the sine and cosine of their latitude.
+# - Whole-log score recalculations compute all the QSO distances in one batch, vectorized with NumPy when it is
+#   installed (optional), or with a plain Python loop otherwise.
+# - The score now uses the distance stored with each QSO instead of recalculating it. Distances missing from logs
+#   of older versions are marked stale, recalculated once and saved with the log.
+# - Each QSO add, edit or erase is now appended to a small journal file (log_journal.py) instead of rewriting the
+#   whole log file. The journal is compacted into the classic .VHFlog file when all the QSOs are deleted, every 200
+#   changes and at program exit, and is replayed when the log is loaded after a crash. Log files are rewritten
+#   atomically.
+# - The log files are now written by a background thread (log_writer.py), so the windows never wait for the disk.
+#   Bursts of changes are merged into a single write. A new indicator under the QSO list shows whether changes are
+#   being written, or when the log file was last written. Pending writes are completed at program exit.
+# - The QSO list is now a virtualized view of the log (qso_list_view.py): only the visible lines are drawn, with their
+#   stripe and dupe colors, so scrolling and logging are as fast with 20,000 QSOs as with 50. The selection follows the
+#   selected QSO when other QSOs are added or erased.
+# - Sorting the QSO list now only changes the display order (qso_sort.py): the log file keeps the QSOs in log order and
+#   is no longer rewritten at each sort. Sort keys are computed once per QSO, bands sort in frequency order, and the
+#   previous sort columns are kept as tie-breakers (e.g. sort by call, then by band).
+# - The QSO list keeps its sort order as QSOs are added or edited: each QSO is placed in the sorted list with a binary
+#   search, and the list scrolls to show it. Editing a QSO now updates the right QSO even if others were added meanwhile.
+# - New command-line log checker (VCL_Score.py): scores one or more .VHFlog files for a contest without opening any
+#   window, and prints their dupes, QSO points, multiplier, total distance and claimed score.
+# - New benchmark suite (benchmarks/): a synthetic contest log generator and a script timing log load and save, dupe
+#   detection, scoring, sorting, Cabrillo export and grid map boxes on logs of 100 to 100,000 QSOs. The Cabrillo writer
+#   and the grid map box positions moved to cabrillo.py and grid_map.py. Each worked grid square box is drawn once.
+# - New hot path timing (instrumentation.py): call counts and latency histograms of the main event handlers and periodic
+#   tasks, main loop stalls and keystroke-to-repaint latency of the QSO entry fields. F12 shows a small window with the
+#   live p50/p99 latencies. The statistics of the sessions where that window was shown (or of all the sessions, with
+#   SAVE_TIMING_SESSIONS) are saved to timing_sessions.jsonl at program exit; the latest 20 sessions are kept.
+# - WSJT-X QSOs are now received by a background thread (wsjt_receiver.py) that reads every datagram as it arrives and
+#   parses it, instead of a 100 ms poll doing blocking socket reads on the window thread. Typing is never blocked by
+#   the network, and bursts of QSOs from several WSJT-X instances are all logged.
+# - WSJT-X UDP messages are decoded by a new protocol module (wsjt_protocol.py): Heartbeat, Status, Decode, QSO Logged,
+#   Logged ADIF and Close messages, read in place from the datagram. Non WSJT-X datagrams are now rejected. A recorded
+#   message corpus and a replay tool (benchmarks/wsjt_replay.py) check and time the decoder.
+# - Any number of WSJT-X/JTDX UDP listeners can be set in the Setup window: UDP ports and multicast groups (e.g.
+#   "2237, 2239, 239.255.0.1:2237"), each with its own logging check box and its packet count, rate and drops. They are
+#   all read by the same receiver thread. Ports 2237 and 2239 remain the default listeners.
+# - New band plan table (band_plan.py): band edges with their Cabrillo and ADIF names, looked up with a binary search,
+#   for frequencies in Hz, kHz, MHz or GHz. Used by the WSJT-X receiver, the QSO list band sort and the Cabrillo-ADIF
+#   converter. WSJT-X QSOs up to 53.999 MHz (6 m) and from 75.5 GHz (4 mm) are now given their band.
+# - New ADIF module (adif.py): a single-pass streaming tokenizer yielding the records of an ADIF text or file in
+#   constant memory, and a streaming ADIF writer. Used to parse the WSJT-X logged QSOs (one scan per record instead
+#   of one per field) and to write the Cabrillo-ADIF converter output.
+# - The Cabrillo-ADIF converter (Cabrillo-ADIF_Converter/Cab-ADIF_Convert.py) gains a batch mode: Cabrillo files and
+#   directories on the command line, converted in parallel, with an ADIF header and the QSO count and time of each
+#   file. It no longer loops forever on a file without an "END-OF-LOG:" line.
+# - New ADIF-Cabrillo converter (Cabrillo-ADIF_Converter/ADIF-Cab_Convert.py): converts ADIF files, such as the
+#   WSJT-X log, to a Cabrillo log or a .VHFlog logbook, with the QSO distances, one record at a time. .VHFlog logbooks
+#   can be merged in, e.g. to submit the WSJT-X and VCL QSOs of a rover in one Cabrillo file.
+# - New "Import" button: imports the QSOs of an ADIF file (e.g. the WSJT-X log, to recover a log after a crash) or of
+#   a CSV file into the open logbook (log_import.py). The QSOs out of the contest period or bands, and the ones already
+#   in the logbook, are left out. The others are added in one batch: one log file write, one dupe count, one map update.
+# - The Cabrillo file is written in one buffered pass over the QSOs, which also checks each QSO against the contest
+#   bands, modes and grid square length; the QSOs in error are listed after the export. The header now includes the
+#   station grid square. The file name is now right for log files in a directory with a dot in its name.
+# - New command-line Cabrillo export, VCL_Cabrillo.py: writes the Cabrillo file of a log without opening the logger,
+#   with the contest and station settings saved by the logger.
+# - New "ADIF File" button: writes the QSOs of the log to an ADIF file (.adi) for LoTW or QRZ uploads, with the grid
+#   squares, the distance and the contest identifier (adif_export.py). After a first export, only the QSOs not exported
+#   yet can be written, to a file of their own; the export mark, saved next to the log file, lists the QSOs exported.
+#  - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 # Version 1.64 (October 2025):
 # - Corrected the dupe checking of the NA VHF and Microwave Sprints. Different mode (analog vs. digital) QSOs are no longer flagged as dupes.
 # - Improved QSO list sorting by distance. Now sorts numerically instead of alpha-numerically.
@@ -106,115 +179,45 @@
 from tkinter import *       # Allows the creation of windows and widgets
 from tkinter import ttk     # Required for Combobox widget
 import datetime
-from tkinter.messagebox import askyesno, showerror, showinfo, showwarning
+from tkinter.messagebox import askyesno, askyesnocancel, showerror, showinfo, showwarning
 from tkinter import filedialog
+from tkinter.simpledialog import askstring
 import os
 import os.path
-from shutil import copy
 from tkinter.scrolledtext import ScrolledText       # A textbox that cans scroll
 import re       # Allows to split using several delimiters for splitting strings
 #import math
 import sys
 sys.path.append("./great_circle_calculator")
 import great_circle_calculator as gcc
-import socket
-from math import sin, cos, sqrt, atan2, radians, degrees
+import queue
+from collections import Counter
+from qso_store import QSO_Record, QSO_Store     # Typed in-memory QSO records, the QSO listbox is a view of them
+from dupe_index import Dupe_Index, dupe_key, FIRST_QSO, DUPE_QSO  # Hash-indexed dupe detection
+from score_engine import Score_Engine   # Incremental contest score
+from grid_geometry import Dist_Between_2_GridSquares, heading_between_grids, qso_distance   # Cached grid square geometry
+from log_journal import Log_Journal     # Append-only journal of the log file changes
+from log_writer import Log_Writer       # Writes the log files in a background thread
+from qso_list_view import QSO_List_View # Virtualized QSO list
+from wsjt_receiver import WSJT_Receiver, UDP_Source, parse_udp_sources, format_udp_sources   # Reads the WSJT-X UDP datagrams in a background thread
+from instrumentation import Instrumentation, Latency_Overlay     # Hot path timing
+from cabrillo import export_cabrillo, cabrillo_filename     # Cabrillo log file writer
+from adif_export import export_adif, adif_filename, read_export_mark, write_export_mark, records_to_export   # ADIF log file export
+from log_import import import_qsos, Contest_Start_Error, START_FORMAT    # ADIF and CSV QSO import
+from qso_sort import date_time_key      # QSO date and time as a number
+from grid_map import band_grid_boxes, grid_box     # Grid map box positions
 
 # C_O_N_S_T_A_N_T_S
 
 SW_VERSION = " 1.64  2025/10/15"
-DATE_POS = 0
-TIME_POS = 1
-BAND_POS = 2
-MODE_POS = 3
-CALLSIGN_POS = 4
-GRIDSQUARE_POS = 5
-OWN_GRIDSQUARE_POS = 6
-DISTANCE_POS = 7
 X1_MAP_HEIGHT = 2880
 X1_MAP_WIDTH = 5760
-UDP_IP = ''
-UDP_PORT1 = 2237
+UDP_PORT1 = 2237    # WSJT-X listener ports of the previous versions, the default listeners
 UDP_PORT2 = 2239
+TIMING_SESSION_FILE = "./timing_sessions.jsonl"   # Handler timing statistics, one JSON line per session
+SAVE_TIMING_SESSIONS = False    # True saves the timing of every session, not only of those where the latency window was shown
 
-CONTESTS = ['Please Select Contest',                       # 0
-            'ARRL January VHF Contest',                    # 1
-            'ARRL June VHF Contest',                       # 2
-            'ARRL September VHF Contest',                  # 3            
-            'NA VHF/UHF Sprint',                           # 4
-            'NA Microwave Sprint (6-char. Grid Sq.)',      # 5
-            'ARRL 222 MHz+ Contest (6-char. Grid Sq.)',    # 6
-            'ARRL 10 GHz+ Contest (6-char. Grid Sq.)',     # 7
-            'CQ World Wide VHF Contest SSB/CW',            # 8
-            'CQ World Wide VHF Contest Digital']           # 9
-
-CONTEST_BANDS = [[''],																												# 0
-                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 1
-                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 2
-                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 3
-                 ['50','144','222','432'],																							# 4
-                 ['902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],							# 5
-                 ['222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],				# 6
-                 ['10G','24G','47G','75G','122G','134G','241G','LIGHT'],															# 7
-                 ['50','144'],																										# 8
-                 ['50','144']]																										# 9
-
-# Band Factor only applies to "10 GHz and Up" and the "222 and Up" contests
-BAND_FACTOR =    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 0
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 1
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 2
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 3                                       # 3
-                  [0, 0, 0, 0],                       							 # 4
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           			 # 5
-                  [2, 1, 4, 2, 6, 10, 10, 6, 20, 20, 20, 20, 20, 20, 0],         # 6
-                  [1, 2, 3, 4, 5, 5, 5, 0],                                      # 7
-                  [0, 0],           											 # 8
-                  [0, 0]]           										     # 9
-
-QSO_POINTS_TBL = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],      # 0
-                  [1, 1, 2, 2, 4, 4, 8, 8, 8, 8, 8, 8, 8, 8, 8, 8, 8],      # 1
-                  [1, 1, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],      # 2
-                  [1, 1, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],      # 3
-                  [1, 1, 1, 1],                								# 4
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],                	# 5
-                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],            # 6
-                  [100, 100, 100, 100, 100, 100, 100, 0],  					# 7
-                  [1, 2],                									# 8
-                  [1, 2]]                									# 9
-
-CONTEST_MODES = [[''],							# 0																					# 0
-                 ['CW','PH','FM','RY','DG'],	# 1
-                 ['CW','PH','FM','RY','DG'],	# 2
-                 ['CW','PH','FM','RY','DG'],	# 3
-                 ['CW','PH','FM','RY','DG'],	# 4																						# 4
-                 ['CW','PH','FM','RY','DG'],	# 5
-                 ['CW','PH','FM','RY','DG'],	# 6
-                 ['CW','PH','FM','RY','DG'],	# 7
-                 ['CW','PH','FM'],				# 8
-                 ['RY','DG']]					# 9
-
-CONTEST_CABRILLO_TITLE = ['',                  # 0
-                          'ARRL-VHF-JAN',      # 1
-                          'ARRL-VHF-JUN',      # 2
-                          'ARRL-VHF-SEP',      # 3
-                          '',                  # 4
-                          '',                  # 5
-                          'ARRL-222',          # 6
-                          'ARRL-10-GHZ',       # 7
-                          'CQ-VHF-SSBCW',      # 8
-                          'CQ-VHF-DIGI']       # 9
-
-# Distance factor: Contests with "True" will take the distance into account for score calculation
-CONTEST_DIST =  [False,   # 0
-                 False,   # 1
-                 False,   # 2
-                 False,   # 3
-                 False,   # 4
-                 True,    # 5                
-                 True,    # 6         
-                 True,    # 7
-                 False,   # 8
-                 False]   # 9
+from contest_tables import CONTESTS, CONTEST_BANDS, CONTEST_MODES, CONTEST_DIST, CONTEST_HOURS  # Contest definitions
 
 BAND1_COLOR = 'pink3'
 BAND2_COLOR = 'springgreen3'
@@ -226,7 +229,6 @@ BAND4_COLOR = 'cyan'
 Contest_File_Name = ""
 Stop_DateTime_Updates = False
 Edit_QSO_Action = False
-Edit_QSO_Index = 0
 Number_QSOs = 0
 Number_Grids = 0
 Number_Bands = 0
@@ -244,23 +246,33 @@ Stats_Window_Geometry_X = 100
 Stats_Window_Geometry_Y = 100
 Stats_Window_Open = False
 Default_BG_Color = ""
-QSO_List = []
-QSO_Line = []
+QSO_Log = QSO_Store()   # The QSOs of the open logbook, in log order (the QSO list sorts its own view)
+QSO_Line = None         # The QSO record recalled in the QSO entry window for editing
+Dupe_QSO_Index = Dupe_Index(QSO_Log)    # Follows the QSO_Log changes to flag the dupes
+QSO_Score = Score_Engine(QSO_Log, Dupe_QSO_Index)
+Log_File_Writer = Log_Writer()
+Log_File_Writer.start()
+QSO_Journal = Log_Journal(QSO_Log, Log_File_Writer)      # Appends each QSO change to the log file journal
+Hot_Path_Timing = Instrumentation()     # Handler latencies, main loop stalls and keystroke-to-repaint latency
+Entry_Dupe_State = False    # True when the QSO entry window shows the dupe colors
+Entry_Dupe_Record_Id = 0    # Record id of the logged QSO matching the QSO entry fields
 Map_Scale_Factor = 1
 Map_Height = 2880
 Lat_Grid_Pitch = 0
 Long_Grid_Pitch = 0
-wsjt_1_logging_enabled = False
-wsjt_2_logging_enabled = False
+WSJT_UDP_Sources = [UDP_Source(UDP_PORT1, enabled=False), UDP_Source(UDP_PORT2, enabled=False)]   # WSJT-X listeners
 Number_Dupes = 0
 Latest_QSO_Dist = 0
 display_grid_boxes = 1
+Map_Worked_Grids = Counter()    # Number of QSOs of each (band, 4-character grid square), to draw each box once
 Score_Calc_Error = False
 
 
 # M_A_I_N__C_O_D_E
 
 def Set_Dupe_Colors():
+    global Entry_Dupe_State
+    Entry_Dupe_State = True
     QSO_Listbox.selection_clear(0, END)         # Dupe is found; set orange color to QSO Entry window widgets
     QSO_Entry_Window.configure(bg = "sienna1")    
     QSO_Lower_button_frame.configure(bg = "sienna1")    
@@ -272,208 +284,99 @@ def Set_Dupe_Colors():
     CallSign_Entry_Label.configure(bg = "sienna1")    
     GridSquare_Entry_Label.configure(bg = "sienna1")    
     Mode_Combo_Label.configure(bg = "sienna1")    
-    QSO_Listbox.configure(selectbackground="sienna1")
+    QSO_Listbox.listbox.configure(selectbackground="sienna1")
     Error_Text_Label.lift()
     Error_Text_Label.config(text = 'Warning: Duplicate QSO found', bg = "sienna1")
 
+# No duplicate, set the various widget colors back to normal
+def Clear_Dupe_Colors():
+    global Entry_Dupe_State
+    global Entry_Dupe_Record_Id
+    Entry_Dupe_State = False
+    Entry_Dupe_Record_Id = 0
+    QSO_Entry_Window.configure(bg = Default_BG_Color)    
+    QSO_Listbox.listbox.configure(selectbackground="dodger blue")
+    QSO_Lower_button_frame.configure(bg = Default_BG_Color)    
+    QSO_Upper_button_frame.configure(bg = Default_BG_Color)    
+    QSO_Buttons_Frame.configure(bg = Default_BG_Color)
+    Date_Entry_Label.configure(bg = Default_BG_Color)    
+    Time_Entry_Label.configure(bg = Default_BG_Color)    
+    Band_Combo_Label.configure(bg = Default_BG_Color)    
+    CallSign_Entry_Label.configure(bg = Default_BG_Color)    
+    GridSquare_Entry_Label.configure(bg = Default_BG_Color)    
+    Mode_Combo_Label.configure(bg = Default_BG_Color)
+    QSO_Listbox.selection_clear(0, END)
+    Error_Text_Label.config(text = '')
+    Error_Text_Label.lower()
+    Error_Text_Label.config(bg =  Default_BG_Color)                
 
-# This function checks for a duplicate QSO in the QSO list vs. what is currently entered in the QSO entry window fields
+
+# This function checks for a duplicate QSO in the QSO list vs. what is currently entered in the QSO entry window fields.
+# It is called at every keystroke: the matching QSOs are looked up in the dupe index (no QSO list scan), and the
+# widget colors are only touched when the dupe state changes.
+@Hot_Path_Timing.timed('dupe_check')
 def dupe_check():
-    global QSO_Line
-    global Edit_QSO_Action
-    print('Dupe Check')
-    if (Edit_QSO_Action) and ((QSO_Line[BAND_POS] == Band_Combo_Val.get())   # Verifies if all fields are the same as the recalled QSO in Edit mode
-    and (QSO_Line[CALLSIGN_POS] == CallSign_Entry_Val.get()) and (CallSign_Entry_Val.get() != "")
-    and (QSO_Line[GRIDSQUARE_POS] == GridSquare_Entry_Val.get()) and (Band_Combo_Val.get() != "")
+    global Entry_Dupe_Record_Id
+    if (Edit_QSO_Action) and ((QSO_Line.band == Band_Combo_Val.get())   # Verifies if all fields are the same as the recalled QSO in Edit mode
+    and (QSO_Line.callsign == CallSign_Entry_Val.get()) and (CallSign_Entry_Val.get() != "")
+    and (QSO_Line.gridsquare == GridSquare_Entry_Val.get()) and (Band_Combo_Val.get() != "")
     and (CallSign_Entry_Val.get() != "")):
-        QSO_Entry_Window.configure(bg = Default_BG_Color)    
-        QSO_Listbox.configure(selectbackground="dodger blue")
+        if (Entry_Dupe_State): Clear_Dupe_Colors()
+        return
+    key = dupe_key(Contest_Number, Band_Combo_Val.get(), Mode_Combo_Val.get(), CallSign_Entry_Val.get(),
+                   GridSquare_Entry_Val.get(), Own_Gridsquare)
+    if (Contest_Number == 7) and (len(GridSquare_Entry_Val.get()) != 6): key = None   # 10G+ Contest: full grid square needed
+    Dupe_QSO = None
+    for QSO in Dupe_QSO_Index.find(key):
+        if (Contest_Number == 7) and (QSO.gridsquare[0:6] != GridSquare_Entry_Val.get()): continue   # 10G+ Contest: same grid square
+        if not ((Edit_QSO_Action) and (QSO.id == QSO_Line.id)):   # The QSO being edited is not a dupe of itself
+            Dupe_QSO = QSO
+            break
+    if (Dupe_QSO is None):
+        if (Entry_Dupe_State): Clear_Dupe_Colors()
+    elif (Dupe_QSO.id != Entry_Dupe_Record_Id):
+        if not (Entry_Dupe_State): Set_Dupe_Colors()
+        Entry_Dupe_Record_Id = Dupe_QSO.id
+        i = QSO_Log.index_of(Dupe_QSO.id)
         QSO_Listbox.selection_clear(0, END)
-    else:   # Now search for dupe QSO in QSO listbox.
-        for i in range(0,QSO_Listbox.size()):
-            QSO_String_List = QSO_Listbox.get(i).split() # Creates a list of the QSO line fields
-            if ((Contest_Number in [1, 2, 3, 6, 8, 9])    # Not the ARRL 10 GHz+ Contest
-                 and (CallSign_Entry_Val.get() == QSO_String_List[4])
-                 and (CallSign_Entry_Val.get() != "")
-                 and (GridSquare_Entry_Val.get()[0:4] == QSO_String_List[5][0:4])
-                 and (GridSquare_Entry_Val.get() != "")
-                 and (Band_Combo_Val.get() == QSO_String_List[2])
-                 and (Own_Gridsquare[0:4] == QSO_String_List[6][0:4])):
-                Set_Dupe_Colors()
-                QSO_Listbox.selection_set(i)
-                QSO_Listbox.index(i)
-                QSO_Listbox.see(i)
-                break
-            elif ((Contest_Number in [4,5]) # VHF Sprint: Can work a station both in analog and digital
-                 and (CallSign_Entry_Val.get() == QSO_String_List[4])
-                 and (CallSign_Entry_Val.get() != "")
-                 and (GridSquare_Entry_Val.get() != "")
-                 and (Band_Combo_Val.get() == QSO_String_List[2])
-#                 and (len(GridSquare_Entry_Val.get()) == 6)
-                 and (GridSquare_Entry_Val.get()[0:4] == QSO_String_List[5][0:4])
-                 and (((Mode_Combo_Val.get() in ['CW','PH','FM']) and (QSO_String_List[3] in ['CW','PH','FM']))
-                      or ((Mode_Combo_Val.get() in ['RY','DG']) and (QSO_String_List[3] in ['RY','DG'])))):
-                Set_Dupe_Colors()
-                QSO_Listbox.selection_set(i)
-                QSO_Listbox.index(i)
-                QSO_Listbox.see(i)
-                break                
-#             elif ((Contest_Number in [5]) # Microwave Sprint: Can work a station both in analog and digital
-#                  and (CallSign_Entry_Val.get() == QSO_String_List[4])
-#                  and (CallSign_Entry_Val.get() != "")
-#                  and (GridSquare_Entry_Val.get() != "")
-#                  and (Band_Combo_Val.get() == QSO_String_List[2])
-#                  and (len(GridSquare_Entry_Val.get()) == 6)
-#                  and (GridSquare_Entry_Val.get()[0:6] == QSO_String_List[5][0:6])
-#                  and (((Mode_Combo_Val.get() in ['CW','PH','FM']) and (QSO_String_List[3] in ['CW','PH','FM']))
-#                       or ((Mode_Combo_Val.get() in ['RY','DG']) and (QSO_String_List[3] in ['RY','DG'])))):
-#                 Set_Dupe_Colors()
-#                 QSO_Listbox.selection_set(i)
-#                 QSO_Listbox.index(i)
-#                 QSO_Listbox.see(i)
-#                 break                
-            elif ((Contest_Number in [7]) # 10G+ Contest
-                 and (CallSign_Entry_Val.get() == QSO_String_List[4])
-                 and (CallSign_Entry_Val.get() != "")
-                 and (GridSquare_Entry_Val.get() != "")
-                 and (Band_Combo_Val.get() == QSO_String_List[2])
-                 and (len(GridSquare_Entry_Val.get()) == 6)
-                 and (GridSquare_Entry_Val.get()[0:6] == QSO_String_List[5][0:6])):
-                # Removed the minimum distance check, replaced by simple grid square match check above. 
-                # and (not((Dist_Between_2_GridSquares(GridSquare_Entry_Val.get()[0:6],QSO_String_List[5][0:6]) > 16)
-                #         or (Dist_Between_2_GridSquares(Own_Gridsquare[0:6],QSO_String_List[6][0:6]) > 16)))):  #Either station must have moved by at least 16 km for a QSO in the same grids to be valid
-                Set_Dupe_Colors()
-                QSO_Listbox.selection_set(i)
-                QSO_Listbox.index(i)
-                QSO_Listbox.see(i)
-                break                
-            else:      # No duplicate, set the various widget colors back to normal
-                QSO_Entry_Window.configure(bg = Default_BG_Color)    
-                QSO_Listbox.configure(selectbackground="dodger blue")
-                QSO_Lower_button_frame.configure(bg = Default_BG_Color)    
-                QSO_Upper_button_frame.configure(bg = Default_BG_Color)    
-                QSO_Buttons_Frame.configure(bg = Default_BG_Color)
-                Date_Entry_Label.configure(bg = Default_BG_Color)    
-                Time_Entry_Label.configure(bg = Default_BG_Color)    
-                Band_Combo_Label.configure(bg = Default_BG_Color)    
-                CallSign_Entry_Label.configure(bg = Default_BG_Color)    
-                GridSquare_Entry_Label.configure(bg = Default_BG_Color)    
-                Mode_Combo_Label.configure(bg = Default_BG_Color)
-                QSO_Listbox.selection_clear(0, END)
-                Error_Text_Label.config(text = '')
-                Error_Text_Label.lower()
-                Error_Text_Label.config(bg =  Default_BG_Color)                
-    QSO_Entry_Window.update()
+        QSO_Listbox.selection_set(i)
+        QSO_Listbox.see(i)
 
 # This function is required because the ComboBox sends an event as parameter, unlike other widgets
 def combobox_dupe_check(event):
     dupe_check()
 
-# This function scans for duplicate QSOs and colors them in red font in the QSO listbox.
+# Returns the QSO listbox font color of a QSO: red for a dupe, orange for the first (valid) QSO of a dupe group.
+def dupe_color(record_id):
+    state = Dupe_QSO_Index.state(record_id)
+    if (state == DUPE_QSO): return 'red'
+    elif (state == FIRST_QSO): return 'DarkOrange'
+    return 'black'
+
+# This function colors all duplicate QSOs in red font in the QSO listbox. The dupes are read from the dupe index,
+# which is kept up to date as QSOs are added, edited or erased, so this is a single pass over the QSO list.
 def qso_listbox_dupe_check():
     global Number_Dupes
-    global Contest_Number
-    Number_Dupes = 0
-    for i in range (0,QSO_Listbox.size()): QSO_Listbox.itemconfig(i, {'foreground':'black'}) # First, color all entries in black.
-
-    for i in range (0,QSO_Listbox.size()): # Then, color the duplicated QSOs in red
-        for j in range (i+1,QSO_Listbox.size()):  # Allows to not check a pair of QSOs twice
-            QSO_1 =  QSO_Listbox.get(i).split(" ")
-            while "" in QSO_1: QSO_1.remove("") # Removes empty strings from list
-            QSO_2 =  QSO_Listbox.get(j).split(" ")
-            while "" in QSO_2: QSO_2.remove("") # Removes empty strings from list
-            if ((Contest_Number in [1, 2, 3, 6, 8, 9])    # Regular VHF Contest
-            and (QSO_1[BAND_POS] == QSO_2[BAND_POS])
-            and (QSO_1[CALLSIGN_POS] == QSO_2[CALLSIGN_POS])
-            and (QSO_1[GRIDSQUARE_POS][0:4] == QSO_2[GRIDSQUARE_POS][0:4])
-            and (QSO_1[OWN_GRIDSQUARE_POS][0:4] == QSO_2[OWN_GRIDSQUARE_POS][0:4])):
-                QSO_Listbox.itemconfig(i, {'foreground':'red'})
-                QSO_Listbox.itemconfig(j, {'foreground':'DarkOrange'})
-                QSO_Listbox.see(i)
-            elif (Contest_Number in [4,5]): # VHF Sprint: Can work a station both in analog and digital
-                if ((QSO_1[BAND_POS] == QSO_2[BAND_POS])
-                    and (QSO_1[CALLSIGN_POS] == QSO_2[CALLSIGN_POS])
-                    and (QSO_1[GRIDSQUARE_POS][0:4] == QSO_2[GRIDSQUARE_POS][0:4])
-                    and (QSO_1[OWN_GRIDSQUARE_POS][0:4] == QSO_2[OWN_GRIDSQUARE_POS][0:4])
-                    and (((QSO_1[MODE_POS] in ['CW','PH','FM']) and (QSO_2[MODE_POS] in ['CW','PH','FM']))
-                        or ((QSO_1[MODE_POS] in ['RY','DG']) and (QSO_2[MODE_POS] in ['RY','DG'])))):
-                    QSO_Listbox.itemconfig(i, {'foreground':'red'})
-                    QSO_Listbox.itemconfig(j, {'foreground':'DarkOrange'})
-                    QSO_Listbox.see(i)
-#             elif (Contest_Number in [5]): # VHF Sprint: Can work a station both in analog and digital
-#                 if ((QSO_1[BAND_POS] == QSO_2[BAND_POS])
-#                     and (QSO_1[CALLSIGN_POS] == QSO_2[CALLSIGN_POS])
-#                     and (QSO_1[GRIDSQUARE_POS][0:4] == QSO_2[GRIDSQUARE_POS][0:4])
-#                     and (QSO_1[OWN_GRIDSQUARE_POS][0:4] == QSO_2[OWN_GRIDSQUARE_POS][0:4])
-#                     and (((QSO_1[MODE_POS] in ['CW','PH','FM']) and (QSO_2[MODE_POS] in ['CW','PH','FM']))
-#                         or ((QSO_1[MODE_POS] in ['RY','DG']) and (QSO_2[MODE_POS] in ['RY','DG'])))):
-#                     QSO_Listbox.itemconfig(i, {'foreground':'red'})
-#                     QSO_Listbox.itemconfig(j, {'foreground':'DarkOrange'})
-#                     QSO_Listbox.see(i)
-            elif ((Contest_Number == 7) # 10G+ Contest
-            and (QSO_1[BAND_POS] == QSO_2[BAND_POS])
-            and (QSO_1[CALLSIGN_POS] == QSO_2[CALLSIGN_POS])
-            and (QSO_1[GRIDSQUARE_POS][0:6] == QSO_2[OWN_GRIDSQUARE_POS][0:6])):
-            # Removed the minimum distance check, replaced by simple grid square match check above.    
-            #and (not((Dist_Between_2_GridSquares(QSO_1[GRIDSQUARE_POS][0:6],QSO_2[GRIDSQUARE_POS][0:6]) > 16)
-            #         or (Dist_Between_2_GridSquares(QSO_1[OWN_GRIDSQUARE_POS][0:6],QSO_2[OWN_GRIDSQUARE_POS][0:6]) > 16)))):  #Either station must have moved by at least 16 km for a QSO in the same grids to be valid
-                QSO_Listbox.itemconfig(i, {'foreground':'red'})
-                QSO_Listbox.itemconfig(j, {'foreground':'DarkOrange'})
-                QSO_Listbox.see(i)                  
-    for i in range (0,QSO_Listbox.size()):
-        if  (QSO_Listbox.itemcget(i, 'foreground') == 'red'):
-            Number_Dupes = Number_Dupes + 1
+    Dupe_QSO_Index.set_contest(Contest_Number)  # Rebuilds the index if the contest rules changed
+    QSO_Score.set_contest(Contest_Number)
+    Dupe_QSO_Index.take_changed_ids()
+    QSO_Listbox.resort()    # The dupe colors are applied as the visible QSO lines are drawn. Stale distances may have been updated.
+    Number_Dupes = Dupe_QSO_Index.number_dupes
+
+# Updates the dupe count after a single QSO add, edit or erase. The QSO list redraws its visible lines, with their
+# dupe colors, by itself after a QSO_Log change.
+def qso_listbox_dupe_update():
+    global Number_Dupes
+    Dupe_QSO_Index.take_changed_ids()
+    Number_Dupes = Dupe_QSO_Index.number_dupes
 
 def Update_QSO_List_Banner():
     global Contest_Number
     global Contest_File_Name
     QSO_List_Window.title("VCL - " + CONTESTS[Contest_Number] + "  :  " + os.path.basename(Contest_File_Name).split(".VHFlog")[0])
 
-# Derives the latitude and longitude of the center of a grid square
-def GridSquare_2_LatLong(gs):
-    #Decode Latitude: 2nd character (a letter)
-    gs_lat = (ord(gs[1]) - 65) * 10
-    #Decode Latitude: 4th character (a digit)
-    gs_lat += int(gs[3])
-    #Decode Latitude: 6th character (a letter)
-    gs_lat += ((ord(gs[5]) - 65)/24) + (1/48) - 90 
-    #Decode Longitude: 1st character (a letter)
-    gs_lon = (ord(gs[0]) - 65) * 20
-    #Decode Longitude: 3rd character (a digit)
-    gs_lon += int(gs[2]) * 2
-    #Decode Longitude: 5th character (a letter)
-    gs_lon += ((ord(gs[4]) - 65)/12) + (1/24) - 180
-    return [round(gs_lat,4), round(gs_lon,4)]
-
-# Calculates the distance between two grid squares, based on the haversine formula, which assumes the earth is a sphere.
-def Dist_Between_2_GridSquares(gs1,gs2):
-    R = 6373.0       # Approximate radius of earth in km
-    lat1 = radians(GridSquare_2_LatLong(gs1)[0])
-    lon1 = radians(GridSquare_2_LatLong(gs1)[1])
-    lat2 = radians(GridSquare_2_LatLong(gs2)[0])
-    lon2 = radians(GridSquare_2_LatLong(gs2)[1])
-    dlon = lon2 - lon1
-    dlat = lat2 - lat1
-    a = sin(dlat / 2)**2 + cos(lat1) * cos(lat2) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    distance = round(R * c)
-    return distance
-
-def heading_between_grids(gs1, gs2):
-    lat1, lon1 = GridSquare_2_LatLong(gs1)
-    lat2, lon2 = GridSquare_2_LatLong(gs2)
-    # Convert to radians
-    phi1 = radians(lat1)
-    phi2 = radians(lat2)
-    delta_lambda = radians(lon2 - lon1)
-    x = sin(delta_lambda) * cos(phi2)
-    y = cos(phi1) * sin(phi2) - \
-        sin(phi1) * cos(phi2) * cos(delta_lambda)
-    bearing = degrees(atan2(x, y))
-    return (bearing + 360) % 360  # Normalize to 0–360
-
-
-# This function calculates the score based on the ARRL VHF Contest rules
+# This function calculates the score based on the ARRL VHF Contest rules. The score engine keeps its counters up to
+# date as QSOs are added, edited or erased, so this only copies its results.
 def calculate_score(Contest):
     global Number_QSOs
     global Number_Grids
@@ -486,100 +389,23 @@ def calculate_score(Contest):
     global Tot_Band_Factor_Dist
     global Contest_Number
     global Score
-    global QSO_List
     global Score_Calc_Error
     
-    Grid_List = []
-    Band_List = []
-    Own_Grid_List = []
-    Unique_Own_Grid_List = []
-    update_qso_list()
-    QSO_Points = 0
-    Unique_Band_List= []
-    Num_Unique_Calls_Per_band = 0
-    Multiplier = 0
-    
-    try:
-        # List of unique grids from which the user operated.
-        for i in range(0,len(QSO_List)):
-            Own_Grid_List.append(QSO_List[i][OWN_GRIDSQUARE_POS][0:4]) # Only consider first 4 grid square characters)
-        Unique_Own_Grid_List = list(set(Own_Grid_List))  # creates a list of unique gridsquares (no duplicates)   
-        # QSO points and band factor calculations. Some contests consider QSO points as multipliers!
-    #    print('==========')
-        for i in range(0,len(QSO_List)):
-            Grid_List.append(QSO_List[i][GRIDSQUARE_POS])
-            Band_List.append(QSO_List[i][BAND_POS])
-            if not (QSO_Listbox.itemcget(i, 'foreground') == 'red'): # Rejects dupes in the QSO points calculation
-                QSO_Points += QSO_POINTS_TBL[Contest_Number][CONTEST_BANDS[Contest_Number].index(QSO_List[i][BAND_POS])]
-    #            print(QSO_POINTS_TBL[Contest_Number][CONTEST_BANDS[Contest_Number].index(QSO_List[i][BAND_POS])])
-        Unique_Band_List = list(set(Band_List))  # creates a list of unique bands worked (no duplicates)
-        # QSO points recalculeted for the 10G+ Contest
-        if (Contest_Number == 7):
-            QSO_Points = 0
-            Num_Unique_Calls_Per_band = 0
-            for i in range(0,len(Unique_Band_List)):
-                Temp_List = []
-                for j in range(0,len(QSO_List)):
-                    if QSO_List[j][BAND_POS] == Unique_Band_List[i]:
-                        Temp_List.append(QSO_List[j][CALLSIGN_POS]) # add callsign to list
-                Num_Unique_Calls_Per_band += len(list(set(Temp_List)))
-                QSO_Points += len(list(set(Temp_List))) * QSO_POINTS_TBL[Contest_Number][CONTEST_BANDS[Contest_Number].index(QSO_List[j][BAND_POS])]
-#            print(Num_Unique_Calls_Per_band)                
-#            print(QSO_Points)
-        # Calculate Multipliers. Each grid square counts as a multiplier on each band
-        Temp_List = []
-        for i in range(0,len(Unique_Band_List)):
-            Temp_List = []
-            for j in range(0,len(QSO_List)):
-                if Band_List[j] == Unique_Band_List[i]:
-                    if (Contest_Number == 7): Temp_List.append(Grid_List[j][0:6]) # 10G+ Contest
-                    else: Temp_List.append(Grid_List[j][0:4]) # Only consider first 4 grid square characters
-            Multiplier += len(list(set(Temp_List))) # The sum of all unique grids contacted per band
-            
-        Number_Grids = Multiplier  # The sum of unique grids for all bands 
-        # For ARRL VHF contests, add rover multipliers (1 additional for each grid square worked from) 
-        if (1 <= Contest_Number <= 3) and (len(Unique_Own_Grid_List) > 1): Multiplier += len(Unique_Own_Grid_List)
-        Number_QSOs = QSO_Listbox.size()
-        Number_Bands = len(Unique_Band_List)      # Counts unique bands
-        Number_Activ_Grids = len(Unique_Own_Grid_List)
-        # Calculate total distance with Band Factor. Band factor is for 10 GHz and Up Contest.
-        Total_Dist = 0
-        Tot_Band_Factor_Dist = 0
-        stuffed_own_gridsquare = Own_Gridsquare
-#        print('----------------------')
-        if (len(Own_Gridsquare) == 4):   # 4-character operator's grid square must be stuffed to 6 characters
-            stuffed_own_gridsquare = Own_Gridsquare + 'LL'  # Assumes the center of the grid
-        for i in range(0,len(QSO_List)):
-            if not (QSO_Listbox.itemcget(i, 'foreground') == 'red'): # Rejects dupes in the QSO points calculation
-                if (len(QSO_List[i][GRIDSQUARE_POS]) == 4):   # 4-character grid square
-                    stuffed_gridsquare = QSO_List[i][GRIDSQUARE_POS] + 'LL'  # Assumes the center of the grid
-                    stuffed_own_gridsquare = QSO_List[i][OWN_GRIDSQUARE_POS] + 'LL'
-                    QSO_Dist = Dist_Between_2_GridSquares(stuffed_own_gridsquare,stuffed_gridsquare)
-                    Total_Dist += QSO_Dist
-                else:   # Full 6-character grid square
-                    if (QSO_List[i][OWN_GRIDSQUARE_POS] == QSO_List[i][GRIDSQUARE_POS]):
-                        Total_Dist += 1
-                        Tot_Band_Factor_Dist += 1 * BAND_FACTOR[Contest_Number][CONTEST_BANDS[Contest_Number].index(QSO_List[i][BAND_POS])]
-                    else:
-                        QSO_Dist = Dist_Between_2_GridSquares(QSO_List[i][OWN_GRIDSQUARE_POS],QSO_List[i][GRIDSQUARE_POS])
-#                        print(QSO_Dist)
-                        Total_Dist += QSO_Dist
-                        # Calculate band factor distance for ARRL 222+ and 10G+ contests
-                        Tot_Band_Factor_Dist += QSO_Dist * BAND_FACTOR[Contest_Number][CONTEST_BANDS[Contest_Number].index(QSO_List[i][BAND_POS])]
-        # Calculate final score, depending on contest
-        if not(CONTEST_DIST[Contest_Number]):   # Check of it is a 4 character grid square contest
-            Score = QSO_Points * Multiplier
-        elif (Contest_Number == 5):   # NA Microwave Sprint (6-char. Grid Sq.)
-            Score = Total_Dist
-        elif (Contest_Number == 6):   # ARRL 222 MHz+ Contest (6-char. Grid Sq.)
-            Score = Tot_Band_Factor_Dist
-        elif (Contest_Number == 7):   # ARRL 10 GHz+ Contest (6-char. Grid Sq.)
-            Score = Tot_Band_Factor_Dist + QSO_Points
-        Score_Calc_Error = False
-    except:
-        Score_Calc_Error = True
-        pass
+    QSO_Score.set_contest(Contest_Number)  # Recalculates the whole score if the contest rules changed
+    Number_QSOs = QSO_Score.number_qsos()
+    Number_Dupes = QSO_Score.number_dupes()
+    Number_Grids = QSO_Score.number_grids()  # The sum of unique grids for all bands 
+    Number_Bands = QSO_Score.number_bands()
+    Number_Activ_Grids = QSO_Score.number_activ_grids()
+    QSO_Points = QSO_Score.points()
+    Multiplier = QSO_Score.multiplier()
+    Total_Dist = QSO_Score.total_dist
+    Tot_Band_Factor_Dist = QSO_Score.tot_band_factor_dist
+    Score = QSO_Score.score()
+    Score_Calc_Error = QSO_Score.error()
+
 #Converts the Callsign to uppercase and check for duplicates on-the-fly
+@Hot_Path_Timing.timed('validate_callsign')
 def validate_callsign(event):
     CallSign_Entry_Val.set(CallSign_Entry_Val.get().upper())
     if len(CallSign_Entry_Val.get()) > 10: CallSign_Entry_Val.set(CallSign_Entry_Val.get()[:-1])
@@ -640,63 +466,34 @@ def validate_date(event):
 def validate_time(event):
     if len(Time_Entry_Val.get()) > 4: Time_Entry_Val.set(re.sub('[^0-9]', '', Time_Entry_Val.get()[:-1])) # Filters out characters other than digits
 
-# Save listbox data (QSOs) to the log file
+# Save the QSOs to the log file. Each QSO add, edit or erase is already appended to the log file journal as it happens,
+# so the whole log file is only rewritten (compacted) when the journal grew large or the log file name changed.
+@Hot_Path_Timing.timed('log_file_save')
 def log_file_save():
     global Contest_File_Name
-    try:   # Catches a shutil.SameFileError bug that occurs only in Windows
-        if os.path.exists(Contest_File_Name): copy(Contest_File_Name,Contest_File_Name + ".bak") # copies original log to a backup file before any modification.
-    except:
-        pass     # Catches a file copy error.
-    file = open(Contest_File_Name,'w') # Open text file for writing
-    for i in range(0,QSO_Listbox.size()):    
-        QSO_Line = QSO_Listbox.get(i).split(" ")
-        while "" in QSO_Line: QSO_Line.remove("") # Removes empty strings from list
-        file.write(QSO_Line[DATE_POS] + ","
-                 + QSO_Line[TIME_POS] + ","
-                 + QSO_Line[BAND_POS] + ","
-                 + QSO_Line[MODE_POS] + ","
-                 + QSO_Line[CALLSIGN_POS] + ","
-                 + QSO_Line[GRIDSQUARE_POS] +  ","
-                 + QSO_Line[OWN_GRIDSQUARE_POS] + ","
-                 + QSO_Line[DISTANCE_POS] + "\n")
-    file.close()
+    QSO_Journal.save(Contest_File_Name)
     if (os.path.exists(Contest_File_Name.split(".VHFlog")[0])):
         os.remove(Contest_File_Name.split(".VHFlog")[0]) # Required to delete extraneous file created on open (...,'w'): It is a Python bug.
-    update_qso_list()
-    update_grid_boxes_no_event()
-    update_qso_dots()
 
 # Loads a selected log book file and populates the QSO listbox with the QSOs from the log book file.
 def log_file_load():
     global Contest_File_Name
     global QSO_Listbox
-    QSO_Listbox.delete (0 , QSO_Listbox.size()-1)  # First clear all old QSOs in the QSO listbox
+    QSO_Log.clear()  # First clear all old QSOs
     try:
-        file = open(Contest_File_Name,'r') # Open text file for reading
-        OneLine = file.readline()
-        while OneLine:
-            QSO_Line_List = OneLine.split(",")
-            QSO_Listbox.insert(END,QSO_Line_List[DATE_POS].ljust(12, ' ') + QSO_Line_List[TIME_POS].ljust(6, ' ') + QSO_Line_List[BAND_POS].ljust(6, ' ')
-                               + QSO_Line_List[MODE_POS].ljust(4, ' ') + QSO_Line_List[CALLSIGN_POS].ljust(10, ' ') + QSO_Line_List[GRIDSQUARE_POS].ljust(8, ' ')
-                               + QSO_Line_List[OWN_GRIDSQUARE_POS].ljust(8, ' ') + QSO_Line_List[DISTANCE_POS][:-1].ljust(7, ' '))
-            OneLine = file.readline()
-        for i in range(0,QSO_Listbox.size()): # Color the QSO backgrounds in the listbox with alternate colors
-            if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2") 
-            else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")
-        file.close()
+        QSO_Journal.load(Contest_File_Name)   # Also replays the changes journaled after the last log file save
         No_Log_Loaded_Label.pack_forget() # This makes the label disappear
         Update_QSO_List_Banner()
     except IOError:
-        No_Log_Loaded_Label.pack(expand=True, fill=none) # This makes the label appear
+        No_Log_Loaded_Label.pack(expand=True, fill=None) # This makes the label appear
         QSO_List_Window.title("VCL - No Log Loaded")
-    update_qso_list()
     qso_listbox_dupe_check()
 
 # Saves the QSO captured in the QSO entry window to the logbook file.
+@Hot_Path_Timing.timed('save_qso_button_clicked')
 def save_qso_button_clicked():
     global Edit_QSO_Action
     global Stop_DateTime_Updates
-    global Edit_QSO_Index
     global Own_Gridsquare_Entry_Val
     # Add QSO to QSO listbox
     style= ttk.Style()
@@ -715,171 +512,71 @@ def save_qso_button_clicked():
     else:
         Callsign_Entry.configure(bg="white")
         GridSquare_Entry.configure(bg="white")
-    stuffed_gridsquare = GridSquare_Entry_Val.get()
-    stuffed_own_gridsquare = Own_Gridsquare
-    if (len(stuffed_gridsquare) == 4): stuffed_gridsquare = stuffed_gridsquare + 'LL'  # Assumes the center of the grid
-    if (len(stuffed_own_gridsquare) == 4): stuffed_own_gridsquare = stuffed_own_gridsquare + 'LL'  # Assumes the center of the grid
-    Latest_QSO_Dist = Dist_Between_2_GridSquares(stuffed_own_gridsquare,stuffed_gridsquare)
-    if Edit_QSO_Action:
-        QSO_Index = Edit_QSO_Index
-        QSO_Listbox.delete(Edit_QSO_Index)        
-    else: QSO_Index = 0
-    QSO_Listbox.insert(QSO_Index,Date_Entry_Val.get().ljust(12, ' ')
-                       + Time_Entry_Val.get().ljust(6, ' ')
-                       + Band_Combo_Val.get().ljust(6, ' ')
-                       + Mode_Combo_Val.get().ljust(4, ' ')
-                       + CallSign_Entry_Val.get().ljust(10, ' ')
-                       + GridSquare_Entry_Val.get().ljust(8, ' ')
-                       + Own_Gridsquare.ljust(8, ' ')
-                       + str(Latest_QSO_Dist))
-    for i in range(0,QSO_Listbox.size()):
-        if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2")  # even lines
-        else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")   # Odd lines
+    Latest_QSO_Dist = qso_distance(Own_Gridsquare, GridSquare_Entry_Val.get())   # 4-character grid squares are taken at their center
+    QSO = QSO_Record(Date_Entry_Val.get(), Time_Entry_Val.get(), Band_Combo_Val.get(), Mode_Combo_Val.get(),
+                     CallSign_Entry_Val.get(), GridSquare_Entry_Val.get(), Own_Gridsquare, Latest_QSO_Dist)
+    QSO_Index = QSO_Log.index_of(QSO_Line.id) if (Edit_QSO_Action) else -1   # The edited QSO may have moved in the log
+    if (QSO_Index >= 0):
+        QSO_Log.replace(QSO_Index, QSO)   # The QSO list view places the QSO according to its sort
+    else:
+        QSO_Index = 0
+        QSO_Log.insert(QSO_Index, QSO)
     log_file_save()
+    QSO_Listbox.see(QSO_Index)
     QSO_Listbox.selection_clear(0, END) # Deselects any remaining items
     CallSign_Entry_Val.set("")
     GridSquare_Entry_Val.set("")
     Date_Entry.configure(bg=Default_BG_Color, fg="gray44")
     Time_Entry.configure(bg=Default_BG_Color, fg="gray44")
     Save_QSO_Button.configure(text = "Save QSO", fg = "dark green")        
-    QSO_Entry_Window.configure(bg = Default_BG_Color)    
-    QSO_Listbox.configure(selectbackground="dodger blue")
-    QSO_Lower_button_frame.configure(bg = Default_BG_Color)    
-    QSO_Upper_button_frame.configure(bg = Default_BG_Color)    
-    QSO_Buttons_Frame.configure(bg = Default_BG_Color)
-    Date_Entry_Label.configure(bg = Default_BG_Color)    
-    Time_Entry_Label.configure(bg = Default_BG_Color)    
-    Band_Combo_Label.configure(bg = Default_BG_Color)    
-    CallSign_Entry_Label.configure(bg = Default_BG_Color)    
-    GridSquare_Entry_Label.configure(bg = Default_BG_Color)    
-    Mode_Combo_Label.configure(bg = Default_BG_Color)
-    Error_Text_Label.lower()
-    Error_Text_Label.config(text = '')
+    Clear_Dupe_Colors()
     Dist_Text_Label.config(bg =  Default_BG_Color)                
     QSO_Entry_Window.grab_release()
     Callsign_Entry.focus_set()
-    qso_listbox_dupe_check()
+    qso_listbox_dupe_update()
     Stop_DateTime_Updates = False
     Edit_QSO_Action = False
     
-# Checks if a new QSO has appeared on UDP port assigned to WSJT-X, and enters it as a new QSO in the QSO listbox.
+# Logs the QSOs received from WSJT-X. They are received and parsed by the WSJT-X receiver thread, which queues them.
+@Hot_Path_Timing.timed('check_and_save_qso_from_wsjt_thread')
 def check_and_save_qso_from_wsjt_thread():
     global Edit_QSO_Action
     global Stop_DateTime_Updates
-    global Edit_QSO_Index
-    global wsjt_1_logging_enabled
-    global wsjt_2_logging_enabled
-    global sock1
-    global sock2
     global Contest_Number
-    global Own_Gridsquare
 
-    def extract_to_QSO_Listbox():
-        temp_split = log_string.split('<call:') # Index 1: string length and the rest of the string
-        temp_split = temp_split[1].split('>')   # Index 0: string length, Index 1: desired string and the rest
-        wsjt_callsign = temp_split[1][0:int(temp_split[0])]  # Extrats just desired string
-        
-        temp_split = log_string.split('<gridsquare:') # Index 1: string length and the rest of the string
-        temp_split = temp_split[1].split('>')   # Index 0: string length, Index 1: desired string and the rest
-        wsjt_gridsquare = temp_split[1][0:int(temp_split[0])]  # Extrats just desired string
-        if ((CONTEST_DIST[Contest_Number]) and (len(wsjt_gridsquare) == 4)): # A 6-character grid contest            
+    def extract_to_QSO_Listbox(QSO):
+        global Edit_QSO_Action
+        global Stop_DateTime_Updates
+        if ((CONTEST_DIST[Contest_Number]) and (len(QSO.gridsquare) == 4)): # A 6-character grid contest            
             showerror(title='WSJT-X Config Error', message='Error: WSJT-X only sending 4-character Grid Squares. Change WSJT-X Special Operating Activity settings.')
             return
-        elif (not(CONTEST_DIST[Contest_Number]) and (len(wsjt_gridsquare) == 6)): # A 4-character grid contest
+        elif (not(CONTEST_DIST[Contest_Number]) and (len(QSO.gridsquare) == 6)): # A 4-character grid contest
             showwarning(title='WSJT-X Config Warning', message='Warning: WSJT-X is sending 6-character Grid Squares. Last two characters are dropped.')
-            
-        wsjt_mode = 'DG'
-
-        temp_split = log_string.split('<qso_date:') # Index 1: string length and the rest of the string
-        temp_split = temp_split[1].split('>')   # Index 0: string length, Index 1: desired string and the rest
-        wsjt_date = temp_split[1][0:8]  # Extrats just desired string
-        wsjt_date = wsjt_date[0:4] + '-' + wsjt_date[4:6] + '-' + wsjt_date[6:8]
-
-        temp_split = log_string.split('<time_on:') # Index 1: string length and the rest of the string
-        temp_split = temp_split[1].split('>')   # Index 0: string length, Index 1: desired string and the rest
-        wsjt_time = temp_split[1][0:4]  # Extrats just desired string
-
-        temp_split = log_string.split('<freq:') # Index 1: string length and the rest of the string
-        temp_split = temp_split[1].split('>')   # Index 0: string length, Index 1: desired string and the rest
-        wsjt_band = temp_split[1][0:int(temp_split[0])]  # Extrats just desired string
-
-        if (int(wsjt_band.split('.')[0])) in range(50,53): wsjt_band = "50"
-        elif (int(wsjt_band.split('.')[0])) in range(69,71): wsjt_band = "70"
-        elif (int(wsjt_band.split('.')[0])) in range(144,149): wsjt_band = "144"
-        elif (int(wsjt_band.split('.')[0])) in range(220,226): wsjt_band = "222"
-        elif (int(wsjt_band.split('.')[0])) in range(420,451): wsjt_band = "432"
-        elif (int(wsjt_band.split('.')[0])) in range(900,929): wsjt_band = "902"
-        elif (int(wsjt_band.split('.')[0])) in range(1240,1301): wsjt_band = "1.2G"
-        elif (int(wsjt_band.split('.')[0])) in range(2300,2451): wsjt_band = "2.3G"
-        elif (int(wsjt_band.split('.')[0])) in range(3300,3451): wsjt_band = "3.4G"
-        elif (int(wsjt_band.split('.')[0])) in range(5650,5926): wsjt_band = "5.7G"
-        elif (int(wsjt_band.split('.')[0])) in range(10000,10501): wsjt_band = "10G"
-        elif (int(wsjt_band.split('.')[0])) in range(24000,24251): wsjt_band = "24G"
-        elif (int(wsjt_band.split('.')[0])) in range(47000,47201): wsjt_band = "47G"
-        elif (int(wsjt_band.split('.')[0])) in range(76000,81001): wsjt_band = "75G"
-        elif (int(wsjt_band.split('.')[0])) in range(122250,123001): wsjt_band = "122G"
-        elif (int(wsjt_band.split('.')[0])) in range(134000,141001): wsjt_band = "134G"
-        elif (int(wsjt_band.split('.')[0])) in range(241000,250001): wsjt_band = "241G"
-        else: wsjt_band = "???"
-        
-        # Calculate the distance between the 2 grids
-        stuffed_gridsquare = wsjt_gridsquare.ljust(8, ' ').strip()
-        stuffed_own_gridsquare = Own_Gridsquare.ljust(8, ' ').strip()
-        if (len(stuffed_gridsquare) == 4): stuffed_gridsquare = stuffed_gridsquare + 'LL'  # Assumes the center of the grid
-        if (len(stuffed_own_gridsquare) == 4): stuffed_own_gridsquare = stuffed_own_gridsquare + 'LL'  # Assumes the center of the grid
-        Latest_QSO_Dist = Dist_Between_2_GridSquares(stuffed_own_gridsquare,stuffed_gridsquare)
         # Insert the new QSO in the QSO list
         QSO_Index = 0
-        QSO_Listbox.insert(QSO_Index,wsjt_date.ljust(12, ' ')
-                            + wsjt_time.ljust(6, ' ')
-                            + wsjt_band.ljust(6, ' ')
-                            + wsjt_mode.ljust(4, ' ')
-                            + wsjt_callsign.ljust(10, ' ')
-                            + wsjt_gridsquare.ljust(8, ' ')
-                            + Own_Gridsquare.ljust(8, ' ')
-                            + str(Latest_QSO_Dist))
-        for i in range(0,QSO_Listbox.size()):
-            if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2")  # even lines
-            else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")   # Odd lines
+        QSO_Log.insert(QSO_Index, QSO)
         log_file_save()
+        QSO_Listbox.see(QSO_Index)
         QSO_Listbox.selection_clear(0, END) # Deselects any remaining items
         CallSign_Entry_Val.set("")
         GridSquare_Entry_Val.set("")
         Date_Entry.configure(bg=Default_BG_Color, fg="gray44")
         Time_Entry.configure(bg=Default_BG_Color, fg="gray44")
         Save_QSO_Button.configure(text = "Save QSO", fg = "dark green")        
-        QSO_Entry_Window.configure(bg = Default_BG_Color)    
-        QSO_Listbox.configure(selectbackground="dodger blue")
-        QSO_Lower_button_frame.configure(bg = Default_BG_Color)    
-        QSO_Upper_button_frame.configure(bg = Default_BG_Color)    
-        QSO_Buttons_Frame.configure(bg = Default_BG_Color)
-        Date_Entry_Label.configure(bg = Default_BG_Color)    
-        Time_Entry_Label.configure(bg = Default_BG_Color)    
-        Band_Combo_Label.configure(bg = Default_BG_Color)    
-        CallSign_Entry_Label.configure(bg = Default_BG_Color)    
-        GridSquare_Entry_Label.configure(bg = Default_BG_Color)    
-        Mode_Combo_Label.configure(bg = Default_BG_Color)    
+        Clear_Dupe_Colors()
         QSO_Entry_Window.grab_release()
         Callsign_Entry.focus_set()
-        qso_listbox_dupe_check()
+        qso_listbox_dupe_update()
         update_qso_dots
         Stop_DateTime_Updates = False
         Edit_QSO_Action = False
 
-    if (wsjt_1_logging_enabled):
+    while True:     # All the QSOs received since the last call
         try:
-            data, addr = sock1.recvfrom(1024) # buffer size is 1024 bytes
-            if data[11] == 12:
-                log_string  = data[36:].decode('ascii')
-                extract_to_QSO_Listbox()
-        except: pass
-    if (wsjt_2_logging_enabled):
-        try:
-            data, addr = sock2.recvfrom(1024) # buffer size is 1024 bytes
-            if data[11] == 12:
-                log_string  = data[36:].decode('ascii')
-                extract_to_QSO_Listbox()
-        except: pass
+            QSO = WSJT_QSO_Receiver.queue.get_nowait()
+        except queue.Empty:
+            break
+        extract_to_QSO_Listbox(QSO)
     QSO_Entry_Window.after(100, check_and_save_qso_from_wsjt_thread)
 
 
@@ -893,15 +590,14 @@ def clear_qso_text():
     Date_Entry.configure(bg=Default_BG_Color, fg="gray44")
     Time_Entry.configure(bg=Default_BG_Color, fg="gray44")
     QSO_Entry_Window.configure(bg = Default_BG_Color)    
-    QSO_Listbox.configure(selectbackground="dodger blue")
+    QSO_Listbox.listbox.configure(selectbackground="dodger blue")
     Callsign_Entry.configure(bg="white")
     GridSquare_Entry.configure(bg="white")
     Callsign_Entry.focus_set()
     QSO_Entry_Window.grab_release()
     Stop_DateTime_Updates = False
     Edit_QSO_Action = False
-    qso_listbox_dupe_check()
-    dupe_check()
+    Clear_Dupe_Colors()
 
 # Associates a hint (help) text to a hover action on a widget and displays it in the Hint window.
 def create_hint(widget,hint_text):
@@ -1010,6 +706,7 @@ def stats_button_clicked():
         Contest_Results_Number11_Label.place(x=200,y=245)
 
         # This function is defined inside the stats_button_clicked function because it refers to its widgets
+        @Hot_Path_Timing.timed('update_stats')
         def update_stats():
             calculate_score(Contest_Number)
             if not(Score_Calc_Error): 
@@ -1036,15 +733,16 @@ def stats_button_clicked():
                 Contest_Results_Number9_Label.config(text = '-')
                 Contest_Results_Number10_Label.config(text = '-')
                 Contest_Results_Number11_Label.config(text = 'Inapplicable')                
-            Stats_Window.after(500, update_stats)
 
         # This function is defined inside the stats_button_clicked function because it refers to its widgets      
         def stats_window_exit():
             global Stats_Window_Open
             Stats_Window_Open = False
+            QSO_Score.remove_listener(update_stats)
             Stats_Window.destroy()
 
         update_stats()
+        QSO_Score.add_listener(update_stats)   # The statistics are refreshed by the score engine when the log changes
         Stats_Window_Open = True
 
 # Opens an existing contest log book file and loads the file content into the QSO listbox.
@@ -1054,15 +752,11 @@ def open_contest_button_clicked():
                     filetypes=(("log files", "*.VHFlog"),("all files", "*.*"))) # opens file dialog and returns file name
     if (len(Temp) == 0): return
     Contest_File_Name = Temp
-    log_file_load()
+    log_file_load()     # The map is redrawn by map_store_changed()
     Update_QSO_List_Banner()
-    update_qso_list()
-    update_grid_boxes_no_event()
-    update_qso_dots()
-    qso_listbox_dupe_check()
     grid_has_4_chars = False
-    for i in range(0,QSO_Listbox.size()):    
-        if ((len(QSO_List[i][GRIDSQUARE_POS]) < 6) and (CONTEST_DIST[Contest_Number])): grid_has_4_chars = True
+    for QSO in QSO_Log:    
+        if ((len(QSO.gridsquare) < 6) and (CONTEST_DIST[Contest_Number])): grid_has_4_chars = True
     if (grid_has_4_chars):
         showwarning(title='Contest Config Warning', message='Warning: The QSO list contains 4-character grid squares, but the selected contest calls for 6-character grid squares. Score calculation will be wrong!')
     showinfo('Select Contest Type', 'Make sure to select the Current Contest Type in the Setup window.')
@@ -1076,12 +770,48 @@ def new_contest_button_clicked():
     Contest_File_Name_List = Contest_File_Name.split(".")
     if (Contest_File_Name_List[len(Contest_File_Name_List)-1] != "VHFlog"):
         Contest_File_Name = Contest_File_Name + ".VHFlog"
-    QSO_Listbox.delete(0, last=QSO_Listbox.size()-1)
+    QSO_Log.clear()
     log_file_save()
     Update_QSO_List_Banner()
-    update_qso_list()
     showinfo('Select Contest Type', 'Make sure to select the Current Contest Type in the Setup window.')
 
+# Imports the QSOs of an ADIF file (e.g. the WSJT-X log, to recover a log after a crash) or of a CSV file (.VHFlog
+# format) into the open logbook. Only the QSOs of the contest period and bands that are not already in the logbook are
+# added, all at once: the logbook file is written, the dupes counted and the map updated once for the whole import.
+def import_button_clicked():
+    if (Contest_File_Name == 'No Log loaded...'):
+        showerror(title='Import Error', message='Please open an existing log file or create a new log first.')
+        return
+    filename = filedialog.askopenfilename(title="Import QSOs",
+                    filetypes=(("ADIF files", "*.adi *.adif"),("CSV files", "*.csv *.VHFlog"),("all files", "*.*")))
+    if (len(filename) == 0): return
+    start = min((record for record in QSO_Log if (date_time_key(record) > 0)), key=date_time_key, default=None)
+    start = "" if (start is None) else start.date + " " + start.time[0:2] + "00"
+    hours = CONTEST_HOURS[Contest_Number]
+    start = askstring("Import QSOs", "Contest start, UTC (YYYY-MM-DD HHMM).\n"
+                      + ("QSOs of the " + str(hours) + " hours from the start are imported." if (hours > 0) else "QSOs from the start are imported.")
+                      + "\nLeave empty to import all dates.", initialvalue=start, parent=QSO_List_Window)
+    if (start is None): return
+    try:
+        records, stats = import_qsos(filename, QSO_Log, Contest_Number, Own_Gridsquare, start)
+    except Contest_Start_Error:
+        showerror(title='Import Error', message='Invalid contest start: ' + start + '\nExpected format: ' + datetime.datetime(2025, 6, 14, 18, 0).strftime(START_FORMAT))
+        return
+    except OSError as error:
+        showerror(title='Import Error', message='Cannot read ' + filename + ':\n' + (error.strerror or str(error)))
+        return
+    except ValueError as error:
+        showerror(title='Import Error', message='Cannot import ' + filename + ':\n' + str(error))
+        return
+    if (len(records) > 0):
+        QSO_Log.insert_many(0, records[::-1])   # Newest QSO on top
+        log_file_save()
+        qso_listbox_dupe_check()
+    showinfo('Import Completed', str(stats.imported) + ' QSOs imported.\n' + str(stats.duplicates) + ' already in the log.\n'
+             + str(stats.out_of_period) + ' out of the contest period.\n' + str(stats.out_of_band) + ' out of the contest bands.\n'
+             + str(stats.invalid) + ' incomplete records.')
+    Hints_Window.lift()
+
 # Brings up the splash window to act as an about page
 def about_button_clicked():
     def hide_splash_window(event):    
@@ -1099,7 +829,6 @@ def about_button_clicked():
 def edit_qso_button_clicked():
     global Stop_DateTime_Updates
     global Edit_QSO_Action
-    global Edit_QSO_Index
     global QSO_Line
     Stop_DateTime_Updates = True
     Edit_QSO_Action = True
@@ -1109,89 +838,39 @@ def edit_qso_button_clicked():
     GridSquare_Entry.configure(bg="white")
     Save_QSO_Button.configure(text = "Update QSO", fg = "dark green")        
     QSO_Entry_Window.grab_set()
-    Edit_QSO_Index = QSO_Listbox.curselection()
-    QSO_Line = QSO_Listbox.get(QSO_Listbox.curselection()).split(" ")
-    while "" in QSO_Line: QSO_Line.remove("") # Removes empty strings from list
-    Date_Entry_Val.set(QSO_Line[DATE_POS])
-    Time_Entry_Val.set(QSO_Line[TIME_POS])
-    Band_Combo_Val.set(QSO_Line[BAND_POS])
-    Mode_Combo_Val.set(QSO_Line[MODE_POS])
-    CallSign_Entry_Val.set(QSO_Line[CALLSIGN_POS])
-    GridSquare_Entry_Val.set(QSO_Line[GRIDSQUARE_POS])
-    for i in range(0,QSO_Listbox.size()):
-        if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2") 
-        else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")
-    update_qso_list()
-    qso_listbox_dupe_check()
+    QSO_Line = QSO_Log[QSO_Listbox.curselection()[0]]
+    Date_Entry_Val.set(QSO_Line.date)
+    Time_Entry_Val.set(QSO_Line.time)
+    Band_Combo_Val.set(QSO_Line.band)
+    Mode_Combo_Val.set(QSO_Line.mode)
+    CallSign_Entry_Val.set(QSO_Line.callsign)
+    GridSquare_Entry_Val.set(QSO_Line.gridsquare)
     update_qso_dots
 
 # Erase all QSOs from the QSO entry listbox and from the logbook file.
 def erase_log_button_clicked():
     answer = askyesno("Delete All QSOs", "Are you sure you want to delete ALL QSOs from the QSO list?")
     if not(answer): return
-    QSO_Listbox.delete(0, last=QSO_Listbox.size()-1)
+    QSO_Log.clear()
     log_file_save()
 
 # Erase highlighted QSO from the QSO list.
 def erase_qso_button_clicked():
     answer = askyesno("Erase QSOs Confirmation", "Are you sure you want to erase the selected QSO?")
     if not(answer): return
-    selected_line = QSO_Listbox.curselection()
-    QSO_Listbox.delete(selected_line)
-    for i in range(0,QSO_Listbox.size()):
-        if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2") 
-        else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")
+    selected_line = QSO_Listbox.curselection()[0]
+    QSO_Log.delete(selected_line)
     log_file_save()
-    qso_listbox_dupe_check()
+    qso_listbox_dupe_update()
 
 # Function executed when the delete key is pressed.
 def erase_qso_event(event):
     erase_qso_button_clicked()
 
-# Sort the QSOs in the QSO listbox and saves to the logbook file
-def sort_qsos(field):  
-    global QSO_List
-    # Create list of QSOs
-    update_qso_list()
-    if (field == 7): 	# Sort numerically for distance column
-        QSO_List.sort(key=lambda x: int(x[field]))
-    else:					# otherwise sort alpha-numerically
-        QSO_List.sort(key=lambda x: x[field])        
-    for i in range(0,QSO_Listbox.size()):    
-        QSO_Listbox.delete(i)
-        QSO_Listbox.insert(i,QSO_List[i][DATE_POS].ljust(12, ' ') + QSO_List[i][TIME_POS].ljust(6, ' ') + QSO_List[i][BAND_POS].ljust(6, ' ')
-                        + QSO_List[i][MODE_POS].ljust(4, ' ') + QSO_List[i][CALLSIGN_POS].ljust(10, ' ') + QSO_List[i][GRIDSQUARE_POS].ljust(8, ' ')
-                        + QSO_List[i][OWN_GRIDSQUARE_POS].ljust(8, ' ') + QSO_List[i][DISTANCE_POS].ljust(7, ' ')) 
-        if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2") 
-        else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3") 
-    log_file_save()
-    qso_listbox_dupe_check()
-    
-# Different sort function required for date/time sort of QSOs
-def sort_qsos_by_date():  
-    global QSO_List
-    # Create list of QSOs
-    update_qso_list()
-    QSO_List.sort(key=lambda x:(x[DATE_POS], x[TIME_POS]), reverse=True )   
-    for i in range(0,QSO_Listbox.size()):    
-        QSO_Listbox.delete(i)
-        QSO_Listbox.insert(i,QSO_List[i][DATE_POS].ljust(12, ' ') + QSO_List[i][TIME_POS].ljust(6, ' ') + QSO_List[i][BAND_POS].ljust(6, ' ')
-                        + QSO_List[i][MODE_POS].ljust(4, ' ') + QSO_List[i][CALLSIGN_POS].ljust(10, ' ') + QSO_List[i][GRIDSQUARE_POS].ljust(8, ' ')
-                        + QSO_List[i][OWN_GRIDSQUARE_POS].ljust(8, ' ') + QSO_List[i][DISTANCE_POS].ljust(7, ' '))
-   
-        if (i%2==0): QSO_Listbox.itemconfigure(i, bg = "lightcyan2") 
-        else: QSO_Listbox.itemconfigure(i, bg = "lightcyan3")
-    log_file_save()
-    qso_listbox_dupe_check()
-
-def update_qso_list():
-    global QSO_List
-    # Create list of QSOs
-    QSO_List = []
-    for i in range(0,QSO_Listbox.size()):    
-        QSO_Line = QSO_Listbox.get(i).split(" ")
-        while "" in QSO_Line: QSO_Line.remove("") # Removes empty strings from list
-        QSO_List.append(QSO_Line)
+# Sort the QSOs in the QSO list on a column (see qso_sort.SORT_COLUMNS). The previous sort columns are kept as
+# tie-breakers. Only the display order changes: the logbook file is not rewritten.
+def sort_qsos(column):
+    QSO_Listbox.sort_by(column)
 
 def date_time_has_focus(event):
     global Stop_DateTime_Updates
@@ -1200,6 +879,7 @@ def date_time_has_focus(event):
     Time_Entry.configure(fg="black", bg="white")
         
 # Define a function for the update thread
+@Hot_Path_Timing.timed('update_datetime_and_misc')
 def update_datetime_and_misc():
     global Stop_DateTime_Updates
     # Update date and time in the QSO entry fields
@@ -1214,8 +894,26 @@ def update_datetime_and_misc():
     else:
         Erase_QSO_Button['state'] = NORMAL
         Edit_QSO_Button['state'] = NORMAL
+    update_log_save_status()
     QSO_Entry_Window.after(100, update_datetime_and_misc)
 
+# Shows whether the log file has changes not yet written to disk, or when it was last written
+def update_log_save_status():
+    if (Log_File_Writer.error is not None):
+        Status_Text = "Log file write error!"
+        Status_Color = "red"
+    elif (Log_File_Writer.dirty()) or (QSO_Journal.unsaved):
+        Status_Text = "Log: saving..."
+        Status_Color = "DarkOrange"
+    elif (Log_File_Writer.last_flushed is None):
+        Status_Text = "Log: no changes"
+        Status_Color = "black"
+    else:
+        Status_Text = "Log saved at " + Log_File_Writer.last_flushed.strftime('%H:%M:%S') + "Z"
+        Status_Color = "dark green"
+    if (Log_Save_Status_Label.cget("text") != Status_Text):   # Avoids redrawing the label 10 times per second
+        Log_Save_Status_Label.config(text = Status_Text, fg = Status_Color)
+
 def grid_map_button_clicked():
     Grid_Map_Window.deiconify()
     if (int(Grid_Map_Window.geometry().split("x")[0]) == 1):  # catches when the grid map window has not been open yet. Size is 1x1
@@ -1237,36 +935,42 @@ def cabrillo_file_button_clicked():
     if (Own_Callsign == "") or (Own_Gridsquare == ""):
         showerror("Error!","Cabrillo file Generation requires that you first configure the contest settings. Please fill out the Settings window first.")
         return
-    cabrillo_file = Contest_File_Name.split(".")[0] + ".cablog"
-    cabrillo_file = open(cabrillo_file,'w') # Open config file for rewriting
-    cabrillo_file.write("START-OF-LOG: 3.0\n")
-    cabrillo_file.write("LOCATION: \n")
-    cabrillo_file.write("CALLSIGN: " + Own_Callsign + "\n")
-    cabrillo_file.write("CONTEST: " + CONTEST_CABRILLO_TITLE[Contest_Number] + "\n")
-    cabrillo_file.write("CATEGORY-ASSISTED: \n")
-    cabrillo_file.write("CATEGORY-BAND: \n")
-    cabrillo_file.write("CATEGORY-MODE: \n")
-    cabrillo_file.write("CATEGORY-OPERATOR: \n")
-    cabrillo_file.write("CATEGORY-POWER: \n")
-    cabrillo_file.write("CATEGORY-STATION: \n")
-    cabrillo_file.write("CATEGORY-TRANSMITTER: \n")
-    cabrillo_file.write("NAME: \n")
-    cabrillo_file.write("ADDRESS: \n")
-    cabrillo_file.write("ADDRESS-CITY: \n")
-    cabrillo_file.write("ADDRESS-STATE-PROVINCE: \n")
-    cabrillo_file.write("ADDRESS-POSTALCODE: \n")
-    cabrillo_file.write("ADDRESS-COUNTRY: \n")
-    cabrillo_file.write("EMAIL: \n")
-    cabrillo_file.write("CLAIMED-SCORE: " + str(Score) + "\n")
-    for i in range(0,QSO_Listbox.size()):    
-        QSO_Line = QSO_Listbox.get(i).split(" ")
-        while "" in QSO_Line: QSO_Line.remove("") # Removes empty strings from list
-        cabrillo_file.write("QSO: " + QSO_Line[BAND_POS] + " " + QSO_Line[MODE_POS]  + " " + QSO_Line[DATE_POS] + " "
-                            + QSO_Line[TIME_POS] + " " + Own_Callsign.upper() + " " + QSO_Line[OWN_GRIDSQUARE_POS] + " "
-                            + QSO_Line[CALLSIGN_POS] + " "  + QSO_Line[GRIDSQUARE_POS] + "\n")
-    cabrillo_file.write("END-OF-LOG:\n")
-    cabrillo_file.close()
-    showinfo("Cabrillo File Generation Complete","The Cabrillo file was saved as: \n" + cabrillo_file.name + "\nMake sure to fill in the header section of the Cabrillo file before submitting it.")
+    cabrillo_file = cabrillo_filename(Contest_File_Name)
+    try:
+        errors = export_cabrillo(cabrillo_file, QSO_Log, Own_Callsign, Contest_Number, Score, Own_Gridsquare)
+    except OSError as error:
+        showerror("Error!", "The Cabrillo file could not be written:\n" + cabrillo_file + "\n" + (error.strerror or str(error)))
+        return
+    if (len(errors) > 0):
+        showwarning("Cabrillo File Check", str(len(errors)) + " QSO(s) do not meet the contest rules:\n"
+                    + "\n".join(record.callsign + " " + record.date + " " + record.time + ": " + message for record, message in errors[0:10])
+                    + ("\n..." if (len(errors) > 10) else ""))
+    showinfo("Cabrillo File Generation Complete","The Cabrillo file was saved as: \n" + cabrillo_file + "\nMake sure to fill in the header section of the Cabrillo file before submitting it.")
+
+# Writes the QSOs of the log to an ADIF file (.adi), e.g. for LoTW or QRZ uploads. After a first export, the QSOs can
+# be limited to the ones dated after the newest QSO of the previous export; these go to a file of their own.
+def adif_file_button_clicked():
+    if (Own_Callsign == ""):
+        showerror("Error!","ADIF file Generation requires that you first configure the contest settings. Please fill out the Settings window first.")
+        return
+    mark = read_export_mark(Contest_File_Name)
+    since_last_export = False
+    if (mark.exports > 0):
+        new_qsos = len(records_to_export(QSO_Log, mark))
+        since_last_export = askyesnocancel("ADIF File", "Export only the " + str(new_qsos) + " QSOs not exported yet (logged, imported or edited since the previous ADIF exports)?\nNo exports all the QSOs.")
+        if (since_last_export is None): return
+    records = records_to_export(QSO_Log, mark if (since_last_export) else None)
+    if (len(records) == 0):
+        showinfo("ADIF File", "All the QSOs were already exported.")
+        return
+    adif_file = adif_filename(Contest_File_Name, mark if (since_last_export) else None)
+    try:
+        qsos = export_adif(adif_file, records, Own_Callsign, Contest_Number, SW_VERSION.split()[0], mark)
+        write_export_mark(Contest_File_Name, mark)
+    except OSError as error:
+        showerror("Error!", "The ADIF file could not be written:\n" + adif_file + "\n" + (error.strerror or str(error)))
+        return
+    showinfo("ADIF File Generation Complete", str(qsos) + " QSOs were saved in the ADIF file: \n" + adif_file)
 
 # Creates and opens the Settings window, and treats the settings capture
 def settings_button_clicked():
@@ -1274,11 +978,6 @@ def settings_button_clicked():
     global Own_Gridsquare
     global Own_Gridsquare_Entry_Val
     global Contest_Number
-    global wsjt_1_logging_enabled
-    global wsjt_2_logging_enabled
-    global sock1
-    global sock2
-    global QSO_List
     
     #Converts the operator's grid square to uppercase. Also checks whether the 2-letter/2digits/2-letter grid square format is met
     def validate_setup_gridsquare(event):
@@ -1299,7 +998,7 @@ def settings_button_clicked():
             Own_Gridsquare_Entry_Val.set(re.sub('[^A-R]', '', GridSquare_Breakdown_List[0] + GridSquare_Breakdown_List[1]) + re.sub('[^0-9]', '', GridSquare_Breakdown_List[2] + GridSquare_Breakdown_List[3]) + re.sub('[^A-X]', '', GridSquare_Breakdown_List[4] + GridSquare_Breakdown_List[5]))
 
     def update_qso_font_size(self):
-        QSO_Listbox.configure(font=("Consolas", Font_Size_Scale_Val.get(), "")) # Font_Size_Scale_Val.get()
+        QSO_Listbox.set_font(("Consolas", Font_Size_Scale_Val.get(), "")) # Font_Size_Scale_Val.get()
         # The following workaround is required to refresh the listbox after the font size change.
         QSO_List_Window.geometry('{}x{}'.format(QSO_List_Window.winfo_width()+1, QSO_List_Window.winfo_height()))
         QSO_List_Window.update()
@@ -1313,11 +1012,10 @@ def settings_button_clicked():
         
     def validate_contest_combobox(event):
         global Contest_Number
-        global QSO_List
         grid_has_4_chars = False
         Contest_Number = Contest_Select_Combo.current()
-        for i in range(0,QSO_Listbox.size()):    
-            if ((len(QSO_List[i][GRIDSQUARE_POS]) < 6) and (CONTEST_DIST[Contest_Number])): grid_has_4_chars = True
+        for QSO in QSO_Log:    
+            if ((len(QSO.gridsquare) < 6) and (CONTEST_DIST[Contest_Number])): grid_has_4_chars = True
         if (grid_has_4_chars):
             showwarning(title='Contest Config Warning', message='Warning: The QSO list contains 4-character grid squares, but the selected contest calls for 6-character grid squares. Score calculation will be wrong!', parent=Settings_Window)
             Settings_Window.lift()
@@ -1332,10 +1030,7 @@ def settings_button_clicked():
         global Contest_Number
         Own_Callsign = Own_Callsign_Entry_Val.get().upper()
         Own_Gridsquare = Own_Gridsquare_Entry_Val.get()
-        if (Enable_WSJT_1_Logging_Checkbox_Val.get() == "checked"): wsjt_1_logging_enabled = True
-        else: wsjt_1_logging_enabled = False
-        if (Enable_WSJT_2_Logging_Checkbox_Val.get() == "checked"): wsjt_2_logging_enabled = True
-        else: wsjt_2_logging_enabled = False
+        if not(validate_wsjt_listeners(None)): return
         if (CONTEST_DIST[Contest_Number]) and len(Own_Gridsquare) == 4:
             showwarning(title='Contest Config Error', message='Error: The operator grid square provided only has 4 characters, yet the selected contest requires a 6-character grid square. Please correct the error', parent=Settings_Window)
             Settings_Window.lift()
@@ -1346,29 +1041,56 @@ def settings_button_clicked():
             return       
         Settings_Window.withdraw()
         Settings_Window.grab_release()
+        if (WSJT_Status_Update is not None): Settings_Window.after_cancel(WSJT_Status_Update)
         update_grid_boxes_no_event()
         Grid_Map_Window.update()
         qso_listbox_dupe_check()
         Update_QSO_List_Banner()
 
         
-    def Validate_WSJT_1_Checkbox():
-        global wsjt_1_logging_enabled
-        if (Enable_WSJT_1_Logging_Checkbox_Val.get() == "checked"):
-            wsjt_1_logging_enabled = True
-            try:
-                while sock1.recv(1024): pass  # Empty socket buffer
-            except: pass
-        else: wsjt_1_logging_enabled = False
-
-    def Validate_WSJT_2_Checkbox():
-        global wsjt_2_logging_enabled
-        if (Enable_WSJT_2_Logging_Checkbox_Val.get() == "checked"):
-            wsjt_2_logging_enabled = True
-            try:
-                while sock2.recv(1024): pass  # Empty socket buffer
-            except: pass            
-        else: wsjt_2_logging_enabled = False
+    # Applies the WSJT-X listener list typed in. The listeners kept keep their logging state, the new ones are
+    # enabled. Returns False if the list is not valid.
+    def validate_wsjt_listeners(event):
+        global WSJT_UDP_Sources
+        try:
+            sources = parse_udp_sources(WSJT_Listeners_Entry_Val.get())
+        except ValueError as error:
+            showwarning(title='WSJT-X Listeners Error', message='Error: ' + str(error) + '. Please correct the WSJT-X listener list.', parent=Settings_Window)
+            Settings_Window.lift()
+            return False
+        if (format_udp_sources(sources) != format_udp_sources(WSJT_UDP_Sources)):
+            current = {source.name(): source for source in WSJT_UDP_Sources}
+            WSJT_UDP_Sources = [current.get(source.name(), source) for source in sources]
+            WSJT_QSO_Receiver.set_sources(WSJT_UDP_Sources)
+            build_wsjt_checkboxes()
+        WSJT_Listeners_Entry_Val.set(format_udp_sources(WSJT_UDP_Sources))
+        return True
+
+    # One logging check box per WSJT-X listener, with its packet count, rate and drops
+    def build_wsjt_checkboxes():
+        for widget in WSJT_Listeners_Frame.winfo_children(): widget.destroy()
+        WSJT_Checkbox_Vals.clear()
+        WSJT_Status_Labels.clear()
+        for i in range(0, len(WSJT_UDP_Sources)):
+            source = WSJT_UDP_Sources[i]
+            WSJT_Checkbox_Vals.append(StringVar(Settings_Window, "checked" if (source.enabled) else "unchecked"))
+            Checkbox = Checkbutton(WSJT_Listeners_Frame, text='WSJT-X ' + source.name(), variable=WSJT_Checkbox_Vals[i], onvalue = "checked", offvalue = "unchecked", command=lambda i=i: validate_wsjt_checkbox(i), bg = Default_BG_Color)
+            Checkbox.grid(row = i, column = 0, sticky = "w")
+            create_hint(Checkbox,"This check box enables the logging of the QSOs received from this WSJT-X UDP port or multicast group.")
+            WSJT_Status_Labels.append(Label(WSJT_Listeners_Frame, text = source.status(), bg = Default_BG_Color, fg = "gray30"))
+            WSJT_Status_Labels[i].grid(row = i, column = 1, sticky = "w")
+        Settings_Window.geometry('{}x{}'.format(350, 280 + 26 * len(WSJT_UDP_Sources)))
+
+    def validate_wsjt_checkbox(i):
+        # The receiver thread ignores the QSOs received while disabled
+        WSJT_UDP_Sources[i].enabled = (WSJT_Checkbox_Vals[i].get() == "checked")
+
+    # Refreshes the listener packet counts every second while the window is open
+    def update_wsjt_status():
+        nonlocal WSJT_Status_Update
+        for i in range(0, min(len(WSJT_Status_Labels), len(WSJT_UDP_Sources))):
+            WSJT_Status_Labels[i].config(text = WSJT_UDP_Sources[i].status())
+        WSJT_Status_Update = Settings_Window.after(1000, update_wsjt_status)
 
     # Open dialog
     Settings_Window = Toplevel(QSO_List_Window)
@@ -1418,33 +1140,31 @@ def settings_button_clicked():
     Font_Size_Scale_Val = IntVar(Settings_Window)
     Font_Size_Scale = Scale(Settings_Window, from_=6, to=20, orient=HORIZONTAL, var = Font_Size_Scale_Val, command = update_qso_font_size, bg = Default_BG_Color, showvalue = 0)
     Font_Size_Scale.pack()
-    Font_Size_Scale.set(QSO_Listbox.cget("font").split(" ")[1])
+    Font_Size_Scale.set(QSO_Listbox.listbox.cget("font").split(" ")[1])
     create_hint(Font_Size_Scale,"This cursor adjusts the font size of the QSOs in the QSO list box.")
 
-    Enable_WSJT_1_Logging_Checkbox_Val = StringVar(Settings_Window)
-    Enable_WSJT_1_Logging_Checkbox = Checkbutton(Settings_Window, text='WSJT-X #1 Logging\n(UDP Port 2237)',variable=Enable_WSJT_1_Logging_Checkbox_Val, onvalue = "checked", offvalue = "unchecked", command=Validate_WSJT_1_Checkbox)
-    if (wsjt_1_logging_enabled):
-        Enable_WSJT_1_Logging_Checkbox_Val.set("checked")
-#        if (sock1.fileno() == -1): sock1.bind((UDP_IP, UDP_PORT1))  # Closed socket, open it.
-    else:
-        Enable_WSJT_1_Logging_Checkbox_Val.set("unchecked")
-    Enable_WSJT_1_Logging_Checkbox.pack(pady = (8,0))
-    create_hint(Enable_WSJT_1_Logging_Checkbox,"This check box enables the logging of QSOs made the first instance of WSJT-X.")
-
-    Enable_WSJT_2_Logging_Checkbox_Val = StringVar(Settings_Window)
-    Enable_WSJT_2_Logging_Checkbox = Checkbutton(Settings_Window, text='WSJT-X #2 Logging\n(UDP Port 2239)',variable=Enable_WSJT_2_Logging_Checkbox_Val, onvalue = "checked", offvalue = "unchecked", command=Validate_WSJT_2_Checkbox)
-    if (wsjt_2_logging_enabled):
-        Enable_WSJT_2_Logging_Checkbox_Val.set("checked")
-    else:
-        Enable_WSJT_2_Logging_Checkbox_Val.set("unchecked")
-    Enable_WSJT_2_Logging_Checkbox.pack(pady = (2,0))
-    create_hint(Enable_WSJT_2_Logging_Checkbox,"This check box enables the logging of QSOs made the second instance of WSJT-X.")
+    WSJT_Listeners_Label = Label(Settings_Window,text="WSJT-X UDP Listeners", bg = Default_BG_Color)
+    WSJT_Listeners_Label.pack(pady = (8,0))
+    WSJT_Listeners_Entry_Val = StringVar(Settings_Window, format_udp_sources(WSJT_UDP_Sources))
+    WSJT_Listeners_Entry = Entry(Settings_Window, textvariable=WSJT_Listeners_Entry_Val)
+    WSJT_Listeners_Entry.bind("<Return>", validate_wsjt_listeners)
+    WSJT_Listeners_Entry.configure(width=40)
+    WSJT_Listeners_Entry.pack()
+    create_hint(WSJT_Listeners_Entry,"The UDP ports and multicast groups the WSJT-X or JTDX instances send their QSOs to, separated by commas, e.g.: 2237, 2239, 239.255.0.1:2237 . Press Enter to apply. One logging check box per listener is shown below.")
+
+    WSJT_Checkbox_Vals = []
+    WSJT_Status_Labels = []
+    WSJT_Status_Update = None
+    WSJT_Listeners_Frame = Frame(Settings_Window, bg = Default_BG_Color)
+    WSJT_Listeners_Frame.pack(pady = (4,0))
+    build_wsjt_checkboxes()
+    update_wsjt_status()
     Settings_Window.update()
 
 # Called when either the QSO Entry window or the QSO List window is closed. Signals the program exit.
 def process_app_exit():
     global Contest_Number
-    # Save all settings to the config file
+    # Save all settings to the config file. The station settings are also read by the command-line tools (station_settings.py).
     file = open("./config.sav",'w') # Open config file for reading
     file.write(Contest_File_Name + "\n")
     file.write(QSO_Entry_Window.geometry().split("+")[1] + "\n")
@@ -1452,7 +1172,7 @@ def process_app_exit():
     file.write(str(QSO_List_Window.geometry()) + "\n")
     file.write(str(Stats_Window_Geometry_X) + "\n")
     file.write(str(Stats_Window_Geometry_Y) + "\n")
-    file.write(QSO_Listbox.cget("font").split(" ")[1]  + "\n")
+    file.write(QSO_Listbox.listbox.cget("font").split(" ")[1]  + "\n")
     file.write(str(Contest_Number) + "\n")
     file.write(Own_Callsign + "\n")
     file.write(Own_Gridsquare + "\n")
@@ -1464,9 +1184,19 @@ def process_app_exit():
     file.write(Band3_Combo.get() + "\n")
     file.write(Band4_Combo.get() + "\n")
     file.write(str(Map_Scale_Factor) + "\n")
-    file.write(str(wsjt_1_logging_enabled) + "\n")
-    file.write(str(wsjt_2_logging_enabled) + "\n")
+    # Logging states of ports 2237 and 2239, as read by the previous versions, then the WSJT-X listeners and their states
+    file.write(str(any(source.enabled for source in WSJT_UDP_Sources if source.name() == str(UDP_PORT1))) + "\n")
+    file.write(str(any(source.enabled for source in WSJT_UDP_Sources if source.name() == str(UDP_PORT2))) + "\n")
+    file.write(format_udp_sources(WSJT_UDP_Sources) + "\n")
+    file.write(",".join(str(source.enabled) for source in WSJT_UDP_Sources) + "\n")
     file.close()
+    QSO_Journal.close()     # Compacts the journaled QSO changes into the log file
+    try:
+        if (Latency_Window.shown) or (SAVE_TIMING_SESSIONS): Hot_Path_Timing.save(TIMING_SESSION_FILE)
+    except OSError:
+        pass    # The timing statistics are not essential
+    Log_File_Writer.stop()  # Waits for the pending log file writes
+    WSJT_QSO_Receiver.stop(1)
     # Close the remaining window
     try:    
         QSO_List_Window.destroy()
@@ -1492,14 +1222,13 @@ def recall_qso_in_entry(event):
         Callsign_Entry.configure(bg="white")
         GridSquare_Entry.configure(bg="white")
         Save_QSO_Button.configure(text = "Save as New QSO", fg = "dark green")        
-        QSO_Line = QSO_Listbox.get(QSO_Listbox.curselection()).split(" ")
-        while "" in QSO_Line: QSO_Line.remove("") # Removes empty strings from list
-        Date_Entry_Val.set(QSO_Line[DATE_POS])
-        Time_Entry_Val.set(QSO_Line[TIME_POS])
-        Band_Combo_Val.set(QSO_Line[BAND_POS])
-        Mode_Combo_Val.set(QSO_Line[MODE_POS])
-        CallSign_Entry_Val.set(QSO_Line[CALLSIGN_POS])
-        GridSquare_Entry_Val.set(QSO_Line[GRIDSQUARE_POS])
+        QSO = QSO_Log[QSO_Listbox.curselection()[0]]
+        Date_Entry_Val.set(QSO.date)
+        Time_Entry_Val.set(QSO.time)
+        Band_Combo_Val.set(QSO.band)
+        Mode_Combo_Val.set(QSO.mode)
+        CallSign_Entry_Val.set(QSO.callsign)
+        GridSquare_Entry_Val.set(QSO.gridsquare)
 
 #Main window creation
 QSO_List_Window = Tk()
@@ -1537,52 +1266,46 @@ create_hint(Splash_Window,"To clear this popup window, just click on it.")
 button_frame1 = Frame(QSO_List_Window, relief=RAISED, borderwidth=1)
 button_frame1.pack(fill=BOTH, expand=False)
 
-Sort_By_Date_Button = Button(button_frame1, text = "↑Date/Time",command = sort_qsos_by_date, fg = "blue", font = "Verdana 8",bd = 2)
+Sort_By_Date_Button = Button(button_frame1, text = "↑Date/Time",command = lambda: sort_qsos('date_time'), fg = "blue", font = "Verdana 8",bd = 2)
 Sort_By_Date_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_Date_Button,"Sorts the QSOs by the reversed time/date columns (newest on top).")
 
-Sort_By_Band_Button = Button(button_frame1, text = "↓Band",command = lambda: sort_qsos(2), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_Band_Button = Button(button_frame1, text = "↓Band",command = lambda: sort_qsos('band'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_Band_Button.pack(side=LEFT,fill="x", expand=True)
-create_hint(Sort_By_Band_Button,"Sorts the QSOs by alphabetical order of the radio band column.")
+create_hint(Sort_By_Band_Button,"Sorts the QSOs by radio band, in frequency order.")
 
-Sort_By_Mode_Button = Button(button_frame1, text = "↓Mode", command = lambda: sort_qsos(3), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_Mode_Button = Button(button_frame1, text = "↓Mode", command = lambda: sort_qsos('mode'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_Mode_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_Mode_Button,"Sorts the QSOs by alphabetical order of the mode (PH, CW, DG,...) column.") 
 
-Sort_By_Call_Button = Button(button_frame1, text = "↓Call Sign", command = lambda: sort_qsos(4), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_Call_Button = Button(button_frame1, text = "↓Call Sign", command = lambda: sort_qsos('callsign'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_Call_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_Call_Button,"Sorts the QSOs by alphabetical order of the call sign column.")
 
-Sort_By_Grid_Button = Button(button_frame1, text = "↓Grid", command = lambda: sort_qsos(5), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_Grid_Button = Button(button_frame1, text = "↓Grid", command = lambda: sort_qsos('gridsquare'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_Grid_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_Grid_Button,"Sorts the QSOs by alphabetical order of the grid square column.")
 
-Sort_By_MyGrid_Button = Button(button_frame1, text = "↓MyGrid", command = lambda: sort_qsos(6), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_MyGrid_Button = Button(button_frame1, text = "↓MyGrid", command = lambda: sort_qsos('own_gridsquare'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_MyGrid_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_MyGrid_Button,"Sorts the QSOs by alphabetical order of the operator's grid square column.")
 
-Sort_By_Distance_Button = Button(button_frame1, text = "↓Dist", command = lambda: sort_qsos(7), fg = "blue", font = "Verdana 8", bd = 2)
+Sort_By_Distance_Button = Button(button_frame1, text = "↓Dist", command = lambda: sort_qsos('distance'), fg = "blue", font = "Verdana 8", bd = 2)
 Sort_By_Distance_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Sort_By_Distance_Button,"Sorts the QSOs by the distance value column in kilometers.")
 
-QSO_Listbox = Listbox(QSO_List_Window, width=46, height=15, selectmode="single")  
+# The QSO list is a virtualized view of QSO_Log: only the visible lines are in its listbox (QSO_Listbox.listbox)
+QSO_Listbox = QSO_List_View(QSO_List_Window, QSO_Log, dupe_color, width=46, height=15, selectmode="single")
 QSO_Listbox.pack(fill=BOTH, expand=True)
-QSO_Listbox.configure(font=("Consolas",10 , ""))
-QSO_Listbox_Yscrollbar = Scrollbar(QSO_Listbox,orient=VERTICAL)
-QSO_Listbox_Yscrollbar.pack(side = RIGHT, fill = BOTH)
-QSO_Listbox_Xscrollbar = Scrollbar(QSO_Listbox,orient=HORIZONTAL)
-QSO_Listbox_Xscrollbar.pack(side = BOTTOM, fill = BOTH)
-QSO_Listbox.configure(yscrollcommand = QSO_Listbox_Yscrollbar.set, xscrollcommand = QSO_Listbox_Xscrollbar.set)
-QSO_Listbox_Yscrollbar.configure(command = QSO_Listbox.yview)
-QSO_Listbox_Xscrollbar.configure(command = QSO_Listbox.xview)
-QSO_Listbox.configure(selectbackground="dodger blue")
-QSO_Listbox.configure(bg=Default_BG_Color)
-QSO_Listbox.bind('<<ListboxSelect>>', recall_qso_in_entry)  #<ButtonPress-1>
-create_hint(QSO_Listbox,"""The QSO List shows the QSOs that are saved in the logbook file. \n\nAny QSO displayed in red font flags a call_sign-band-grid duplicate of a previous QSO displayed in orange. \n\nAlso, clicking on a QSO """
+QSO_Listbox.set_font(("Consolas",10 , ""))
+QSO_Listbox.listbox.configure(selectbackground="dodger blue")
+QSO_Listbox.listbox.configure(bg=Default_BG_Color)
+QSO_Listbox.listbox.bind('<<ListboxSelect>>', recall_qso_in_entry, add='+')  # After the view's own selection handler
+create_hint(QSO_Listbox.listbox,"""The QSO List shows the QSOs that are saved in the logbook file. \n\nAny QSO displayed in red font flags a call_sign-band-grid duplicate of a previous QSO displayed in orange. \n\nAlso, clicking on a QSO """
                         """in the list will recall the information in the QSO capture window to save time in logging repeating stations on different bands.""")
 
 # Add a label used when there are no log files loaded at startup, but do not pack it yet.
-No_Log_Loaded_Label = Label(QSO_Listbox, text="Please open an existing log file\nor create a new log.", bg = Default_BG_Color,font="Verdana 12")
+No_Log_Loaded_Label = Label(QSO_Listbox.listbox, text="Please open an existing log file\nor create a new log.", bg = Default_BG_Color,font="Verdana 12")
 
 # Second row of buttons contained inside this frame
 button_frame2 = Frame(QSO_List_Window, relief=RAISED, borderwidth=1)
@@ -1604,6 +1327,10 @@ New_Contest_Button = Button(button_frame2, text = "New Log", command = new_conte
 New_Contest_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(New_Contest_Button,"Clears the logbook list and allows to create a new logbook file. This does not erase any previously-opened logbook file contents")
 
+Import_Button = Button(button_frame2, text = "Import", command = import_button_clicked, fg = "dark green", font = "Verdana 8", bd = 2)
+Import_Button.pack(side=LEFT,fill="x", expand=True)
+create_hint(Import_Button,"Imports the QSOs of an ADIF file (e.g. the WSJT-X log) or of a CSV file into the open logbook. Only the QSOs of the contest period and bands that are not already in the logbook are added.")
+
 Hints_Button = Button(button_frame2, text = "Help", command = hints_button_clicked, fg = "dark green", font = "Verdana 8", bd = 2)
 Hints_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Hints_Button,"Brings up the Help window to display additional information on each function or button.")
@@ -1636,6 +1363,15 @@ Cabrillo_Button = Button(button_frame3, text = "Cabrillo File", command = cabril
 Cabrillo_Button.pack(side=LEFT,fill="x", expand=True)
 create_hint(Cabrillo_Button,"Produces a Cabrillo-formatted file (.vhfcab) required to submit your contest results to the ARRL.")
 
+ADIF_Button = Button(button_frame3, text = "ADIF File", command = adif_file_button_clicked, fg = "red", font = "Verdana 8", bd = 2)
+ADIF_Button.pack(side=LEFT,fill="x", expand=True)
+create_hint(ADIF_Button,"Produces an ADIF file (.adi) of the QSOs, with the grid squares and distances, e.g. for LoTW or QRZ uploads. After a first export, it can include only the QSOs logged since the previous export.")
+
+# Log file save indicator, updated by update_datetime_and_misc()
+Log_Save_Status_Label = Label(QSO_List_Window, text="Log: no changes", bg = Default_BG_Color, font = "Verdana 8", anchor = W)
+Log_Save_Status_Label.pack(fill="x", expand=False)
+create_hint(Log_Save_Status_Label,"Shows whether the QSO changes are being written to the logbook file, or when they were last written. The file is written in the background.")
+
 # Create the QSO Entry window and populate it with widgets
 
 QSO_Entry_Window = Toplevel(QSO_List_Window)
@@ -1827,7 +1563,6 @@ def create_opaque_text(canvas, x, y, text, font, fg="black", bg="white", padding
 
 # Updates the worked grid color boxes on the map
 def update_grid_boxes(event):
-    global QSO_List
     global Lat_Grid_Pitch
     global Long_Grid_Pitch
     global Map_Height
@@ -1839,46 +1574,14 @@ def update_grid_boxes(event):
     global display_grid_boxes
     
     Map_Canvas.delete('Color_Boxes')
-    # Band 1 color rectangles
-    if (len(QSO_List) > 0):
-        Grid_Character_List = []
-        for i in range(0, len(QSO_List)):
-            if (display_grid_boxes and (QSO_List[i][BAND_POS] == Band1_Combo_Val.get())):
-                Grid_Character_List.append(list(QSO_List[i][GRIDSQUARE_POS][0:4]))
-        for i in range(0, len(Grid_Character_List)):
-            Coord_X = 10 * (ord(Grid_Character_List[i][0]) - 65) * Long_Grid_Pitch
-            Coord_X = Coord_X + ((ord(Grid_Character_List[i][2]) - 48) * Long_Grid_Pitch)
-            Coord_Y = Map_Height - (10 * (ord(Grid_Character_List[i][1]) - 65) * Lat_Grid_Pitch)
-            Coord_Y = Coord_Y - ((ord(Grid_Character_List[i][3]) - 48) * Lat_Grid_Pitch)
-            Map_Canvas.create_polygon([Coord_X+1,Coord_Y-1,Coord_X+Long_Grid_Pitch-1,Coord_Y-1,Coord_X+Long_Grid_Pitch-1,Coord_Y-Lat_Grid_Pitch+1,Coord_X+1,Coord_Y-Lat_Grid_Pitch+1],
-                                      outline=BAND1_COLOR, fill = '', width=3, tags='Color_Boxes')
-            
-        Grid_Character_List = []
-        for i in range(0, len(QSO_List)):
-            if (display_grid_boxes and (QSO_List[i][BAND_POS] == Band2_Combo_Val.get())):
-                Grid_Character_List.append(list(QSO_List[i][GRIDSQUARE_POS][0:4]))
-        for i in range(0, len(Grid_Character_List)):
-            Coord_X = 10 * (ord(Grid_Character_List[i][0]) - 65) * Long_Grid_Pitch
-            Coord_X = Coord_X + ((ord(Grid_Character_List[i][2]) - 48) * Long_Grid_Pitch)
-            Coord_Y = Map_Height - (10 * (ord(Grid_Character_List[i][1]) - 65) * Lat_Grid_Pitch)
-            Coord_Y = Coord_Y - ((ord(Grid_Character_List[i][3]) - 48) * Lat_Grid_Pitch)
-            Map_Canvas.create_polygon([Coord_X+4,Coord_Y-4,Coord_X+Long_Grid_Pitch-4,Coord_Y-4,Coord_X+Long_Grid_Pitch-4,Coord_Y-Lat_Grid_Pitch+4,Coord_X+4,Coord_Y-Lat_Grid_Pitch+4],
-                                      outline=BAND2_COLOR, fill = '', width=3, tags='Color_Boxes') #
-            
+    # Band color rectangles, one per worked grid square, drawn inside each other
+    if (len(QSO_Log) > 0):
+        draw_band_grid_boxes(Band1_Combo_Val.get(), 1, BAND1_COLOR)
+        draw_band_grid_boxes(Band2_Combo_Val.get(), 4, BAND2_COLOR)
         if (Map_Scale_Factor != 1): # 4th band is too much for scale=1
             Band3_frame.config(bg='orange',relief=RAISED)
             Band3_Combo.pack(side=LEFT,expand=False,fill=BOTH, padx=2, pady=2)
-            Grid_Character_List = []
-            for i in range(0, len(QSO_List)):
-                if (display_grid_boxes and (QSO_List[i][BAND_POS] == Band3_Combo_Val.get())):
-                    Grid_Character_List.append(list(QSO_List[i][GRIDSQUARE_POS][0:4]))
-            for i in range(0, len(Grid_Character_List)):
-                Coord_X = 10 * (ord(Grid_Character_List[i][0]) - 65) * Long_Grid_Pitch
-                Coord_X = Coord_X + ((ord(Grid_Character_List[i][2]) - 48) * Long_Grid_Pitch)
-                Coord_Y = Map_Height - (10 * (ord(Grid_Character_List[i][1]) - 65) * Lat_Grid_Pitch)
-                Coord_Y = Coord_Y - ((ord(Grid_Character_List[i][3]) - 48) * Lat_Grid_Pitch)
-                Map_Canvas.create_polygon([Coord_X+7,Coord_Y-7,Coord_X+Long_Grid_Pitch-7,Coord_Y-7,Coord_X+Long_Grid_Pitch-7,Coord_Y-Lat_Grid_Pitch+7,Coord_X+7,Coord_Y-Lat_Grid_Pitch+7],
-                                          outline=BAND3_COLOR, fill = '', width=3, tags='Color_Boxes') #
+            draw_band_grid_boxes(Band3_Combo_Val.get(), 7, BAND3_COLOR)
         else:
             Band3_Combo.pack_forget()
             Band3_frame.config(bg=Default_BG_Color,relief=FLAT)        
@@ -1886,18 +1589,7 @@ def update_grid_boxes(event):
         if (Map_Scale_Factor == 2): # 4th band is too much for scale=1
             Band4_frame.config(bg='cyan',relief=RAISED)
             Band4_Combo.pack(side=LEFT,expand=False,fill=BOTH, padx=2, pady=2)
-            Grid_Character_List = []
-            for i in range(0, len(QSO_List)):
-                if (display_grid_boxes and (QSO_List[i][BAND_POS] == Band4_Combo_Val.get())):
-                    Grid_Character_List.append(list(QSO_List[i][GRIDSQUARE_POS][0:4]))
-            for i in range(0, len(Grid_Character_List)):
-                Coord_X = 10 * (ord(Grid_Character_List[i][0]) - 65) * Long_Grid_Pitch
-                Coord_X = Coord_X + ((ord(Grid_Character_List[i][2]) - 48) * Long_Grid_Pitch)
-                Coord_Y = Map_Height - (10 * (ord(Grid_Character_List[i][1]) - 65) * Lat_Grid_Pitch)
-                Coord_Y = Coord_Y - ((ord(Grid_Character_List[i][3]) - 48) * Lat_Grid_Pitch)
-                Map_Canvas.create_polygon([Coord_X+10,Coord_Y-10,Coord_X+Long_Grid_Pitch-10,Coord_Y-10,Coord_X+Long_Grid_Pitch-10,Coord_Y-Lat_Grid_Pitch+10,
-                                           Coord_X+10,Coord_Y-Lat_Grid_Pitch+10],
-                                          outline=BAND4_COLOR, fill = '', width=3, tags='Color_Boxes',stipple="gray50") #
+            draw_band_grid_boxes(Band4_Combo_Val.get(), 10, BAND4_COLOR, stipple="gray50")
         else:
             Band4_Combo.pack_forget()
             Band4_frame.config(bg=Default_BG_Color,relief=FLAT)
@@ -1905,37 +1597,81 @@ def update_grid_boxes(event):
     update_qso_dots()
     Grid_Map_Window.update()
 
+# Draws the boxes of the grid squares worked on a band, inset pixels inside the grid square limits
+def draw_band_grid_boxes(band, inset, color, **options):
+    if not(display_grid_boxes): return
+    for box in band_grid_boxes(QSO_Log, band, inset, Long_Grid_Pitch, Lat_Grid_Pitch, Map_Height):
+        Map_Canvas.create_polygon(box, outline=color, fill = '', width=3, tags='Color_Boxes', **options)
+
 # Add contacted stations markers and labels
 def update_qso_dots():
-    global QSO_List
-    global Lat_Grid_Pitch
-    global Long_Grid_Pitch
-    global Map_Height
-    global Map_Scale_Factor
-    font = ('Helvetica 8 bold')
     Map_Canvas.delete('Station_Dots')
     create_qth_dot(Own_Gridsquare_X,Own_Gridsquare_Y,5,Map_Canvas)
     if (Station_Checkbutton_Val.get() == 1):
-        for i in range(0, len(QSO_List)):
-            if (QSO_List[i][BAND_POS] == Band1_Combo_Val.get()): band_color = BAND1_COLOR
-            elif (QSO_List[i][BAND_POS] == Band2_Combo_Val.get()): band_color = BAND2_COLOR
-            elif (QSO_List[i][BAND_POS] == Band3_Combo_Val.get()): band_color = BAND3_COLOR
-            elif (QSO_List[i][BAND_POS] == Band4_Combo_Val.get()): band_color = BAND4_COLOR
-            else: band_color = 'white'
-            QSO_Gridsquare = QSO_List[i][GRIDSQUARE_POS]
-            QSO_Gridsquare_X = 10 * (ord(QSO_Gridsquare[0]) - 65) * Long_Grid_Pitch
-            QSO_Gridsquare_X = QSO_Gridsquare_X + ((ord(QSO_Gridsquare[2]) - 48) * Long_Grid_Pitch)     
-            if (len(QSO_Gridsquare) == 6): QSO_Gridsquare_X = QSO_Gridsquare_X + round((ord(QSO_Gridsquare[4]) - 65) * Long_Grid_Pitch/24)
-            else: QSO_Gridsquare_X = QSO_Gridsquare_X + 0.5 * Long_Grid_Pitch
-            QSO_Gridsquare_Y = Map_Height - (10 * (ord(QSO_Gridsquare[1]) - 65) * Lat_Grid_Pitch)
-            QSO_Gridsquare_Y = QSO_Gridsquare_Y - ((ord(QSO_Gridsquare[3]) - 48) * Lat_Grid_Pitch) # - 0.5 * Lat_Grid_Pitch
-            if (len(QSO_Gridsquare) == 6): QSO_Gridsquare_Y = QSO_Gridsquare_Y - round((ord(QSO_Gridsquare[5]) - 65) * Lat_Grid_Pitch/24)
-            else: QSO_Gridsquare_Y = QSO_Gridsquare_Y - 0.5 * Lat_Grid_Pitch
-            create_qso_dot(QSO_Gridsquare_X,QSO_Gridsquare_Y,3,Map_Canvas)
-            create_opaque_text(Map_Canvas, QSO_Gridsquare_X, QSO_Gridsquare_Y + 6, QSO_List[i][CALLSIGN_POS], font, 'black', band_color )  # 'red2'
-#            create_qso_text(QSO_Gridsquare_X, QSO_Gridsquare_Y, QSO_List[i][CALLSIGN_POS], Map_Canvas)
+        for record in QSO_Log: draw_qso_dot(record)
         Grid_Map_Window.update()
 
+# Draws the marker and label of a QSO, tagged with its record id so they can be removed alone
+def draw_qso_dot(record):
+    font = ('Helvetica 8 bold')
+    if (record.band == Band1_Combo_Val.get()): band_color = BAND1_COLOR
+    elif (record.band == Band2_Combo_Val.get()): band_color = BAND2_COLOR
+    elif (record.band == Band3_Combo_Val.get()): band_color = BAND3_COLOR
+    elif (record.band == Band4_Combo_Val.get()): band_color = BAND4_COLOR
+    else: band_color = 'white'
+    QSO_Gridsquare = record.gridsquare
+    QSO_Gridsquare_X = 10 * (ord(QSO_Gridsquare[0]) - 65) * Long_Grid_Pitch
+    QSO_Gridsquare_X = QSO_Gridsquare_X + ((ord(QSO_Gridsquare[2]) - 48) * Long_Grid_Pitch)     
+    if (len(QSO_Gridsquare) == 6): QSO_Gridsquare_X = QSO_Gridsquare_X + round((ord(QSO_Gridsquare[4]) - 65) * Long_Grid_Pitch/24)
+    else: QSO_Gridsquare_X = QSO_Gridsquare_X + 0.5 * Long_Grid_Pitch
+    QSO_Gridsquare_Y = Map_Height - (10 * (ord(QSO_Gridsquare[1]) - 65) * Lat_Grid_Pitch)
+    QSO_Gridsquare_Y = QSO_Gridsquare_Y - ((ord(QSO_Gridsquare[3]) - 48) * Lat_Grid_Pitch) # - 0.5 * Lat_Grid_Pitch
+    if (len(QSO_Gridsquare) == 6): QSO_Gridsquare_Y = QSO_Gridsquare_Y - round((ord(QSO_Gridsquare[5]) - 65) * Lat_Grid_Pitch/24)
+    else: QSO_Gridsquare_Y = QSO_Gridsquare_Y - 0.5 * Lat_Grid_Pitch
+    items = [create_qso_dot(QSO_Gridsquare_X,QSO_Gridsquare_Y,3,Map_Canvas)]
+    items.extend(create_opaque_text(Map_Canvas, QSO_Gridsquare_X, QSO_Gridsquare_Y + 6, record.callsign, font, 'black', band_color ))  # 'red2'
+#    create_qso_text(QSO_Gridsquare_X, QSO_Gridsquare_Y, record.callsign, Map_Canvas)
+    for item in items:
+        if (item is not None): Map_Canvas.addtag_withtag('QSO_' + str(record.id), item)
+
+# Bands of the grid boxes displayed at the current map scale, as (band, inset, color, options) tuples
+def displayed_map_bands():
+    bands = [(Band1_Combo_Val.get(), 1, BAND1_COLOR, {}), (Band2_Combo_Val.get(), 4, BAND2_COLOR, {})]
+    if (Map_Scale_Factor != 1): bands.append((Band3_Combo_Val.get(), 7, BAND3_COLOR, {}))
+    if (Map_Scale_Factor == 2): bands.append((Band4_Combo_Val.get(), 10, BAND4_COLOR, {'stipple': "gray50"}))
+    return bands
+
+# Draws the box of a grid square worked on a band, if the band is displayed. The box goes under the QTH and QSO dots.
+def draw_grid_box(band, gridsquare):
+    if not(display_grid_boxes): return
+    for displayed_band, inset, color, options in displayed_map_bands():
+        if (displayed_band != band): continue
+        box = Map_Canvas.create_polygon(grid_box(gridsquare, inset, Long_Grid_Pitch, Lat_Grid_Pitch, Map_Height),
+                                        outline=color, fill = '', width=3, tags=('Color_Boxes', 'Box_' + band + '_' + gridsquare), **options)
+        if (Map_Canvas.find_withtag('QTH_Dot')): Map_Canvas.tag_lower(box, 'QTH_Dot')
+
+# Follows the QSO_Log changes on the map. A new, edited or erased QSO only adds or removes its own dot, and the box
+# of its grid square when it is the first or last QSO of that grid square on its band. A reset redraws the whole map.
+def map_store_changed(action, record, old_record, index):
+    if (action == 'reset'):
+        Map_Worked_Grids.clear()
+        Map_Worked_Grids.update((record.band, record.gridsquare[0:4]) for record in QSO_Log)
+        update_grid_boxes_no_event()
+        return
+    removed = record if (action == 'delete') else old_record
+    if (removed is not None):
+        Map_Canvas.delete('QSO_' + str(removed.id))
+        grid = (removed.band, removed.gridsquare[0:4])
+        Map_Worked_Grids[grid] -= 1
+        if (Map_Worked_Grids[grid] <= 0):
+            del Map_Worked_Grids[grid]
+            Map_Canvas.delete('Box_' + grid[0] + '_' + grid[1])
+    if (action in ('insert', 'replace')):
+        grid = (record.band, record.gridsquare[0:4])
+        Map_Worked_Grids[grid] += 1
+        if (Map_Worked_Grids[grid] == 1): draw_grid_box(*grid)
+        if (Station_Checkbutton_Val.get() == 1): draw_qso_dot(record)
+
 # Is used to call the grid box updates when no event is passed.
 def update_grid_boxes_no_event():
     update_grid_boxes("")
@@ -2099,6 +1835,7 @@ Close_Map_Config_Button.pack(side=TOP, expand=False, fill = X, padx=2, pady=8)
 Map_Config_Frame.lower();
 
 # (Re)draws the World Grid map and restores the center map position to the same position after scaling
+@Hot_Path_Timing.timed('draw_map')
 def draw_map(event):
     global Lat_Grid_Pitch
     global Long_Grid_Pitch
@@ -2137,7 +1874,6 @@ def draw_map(event):
         Map_Canvas.yview_moveto(Old_Scrollbar_Y - 0.5 * int(re.split("[x+]",Grid_Map_Window.geometry())[1]) / Map_Height * (1 - Map_Scale_Factor / Old_Map_Scale_Factor)) #* (Map_Scale_Factor / Old_Map_Scale_Factor)
     draw_dist_and_az_lines()
     update_grid_boxes_no_event()
-    update_qso_dots()
     Wait_For_Loading_Label.pack_forget()
     Grid_Map_Window.update()
 
@@ -2179,7 +1915,7 @@ try:
     QSO_List_Window.geometry(file.readline()[:-1])
     Stats_Window_Geometry_X = int(file.readline()[:-1])
     Stats_Window_Geometry_Y = int(file.readline()[:-1])    
-    QSO_Listbox.configure(font=("Consolas",file.readline()[:-1] , "")) 
+    QSO_Listbox.set_font(("Consolas",file.readline()[:-1] , "")) 
     Contest_Number = int(file.readline()[:-1])
     Own_Callsign = file.readline()[:-1]
     Own_Gridsquare = file.readline()[:-1]
@@ -2191,10 +1927,17 @@ try:
     Band3_Combo.set(file.readline()[:-1])
     Band4_Combo.set(file.readline()[:-1])
     Map_Scale_Factor = float(file.readline()[:-1])
-    if (file.readline()[:-1] == 'True'): wsjt_1_logging_enabled = True
-    else: wsjt_1_logging_enabled = False
-    if (file.readline()[:-1] == 'True'): wsjt_2_logging_enabled = True
-    else: wsjt_2_logging_enabled = False
+    WSJT_UDP_Sources[0].enabled = (file.readline()[:-1] == 'True')
+    WSJT_UDP_Sources[1].enabled = (file.readline()[:-1] == 'True')
+    WSJT_Listeners = file.readline().rstrip("\n")     # Empty in the config files of the previous versions
+    WSJT_Listeners_Enabled = file.readline().rstrip("\n").split(",")
+    if (WSJT_Listeners != ""):
+        try:
+            WSJT_UDP_Sources = parse_udp_sources(WSJT_Listeners)
+        except ValueError:
+            pass    # The default listeners are kept
+        for i in range(0, len(WSJT_UDP_Sources)):
+            WSJT_UDP_Sources[i].enabled = (i < len(WSJT_Listeners_Enabled)) and (WSJT_Listeners_Enabled[i] == 'True')
     file.close()
     if (Contest_File_Name != 'No Log loaded...'): log_file_load()
     World_Scale_Combo_Val.set(Map_Scale_Factor)
@@ -2223,9 +1966,16 @@ Hints_Window.protocol('WM_DELETE_WINDOW',lambda: Hints_Window.withdraw())
 
 QSO_Entry_Window.after(100, update_datetime_and_misc)  # Initially calls the date and time function as a separate thread   
 
+# Hot path timing: keystroke latency of the QSO entry fields and main loop stalls. F12 shows or hides the latency window.
+Hot_Path_Timing.watch_keystrokes([Date_Entry, Time_Entry, Callsign_Entry, GridSquare_Entry])
+Hot_Path_Timing.start_stall_probe(QSO_Entry_Window)
+Latency_Window = Latency_Overlay(QSO_List_Window, Hot_Path_Timing)
+QSO_Entry_Window.bind("<F12>", Latency_Window.toggle)
+QSO_List_Window.bind("<F12>", Latency_Window.toggle)
+
 QSO_List_Window.deiconify()  # Show the QSO list window
 
-QSO_Listbox.bind("<Delete>", erase_qso_event) # Attaches the delete key press to a QSO delete action.
+QSO_Listbox.listbox.bind("<Delete>", erase_qso_event) # Attaches the delete key press to a QSO delete action.
 
 # Display the splash screen centered on the list window at startup
 x = round(int(QSO_List_Window.geometry().split("+")[1]) + int(re.split("[x+]",QSO_List_Window.geometry())[0])/2 - 150)
@@ -2234,24 +1984,19 @@ Splash_Window.geometry("%dx%d+%d+%d" % (300,200,x,y))  # Place splash screen at
 Splash_Window.deiconify()   # Show the splash window.
 
 # Now update everything based on the loaded contest logbook.
-update_qso_list()
 draw_map(None)
-update_grid_boxes_no_event()
-update_qso_dots()
-Grid_Map_Window.update()
+QSO_Log.add_listener(map_store_changed)     # From now on, each QSO change only redraws its own box and dot
+map_store_changed('reset', None, None, -1)
 qso_listbox_dupe_check()
 Splash_Window.withdraw()   # Hide the splash window.
 Splash_Window.grab_release()
 Callsign_Entry.focus_set()  # Send the focus to the QSO entry window.
 
-# Define and bind UDP sockets whether the UDP monitoring is enabled or not.
-sock1 = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)  # Internet and UDP
-sock1.settimeout(0.1)
-sock1.bind((UDP_IP, UDP_PORT1))
-sock2 = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)  # Internet and UDP
-sock2.settimeout(0.1)
-sock2.bind((UDP_IP, UDP_PORT2))
-QSO_Entry_Window.after(100, check_and_save_qso_from_wsjt_thread)  # Launch the WSJT-X UDP monitoring thread
+# The receiver thread listens to the WSJT-X UDP ports and multicast groups whether their logging is enabled or not;
+# the QSOs of a disabled listener are dropped
+WSJT_QSO_Receiver = WSJT_Receiver(WSJT_UDP_Sources, lambda: Own_Gridsquare)
+WSJT_QSO_Receiver.start()
+QSO_Entry_Window.after(100, check_and_save_qso_from_wsjt_thread)  # Launch the WSJT-X QSO logging
 
 # Loop the main window
 QSO_Entry_Window.mainloop()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# ADIF (Amateur Data Interchange Format, .adi) reading and writing. The reader is a single-pass tokenizer: each data
+# specifier <name:length[:type]>value is found with one scan of the text, and the records are yielded one at a time,
+# so a large .adi file is read in constant memory. It accepts str, bytes or a file opened in text or binary mode.
+# With bytes, the field lengths are counted in bytes and the values decoded as UTF-8 (as written by WSJT-X).
+# The writer writes the records as they come, one line per record.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+from collections import namedtuple
+
+ADIF_VERSION = "3.1.4"
+CHUNK_SIZE = 65536      # Characters or bytes read from a file at a time
+
+# One data specifier. name is in lowercase; length is None for the tags without a value (<eoh>, <eor>).
+ADIF_Field = namedtuple('ADIF_Field', ['name', 'length', 'type', 'value'])
+
+
+# The text of an ADIF source, in chunks
+def _chunks(source, chunk_size):
+    if isinstance(source, (str, bytes, bytearray)):
+        yield source
+        return
+    while True:
+        chunk = source.read(chunk_size)
+        if not(chunk): return
+        yield chunk
+
+# Yields the data specifiers of an ADIF source (str, bytes, or a text or binary file), header fields and tags included,
+# in order. A '<' that does not start a valid data specifier is skipped as text, as in the header comment.
+def adif_tokens(source, chunk_size=CHUNK_SIZE):
+    chunks = _chunks(source, chunk_size)
+    buffer = next(chunks, None)
+    if (buffer is None): return
+    is_bytes = not(isinstance(buffer, str))
+    tag_start, tag_end, separator = (b'<', b'>', b':') if (is_bytes) else ('<', '>', ':')
+    position = 0
+    at_end = False
+    while True:
+        start = buffer.find(tag_start, position)
+        end = buffer.find(tag_end, start + 1) if (start >= 0) else -1
+        if (end < 0):   # Incomplete tag, or no tag: more text is needed
+            if (at_end): return
+            chunk = next(chunks, None)
+            if (chunk is None): at_end = True
+            else:
+                buffer = buffer[start:] + chunk if (start >= 0) else chunk
+                position = 0
+            continue
+        next_start = buffer.find(tag_start, start + 1, end)
+        if (next_start >= 0):   # A '<' in the text before a tag
+            position = next_start
+            continue
+        specifier = buffer[start + 1:end].split(separator)
+        if (is_bytes): specifier = [part.decode('ascii', 'replace') for part in specifier]
+        name = specifier[0].strip().lower()
+        if (len(specifier) == 1):
+            position = end + 1
+            yield ADIF_Field(name, None, None, "")
+            continue
+        length = specifier[1].strip()
+        if not(length.isdigit()) or (name == ""):
+            position = start + 1    # Not a data specifier
+            continue
+        length = int(length)
+        value_end = end + 1 + length
+        while (value_end > len(buffer)) and not(at_end):     # The value continues in the next chunks
+            chunk = next(chunks, None)
+            if (chunk is None): at_end = True
+            else:
+                buffer = buffer[start:] + chunk
+                value_end -= start
+                end -= start
+                start = 0
+        value = buffer[end + 1:value_end]
+        if (is_bytes): value = value.decode('utf-8', 'replace')
+        position = value_end
+        yield ADIF_Field(name, length, specifier[2].strip() if (len(specifier) > 2) else None, value)
+
+# Yields the QSO records of an ADIF source as dictionaries of field values, keyed by the field names in lowercase.
+# The header fields are skipped, and so is a last record without its <eor> tag. If header is a dictionary, it receives
+# the header fields.
+def read_records(source, header=None, chunk_size=CHUNK_SIZE):
+    record = {}
+    for field in adif_tokens(source, chunk_size):
+        if (field.length is not None): record[field.name] = field.value
+        elif (field.name == 'eor'):
+            yield record
+            record = {}
+        elif (field.name == 'eoh'):
+            if (header is not None): header.update(record)
+            record = {}
+
+# Text of one data specifier, e.g. <call:6>VE2ZAZ
+def adif_field_text(name, value):
+    value = str(value)
+    return "<" + name + ":" + str(len(value)) + ">" + value
+
+
+# Writes ADIF records to a text file, one line per record. Fields with an empty value are left out.
+class ADIF_Writer:
+
+    def __init__(self, file, program_id="VCL", program_version=""):
+        self.file = file
+        self.program_id = program_id
+        self.program_version = program_version
+        self.records = 0
+
+    # Writes the header. comment is the free text at the top of the file.
+    def write_header(self, comment="", created=None):
+        if (created is None): created = datetime.datetime.now(datetime.UTC)
+        fields = [('adif_ver', ADIF_VERSION), ('created_timestamp', created.strftime('%Y%m%d %H%M%S')),
+                  ('programid', self.program_id), ('programversion', self.program_version)]
+        self.file.write((comment or "ADIF export") + "\n"
+                        + "\n".join(adif_field_text(name, value) for name, value in fields if (str(value) != ""))
+                        + "\n<eoh>\n\n")
+
+    # Writes one record: a dictionary or a list of (name, value) pairs, written in order
+    def write_record(self, fields):
+        if isinstance(fields, dict): fields = fields.items()
+        self.file.write(" ".join(adif_field_text(name, value) for name, value in fields if (str(value) != ""))
+                        + " <eor>\n")
+        self.records += 1
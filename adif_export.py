@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# ADIF export of a logbook, e.g. for LoTW or QRZ uploads. The QSOs are streamed from the QSO store to the ADIF
+# writer, oldest first, with the grid squares and the distance. An export mark saved next to the log file remembers
+# the QSOs exported, so that the next export can be limited to the QSOs not exported yet, whatever their date.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import os
+
+from adif import ADIF_Writer
+from band_plan import cabrillo_to_adif
+from contest_tables import CONTEST_ADIF_ID
+from log_import import qso_key
+
+# ADIF mode of the Cabrillo modes. The digital QSOs (DG) are considered FT8, the mode of most VHF digital QSOs.
+CAB_TO_ADIF_MODE = {"CW": "CW", "PH": "SSB", "FM": "FM", "RY": "RTTY", "DG": "FT8"}
+ADIF_EXTENSION = ".adi"
+EXPORT_MARK_EXTENSION = ".adimark"
+WRITE_BUFFER_SIZE = 1 << 20
+PROGRAM_ID = "VCL"
+
+
+# QSOs of the previous ADIF exports of a log, by qso_key(). A QSO logged, imported or edited after an export is not
+# in the mark, whatever its date and time, so it is part of the next export. exports counts the exports made.
+class Export_Mark:
+
+    def __init__(self, exports=0, exported=()):
+        self.exports = exports
+        self.exported = set(exported)   # qso_key() of the QSOs exported
+
+    # True if the QSO was part of a previous export
+    def is_exported(self, record):
+        return qso_key(record) in self.exported
+
+    # Adds an exported QSO to the mark
+    def add(self, record):
+        self.exported.add(qso_key(record))
+
+
+# ADIF file name of a log file, and of the incremental exports after a mark (numbered after the exports made)
+def adif_filename(log_filename, mark=None):
+    if (mark is None) or (mark.exports == 0): return os.path.splitext(log_filename)[0] + ADIF_EXTENSION
+    return os.path.splitext(log_filename)[0] + "_export" + str(mark.exports + 1) + ADIF_EXTENSION
+
+def export_mark_filename(log_filename):
+    return os.path.splitext(log_filename)[0] + EXPORT_MARK_EXTENSION
+
+# Reads the export mark of a log file, an empty mark if the log was never exported (or the mark file is unreadable)
+def read_export_mark(log_filename):
+    try:
+        with open(export_mark_filename(log_filename), 'r') as file:
+            lines = [line.rstrip("\n") for line in file]
+        return Export_Mark(int(lines[0]), [tuple(line.split(",")) for line in lines[1:] if (line != "")])
+    except (OSError, ValueError, IndexError):
+        return Export_Mark()
+
+# Saves the export mark of a log file. The file is replaced in one step, so a crash never leaves half a mark.
+# Raises OSError if the file cannot be written.
+def write_export_mark(log_filename, mark):
+    filename = export_mark_filename(log_filename)
+    with open(filename + ".tmp", 'w') as file:
+        file.write(str(mark.exports) + "\n")
+        file.writelines(",".join(key) + "\n" for key in sorted(mark.exported))
+    os.replace(filename + ".tmp", filename)
+
+# QSOs of a store not exported yet (all the QSOs without mark), oldest first. The store is in log order, newest first.
+def records_to_export(store, mark=None):
+    return [record for record in reversed(store.records) if (mark is None) or not(mark.is_exported(record))]
+
+# ADIF fields of a QSO record
+def adif_qso_fields(record, own_callsign, contest_id=""):
+    return [('call', record.callsign), ('qso_date', record.date.replace("-", "")), ('time_on', record.time),
+            ('band', cabrillo_to_adif(record.band)), ('mode', CAB_TO_ADIF_MODE.get(record.mode, record.mode)),
+            ('gridsquare', record.gridsquare), ('my_gridsquare', record.own_gridsquare),
+            ('distance', record.distance_text()), ('station_callsign', own_callsign.upper()), ('contest_id', contest_id)]
+
+# Writes the QSO records to an ADIF file, in order, and adds them (and the export) to the mark, if given.
+# Returns the number of QSOs written. Raises OSError if the file cannot be written.
+def export_adif(filename, records, own_callsign, contest_number, program_version="", mark=None):
+    contest_id = CONTEST_ADIF_ID[contest_number]
+    with open(filename, 'w', buffering=WRITE_BUFFER_SIZE) as file:
+        writer = ADIF_Writer(file, PROGRAM_ID, program_version)
+        writer.write_header("VCL ADIF export")
+        for record in records:
+            writer.write_record(adif_qso_fields(record, own_callsign, contest_id))
+            if (mark is not None): mark.add(record)
+    if (mark is not None): mark.exports += 1
+    return writer.records
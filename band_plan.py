@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Amateur band plan: the band edges and the Cabrillo and ADIF names of each band, in one table shared by the WSJT-X
+# receiver, the ADIF import and the Cabrillo-ADIF converter. A frequency is looked up with a binary search on the
+# lower band edges. Frequencies can be given in Hz, kHz, MHz or GHz.
+# The VHF and up edges cover both the ADIF band limits and the ranges accepted by the previous versions of the logger.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from bisect import bisect_right
+from dataclasses import dataclass
+
+UNIT_FACTORS = {'hz': 1e-6, 'khz': 1e-3, 'mhz': 1.0, 'ghz': 1e3}     # Multiplier to MHz
+UNKNOWN_BAND = "???"    # Cabrillo band of a frequency out of the band plan, as logged by the WSJT-X receiver
+
+
+# One band: lower edge (included) and upper edge (excluded) in MHz, Cabrillo and ADIF band names
+@dataclass(frozen=True, slots=True)
+class Band:
+    low: float
+    high: float
+    cabrillo: str
+    adif: str
+
+
+# In frequency order
+BAND_PLAN = [Band(1.8, 2.0, "1800", "160m"),
+             Band(3.5, 4.0, "3500", "80m"),
+             Band(5.06, 5.45, "5300", "60m"),
+             Band(7.0, 7.3, "7000", "40m"),
+             Band(10.1, 10.15, "10100", "30m"),
+             Band(14.0, 14.35, "14000", "20m"),
+             Band(18.068, 18.168, "18068", "17m"),
+             Band(21.0, 21.45, "21000", "15m"),
+             Band(24.89, 24.99, "24890", "12m"),
+             Band(28.0, 29.7, "28000", "10m"),
+             Band(50, 54, "50", "6m"),
+             Band(69, 71, "70", "4m"),
+             Band(144, 149, "144", "2m"),
+             Band(220, 226, "222", "1.25m"),
+             Band(420, 451, "432", "70cm"),
+             Band(900, 929, "902", "33cm"),
+             Band(1240, 1301, "1.2G", "23cm"),
+             Band(2300, 2451, "2.3G", "13cm"),
+             Band(3300, 3501, "3.4G", "9cm"),
+             Band(5650, 5926, "5.7G", "6cm"),
+             Band(10000, 10501, "10G", "3cm"),
+             Band(24000, 24251, "24G", "1.25cm"),
+             Band(47000, 47201, "47G", "6mm"),
+             Band(75500, 81001, "75G", "4mm"),
+             Band(119980, 123001, "122G", "2.5mm"),
+             Band(134000, 149001, "134G", "2mm"),
+             Band(241000, 250001, "241G", "1mm")]
+BAND_LOW_EDGES = [band.low for band in BAND_PLAN]
+
+# Cabrillo bands in frequency order. Light (laser) QSOs have no frequency band and come last.
+CABRILLO_BANDS = [band.cabrillo for band in BAND_PLAN] + ['LIGHT']
+CABRILLO_TO_ADIF = {band.cabrillo: band.adif for band in BAND_PLAN}
+ADIF_TO_CABRILLO = {band.adif: band.cabrillo for band in BAND_PLAN}
+
+
+# Frequency in MHz of a number or numeric string in the given unit ('Hz', 'kHz', 'MHz' or 'GHz').
+# Raises ValueError if the frequency or the unit is not valid.
+def frequency_mhz(frequency, unit='MHz'):
+    factor = UNIT_FACTORS.get(unit.lower())
+    if (factor is None): raise ValueError("Unknown frequency unit: " + str(unit))
+    return float(frequency) * factor
+
+# Band of a frequency, None if out of the band plan. Raises ValueError if the frequency is not valid.
+def find_band(frequency, unit='MHz'):
+    mhz = frequency_mhz(frequency, unit)
+    i = bisect_right(BAND_LOW_EDGES, mhz) - 1
+    if (i >= 0) and (mhz < BAND_PLAN[i].high): return BAND_PLAN[i]
+    return None
+
+# Cabrillo band name of a frequency (e.g. "144"), default if out of the band plan
+def cabrillo_band(frequency, unit='MHz', default=UNKNOWN_BAND):
+    band = find_band(frequency, unit)
+    if (band is None): return default
+    return band.cabrillo
+
+# ADIF band name of a frequency (e.g. "2m"), default if out of the band plan
+def adif_band(frequency, unit='MHz', default=""):
+    band = find_band(frequency, unit)
+    if (band is None): return default
+    return band.adif
+
+# ADIF band name of a Cabrillo band name, default if unknown
+def cabrillo_to_adif(cabrillo, default=""):
+    return CABRILLO_TO_ADIF.get(cabrillo.upper(), default)
+
+# Cabrillo band name of an ADIF band name (not case sensitive), default if unknown
+def adif_to_cabrillo(adif, default=""):
+    return ADIF_TO_CABRILLO.get(adif.lower(), default)
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Synthetic contest log generator, for the benchmarks. Writes a realistic .VHFlog file: QSOs spread over a contest
+# weekend, a band mix taken from the contest bands (more QSOs on the lower bands), stations worked again on other
+# bands, rover own grid square changes, a share of dupes and a mix of 4 and 6-character grid squares.
+#
+# Usage: python3 generate_log.py [-n QSOS] [-c CONTEST] [--dupe-rate R] [--rover-grids N] [--six-char-rate R]
+#                                [--seed S] <output .VHFlog file>
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import datetime
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from contest_tables import CONTESTS, CONTEST_BANDS, CONTEST_MODES, CONTEST_DIST
+from qso_store import QSO_Record
+from grid_geometry import qso_distance     # Distance as calculated by the logger when a QSO is saved
+
+OWN_GRIDSQUARE = "FN25BK"
+CONTEST_START = datetime.datetime(2025, 6, 14, 18, 0)
+CONTEST_HOURS = 33
+CALL_PREFIXES = ['VE2', 'VE3', 'VA2', 'VA3', 'K1', 'W1', 'N1', 'K2', 'W2', 'N2', 'K3', 'W3', 'KB1', 'WA2', 'KC3']
+
+
+# Grid square offset by a number of grid squares (2 degrees of longitude, 1 degree of latitude) from another one.
+# six_char adds a random sub-square.
+def offset_gridsquare(gridsquare, long_offset, lat_offset, rng, six_char):
+    long_index = min(179, max(0, (ord(gridsquare[0]) - 65) * 10 + int(gridsquare[2]) + long_offset))
+    lat_index = min(179, max(0, (ord(gridsquare[1]) - 65) * 10 + int(gridsquare[3]) + lat_offset))
+    grid = chr(65 + long_index // 10) + chr(65 + lat_index // 10) + str(long_index % 10) + str(lat_index % 10)
+    if (six_char): grid += chr(65 + rng.randrange(24)) + chr(65 + rng.randrange(24))
+    return grid
+
+# Returns a list of QSO records, in log order (newest first, as logged by VCL)
+def generate_log(qso_count, contest_number=2, dupe_rate=0.02, rover_grids=1, six_char_rate=0.3, seed=0):
+    rng = random.Random(seed)
+    bands = CONTEST_BANDS[contest_number]
+    band_weights = [1 / (i + 1)**2 for i in range(0, len(bands))]  # More activity on the lower bands
+    modes = CONTEST_MODES[contest_number]
+    if CONTEST_DIST[contest_number]: six_char_rate = 1   # Distance contests require 6-character grid squares
+    # Own grid squares: a rover moves to a neighbour grid square at regular intervals
+    own_grids = [OWN_GRIDSQUARE]
+    while (len(own_grids) < rover_grids):
+        own_grids.append(offset_gridsquare(own_grids[-1], rng.choice([-1, 1]), rng.choice([-1, 0, 1]), rng, True))
+    # Station pool: each station has a home grid square and is worked on several bands
+    stations = []
+    for i in range(0, max(10, qso_count // 3)):
+        callsign = rng.choice(CALL_PREFIXES) + "".join(chr(65 + rng.randrange(26)) for j in range(0, rng.randint(1, 3)))
+        if (rng.random() < 0.05): callsign += "/R"
+        grid = offset_gridsquare(OWN_GRIDSQUARE, rng.randint(-8, 8), rng.randint(-5, 5), rng, rng.random() < six_char_rate)
+        stations.append((callsign, grid))
+    minutes = [rng.randrange(CONTEST_HOURS * 60) for i in range(0, qso_count)]
+    minutes.sort()
+    records = []
+    for i in range(0, qso_count):
+        own_grid = own_grids[i * len(own_grids) // qso_count]
+        when = CONTEST_START + datetime.timedelta(minutes=minutes[i])
+        if (len(records) > 0) and (rng.random() < dupe_rate):
+            dupe = rng.choice(records)  # Same station, band and grids worked again
+            band, mode, callsign, grid = dupe.band, dupe.mode, dupe.callsign, dupe.gridsquare
+            own_grid = dupe.own_gridsquare
+        else:
+            callsign, grid = rng.choice(stations)
+            band = rng.choices(bands, band_weights)[0]
+            mode = rng.choice(modes)
+        records.append(QSO_Record(when.strftime('%Y-%m-%d'), when.strftime('%H%M'), band, mode, callsign, grid, own_grid,
+                                  qso_distance(own_grid, grid)))
+    records.reverse()
+    return records
+
+def write_log(filename, records):
+    with open(filename, 'w') as file:
+        file.writelines(record.to_csv_line() for record in records)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Writes a synthetic VCL contest log (.VHFlog).")
+    parser.add_argument("-n", "--qsos", type=int, default=1000, help="number of QSOs (default 1000)")
+    parser.add_argument("-c", "--contest", type=int, default=2, choices=range(1, len(CONTESTS)), metavar="NUMBER",
+                        help="contest number, for the bands and modes (default 2, ARRL June VHF Contest)")
+    parser.add_argument("--dupe-rate", type=float, default=0.02, help="share of dupe QSOs (default 0.02)")
+    parser.add_argument("--rover-grids", type=int, default=1, help="number of own grid squares (default 1, fixed station)")
+    parser.add_argument("--six-char-rate", type=float, default=0.3, help="share of 6-character grid squares (default 0.3)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed (default 0)")
+    parser.add_argument("output", help=".VHFlog file to write")
+    args = parser.parse_args(argv)
+    write_log(args.output, generate_log(args.qsos, args.contest, args.dupe_rate, args.rover_grids, args.six_char_rate, args.seed))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
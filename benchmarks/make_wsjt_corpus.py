@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Writes the WSJT-X message replay corpus (wsjt_corpus/corpus.bin) and the expected decoded fields of each message
+# (wsjt_corpus/expected.jsonl). The datagrams are encoded here from the WSJT-X NetworkMessage.hpp field lists,
+# independently of wsjt_protocol.py, so that wsjt_replay.py can check the decoder against them. The corpus mimics a busy
+# FT8 band: heartbeats, status updates, many decodes, and logged QSOs (QSO Logged and Logged ADIF messages) from two
+# WSJT-X instances, plus a few edge cases (null strings, non-ASCII text, older schema, unknown message type).
+#
+# Corpus file format: each datagram is preceded by its length (32-bit big-endian unsigned integer).
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+import json
+import os
+import random
+import struct
+import sys
+
+CORPUS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wsjt_corpus")
+MAGIC = 0xADBCCBDA
+
+# Field lists of the message types: (name, QDataStream type)
+FIELDS = {0: [('max_schema', 'quint32'), ('version', 'utf8'), ('revision', 'utf8')],
+          1: [('dial_frequency', 'quint64'), ('mode', 'utf8'), ('dx_call', 'utf8'), ('report', 'utf8'),
+              ('tx_mode', 'utf8'), ('tx_enabled', 'bool'), ('transmitting', 'bool'), ('decoding', 'bool'),
+              ('rx_df', 'quint32'), ('tx_df', 'quint32'), ('de_call', 'utf8'), ('de_grid', 'utf8'), ('dx_grid', 'utf8'),
+              ('tx_watchdog', 'bool'), ('sub_mode', 'utf8'), ('fast_mode', 'bool'), ('special_operation_mode', 'quint8'),
+              ('frequency_tolerance', 'quint32'), ('tr_period', 'quint32'), ('configuration_name', 'utf8'),
+              ('tx_message', 'utf8')],
+          2: [('new', 'bool'), ('time', 'quint32'), ('snr', 'qint32'), ('delta_time', 'double'),
+              ('delta_frequency', 'quint32'), ('mode', 'utf8'), ('message', 'utf8'), ('low_confidence', 'bool'),
+              ('off_air', 'bool')],
+          5: [('date_time_off', 'qdatetime'), ('dx_call', 'utf8'), ('dx_grid', 'utf8'), ('tx_frequency', 'quint64'),
+              ('mode', 'utf8'), ('report_sent', 'utf8'), ('report_received', 'utf8'), ('tx_power', 'utf8'),
+              ('comments', 'utf8'), ('name', 'utf8'), ('date_time_on', 'qdatetime'), ('operator_call', 'utf8'),
+              ('my_call', 'utf8'), ('my_grid', 'utf8'), ('exchange_sent', 'utf8'), ('exchange_received', 'utf8'),
+              ('propagation_mode', 'utf8')],
+          6: [],
+          12: [('adif', 'utf8')]}
+
+
+def encode_field(kind, value):
+    if (kind == 'quint8'): return struct.pack(">B", value)
+    elif (kind == 'bool'): return struct.pack(">B", 1 if value else 0)
+    elif (kind == 'quint32'): return struct.pack(">I", value)
+    elif (kind == 'qint32'): return struct.pack(">i", value)
+    elif (kind == 'quint64'): return struct.pack(">Q", value)
+    elif (kind == 'double'): return struct.pack(">d", value)
+    elif (kind == 'utf8'):
+        if (value is None): return struct.pack(">I", 0xFFFFFFFF)   # Null string
+        data = value.encode('utf-8')
+        return struct.pack(">I", len(data)) + data
+    elif (kind == 'qdatetime'):    # UTC QDateTime: Julian day, ms since midnight, time spec 1
+        julian_day = value.toordinal() - datetime.date(1970, 1, 1).toordinal() + 2440588
+        milliseconds = ((value.hour * 60 + value.minute) * 60 + value.second) * 1000 + value.microsecond // 1000
+        return struct.pack(">qIB", julian_day, milliseconds, 1)
+    raise ValueError(kind)
+
+# Returns the datagram and the expected decoded fields of a message. fields holds the field values, in order; a
+# message of an older schema may have fewer fields (the decoder then leaves the defaults).
+def encode_message(message_type, client_id, fields, schema=3):
+    data = struct.pack(">III", MAGIC, schema, message_type) + encode_field('utf8', client_id)
+    expected = {"schema": schema, "type": message_type, "client_id": client_id or ""}
+    field_list = FIELDS.get(message_type, [])
+    for i in range(0, len(fields)):
+        name, kind = field_list[i]
+        data += encode_field(kind, fields[i])
+        value = fields[i]
+        if (kind == 'qdatetime'): value = value.isoformat()
+        elif (kind == 'utf8') and (value is None): value = ""
+        expected[name] = value
+    return data, expected
+
+def adif_record(call, grid, when, freq, my_call, my_grid):
+    fields = [('call', call), ('gridsquare', grid), ('mode', 'FT8'), ('rst_sent', '-10'), ('rst_rcvd', '-12'),
+              ('qso_date', when.strftime('%Y%m%d')), ('time_on', when.strftime('%H%M%S')),
+              ('qso_date_off', when.strftime('%Y%m%d')), ('time_off', when.strftime('%H%M%S')), ('band', '2m'),
+              ('freq', freq), ('station_callsign', my_call), ('my_gridsquare', my_grid)]
+    return ("\n<adif_ver:5>3.1.0\n<programid:6>WSJT-X\n<EOH>\n"
+            + " ".join("<" + name + ":" + str(len(value)) + ">" + value for name, value in fields) + " <EOR>")
+
+def make_corpus(seed=0, periods=40):
+    rng = random.Random(seed)
+    messages = []
+    start = datetime.datetime(2025, 6, 14, 18, 0, tzinfo=datetime.UTC)
+    instances = [("WSJT-X", 144174000, "FN25BK"), ("WSJT-X - 6m", 50313000, "FN25BK")]
+    calls = ["K1" + chr(65 + i) + chr(65 + (i * 7) % 26) + chr(65 + (i * 3) % 26) for i in range(0, 40)]
+    for client_id, dial, grid in instances:
+        messages.append(encode_message(0, client_id, [3, "2.7.0", "a1b2c3"]))
+    for period in range(0, periods):
+        when = start + datetime.timedelta(seconds=15 * period)
+        for client_id, dial, grid in instances:
+            messages.append(encode_message(1, client_id, [dial, "FT8", "", "", "FT8", False, False, True, 1500, 1500,
+                                                          "VE2ZAZ", grid, "", False, "", False, 0, 20, 15, "Default", ""]))
+            for i in range(0, rng.randint(5, 40)):     # One FT8 period of decodes
+                call = rng.choice(calls)
+                message = rng.choice(["CQ " + call + " FN42", "VE2ZAZ " + call + " -12", call + " VE2ZAZ R-10",
+                                      "CQ TEST " + call + " FN31", call + " W1AW RR73"])
+                ms = ((when.hour * 60 + when.minute) * 60 + when.second) * 1000
+                messages.append(encode_message(2, client_id, [True, ms, rng.randint(-24, 10), round(rng.uniform(-1, 2), 1),
+                                                              rng.randint(200, 2800), "~", message, False, False]))
+            if (period % 5 == 4):   # A QSO logged every 75 s
+                call = rng.choice(calls)
+                dx_grid = "FN" + str(rng.randint(0, 9)) + str(rng.randint(0, 9))
+                messages.append(encode_message(5, client_id, [when, call, dx_grid, dial + 1500, "FT8", "-10", "-12", "100",
+                                                              "", None, when - datetime.timedelta(seconds=75), "",
+                                                              "VE2ZAZ", grid, "", "", ""]))
+                messages.append(encode_message(12, client_id, [adif_record(call, dx_grid, when, "%.6f" % ((dial + 1500) / 1e6),
+                                                                           "VE2ZAZ", grid)]))
+    # Edge cases: non-ASCII id and text, null id, older schema without the optional fields, unknown message type
+    messages.append(encode_message(2, "WSJT-X - Éric", [True, 3600000, -5, 0.3, 1200, "~", "CQ VE2ZAZ FN25 ÀÉ", True]))
+    messages.append(encode_message(0, None, [2], schema=2))
+    messages.append(encode_message(1, "WSJT-X", [144174000, "FT8", "K1ABC", "-05", "FT8", True, True, False, 1500, 1200,
+                                                 "VE2ZAZ", "FN25BK", "FN42"], schema=2))
+    messages.append(encode_message(3, "WSJT-X", []))   # Clear (not decoded by VCL)
+    for client_id, dial, grid in instances: messages.append(encode_message(6, client_id, []))
+    return messages
+
+def main():
+    messages = make_corpus()
+    os.makedirs(CORPUS_DIRECTORY, exist_ok=True)
+    with open(os.path.join(CORPUS_DIRECTORY, "corpus.bin"), 'wb') as file:
+        for data, expected in messages: file.write(struct.pack(">I", len(data)) + data)
+    with open(os.path.join(CORPUS_DIRECTORY, "expected.jsonl"), 'w') as file:
+        for data, expected in messages: file.write(json.dumps(expected, ensure_ascii=False) + "\n")
+    print(str(len(messages)) + " messages written to " + CORPUS_DIRECTORY)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
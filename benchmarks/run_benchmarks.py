@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Benchmark suite. Times the logger's whole-log operations on synthetic logs of increasing size (see generate_log.py):
+# log load, log save, single QSO save, dupe detection, score calculation, sorting, Cabrillo export, grid map box
+# generation and ADIF file reading. No display is needed. Each result is printed as one JSON line:
+#   {"benchmark": "load", "qsos": 10000, "seconds": 0.0412, "repeat": 3, "python": "3.11.4"}
+# where seconds is the best time out of repeat runs.
+#
+# Usage: python3 run_benchmarks.py [--sizes 100,1000,10000,100000] [--repeat 3] [--contest 2] [--output FILE]
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from generate_log import generate_log, write_log, OWN_GRIDSQUARE
+from qso_store import QSO_Store, QSO_Record
+from dupe_index import Dupe_Index
+from score_engine import Score_Engine
+from log_journal import Log_Journal
+from qso_sort import Sort_Order
+from cabrillo import write_cabrillo
+from grid_map import band_grid_boxes
+from adif import ADIF_Writer, read_records
+from band_plan import cabrillo_to_adif
+from contest_tables import CONTEST_BANDS
+
+DEFAULT_SIZES = "100,1000,10000,100000"
+MAP_HEIGHT = 2880       # World grid map at scale 1
+MAP_WIDTH = 5760
+
+
+# Best time (s) of repeat runs of function(). setup(), if any, is run before each run and is not timed.
+def best_time(function, repeat, setup=None):
+    best = None
+    for i in range(0, repeat):
+        if (setup is not None): setup()
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best): best = elapsed
+    return best
+
+def loaded_store(filename):
+    store = QSO_Store()
+    Log_Journal(store).load(filename, compact=False)
+    return store
+
+def count_adif_records(filename):
+    with open(filename, 'rb') as file:
+        return sum(1 for record in read_records(file))
+
+# Runs all the benchmarks on one log size. Returns a list of (benchmark name, seconds).
+def run_size(qso_count, contest_number, repeat, directory):
+    results = []
+    filename = os.path.join(directory, "bench_" + str(qso_count) + ".VHFlog")
+    write_log(filename, generate_log(qso_count, contest_number, rover_grids=3))
+
+    results.append(("load", best_time(lambda: loaded_store(filename), repeat)))
+
+    store = QSO_Store()
+    journal = Log_Journal(store)
+    journal.load(filename, compact=False)
+    dupe_index = Dupe_Index(store, contest_number)
+    engine = Score_Engine(store, dupe_index, contest_number)
+    results.append(("dupe_detection", best_time(dupe_index.rebuild, repeat)))
+    results.append(("score", best_time(engine.rebuild, repeat)))
+
+    save_filename = os.path.join(directory, "bench_save.VHFlog")
+    results.append(("save", best_time(lambda: journal.compact(save_filename), repeat)))
+    # One QSO logged: dupe index and score updates, plus the journal append
+    results.append(("save_qso", best_time(lambda: store.insert(0, QSO_Record('2025-06-15', '2359', '144', 'PH', 'VE2ZZZ',
+                                                                           'FN35', OWN_GRIDSQUARE, 88)), repeat)))
+    for i in range(0, repeat): store.delete(0)
+
+    for column in ('date_time', 'band', 'callsign', 'distance'):
+        sort_order = Sort_Order()
+        sort_order.select(column)
+        results.append(("sort_" + column, best_time(lambda: sort_order.sort(store), repeat)))
+
+    results.append(("cabrillo_export", best_time(lambda: write_cabrillo(io.StringIO(), store, "VE2ZAZ", contest_number,
+                                                                       engine.score()), repeat)))
+    bands = CONTEST_BANDS[contest_number][0:4]  # The map shows up to 4 bands
+    pitch = MAP_HEIGHT / 180
+    results.append(("grid_map_boxes", best_time(lambda: [band_grid_boxes(store, band, 1, MAP_WIDTH / 180, pitch, MAP_HEIGHT)
+                                                         for band in bands], repeat)))
+
+    adif_filename = os.path.join(directory, "bench_" + str(qso_count) + ".adi")
+    with open(adif_filename, 'w') as file:
+        writer = ADIF_Writer(file)
+        writer.write_header()
+        for record in store:
+            writer.write_record([('call', record.callsign), ('band', cabrillo_to_adif(record.band)), ('mode', record.mode),
+                                 ('qso_date', record.date.replace('-', '')), ('time_on', record.time),
+                                 ('gridsquare', record.gridsquare), ('my_gridsquare', record.own_gridsquare)])
+    results.append(("adif_read", best_time(lambda: count_adif_records(adif_filename), repeat)))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times the VCL whole-log operations on synthetic logs.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated log sizes in QSOs (default " + DEFAULT_SIZES + ")")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the best time is kept (default 3)")
+    parser.add_argument("-c", "--contest", type=int, default=2, help="contest number (default 2, ARRL June VHF Contest)")
+    parser.add_argument("--output", help="file to append the JSON results to (default: standard output)")
+    args = parser.parse_args(argv)
+    output = open(args.output, 'a') if (args.output) else sys.stdout
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for qso_count in [int(size) for size in args.sizes.split(",")]:
+                for name, seconds in run_size(qso_count, args.contest, args.repeat, directory):
+                    output.write(json.dumps({"benchmark": name, "qsos": qso_count, "seconds": round(seconds, 6),
+                                             "repeat": args.repeat, "python": platform.python_version()}) + "\n")
+                    output.flush()
+    finally:
+        if (output is not sys.stdout): output.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/python3
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# WSJT-X message replay. Reads a corpus of recorded WSJT-X datagrams (see make_wsjt_corpus.py), decodes every message
+# with wsjt_protocol.py, checks the decoded fields against the expected ones (if an expected.jsonl file is given) and
+# times the decoding. The result is printed as one JSON line, like the other benchmarks:
+#   {"benchmark": "wsjt_decode", "messages": 1843, "seconds": 0.0061, "repeat": 3, "mismatches": 0, ...}
+# With --send, the datagrams are also sent to a running VCL (or any WSJT-X UDP listener), as fast as possible or at
+# a given rate, to replay a busy band into the logger.
+#
+# Usage: python3 wsjt_replay.py [--corpus FILE] [--expected FILE] [--repeat 3] [--send HOST:PORT [--rate N]]
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import argparse
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import socket
+import struct
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from wsjt_protocol import decode_message, WSJT_Protocol_Error
+
+CORPUS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wsjt_corpus")
+_LENGTH = struct.Struct(">I")
+
+
+# Returns the datagrams of a corpus file (each one preceded by its 32-bit big-endian length)
+def read_corpus(filename):
+    with open(filename, 'rb') as file:
+        data = file.read()
+    datagrams = []
+    offset = 0
+    while (offset < len(data)):
+        length = _LENGTH.unpack_from(data, offset)[0]
+        offset += _LENGTH.size
+        datagrams.append(data[offset:offset + length])
+        offset += length
+    return datagrams
+
+# Decoded message as a dictionary of JSON values
+def message_fields(message):
+    fields = {}
+    for name, value in dataclasses.asdict(message).items():
+        if isinstance(value, datetime.datetime): value = value.isoformat()
+        fields[name] = value
+    return fields
+
+# Returns the list of (datagram number, differences) of the messages not decoded as expected
+def check_corpus(datagrams, expected):
+    mismatches = []
+    for i in range(0, len(datagrams)):
+        try:
+            decoded = message_fields(decode_message(datagrams[i]))
+        except WSJT_Protocol_Error as error:
+            mismatches.append((i, str(error)))
+            continue
+        differences = {name: (decoded.get(name), value) for name, value in expected[i].items() if decoded.get(name) != value}
+        if (len(differences) > 0): mismatches.append((i, differences))
+    return mismatches
+
+# Best time (s) to decode all the datagrams, out of repeat runs
+def time_decoding(datagrams, repeat):
+    best = None
+    for i in range(0, repeat):
+        start = time.perf_counter()
+        for datagram in datagrams: decode_message(datagram)
+        elapsed = time.perf_counter() - start
+        if (best is None) or (elapsed < best): best = elapsed
+    return best
+
+# Sends the datagrams to host:port, at rate datagrams per second (0: as fast as possible). Returns the time taken (s).
+def send_corpus(datagrams, address, rate):
+    host, port = address.rsplit(":", 1)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    start = time.perf_counter()
+    try:
+        for i in range(0, len(datagrams)):
+            if (rate > 0):
+                delay = start + i / rate - time.perf_counter()
+                if (delay > 0): time.sleep(delay)
+            sock.sendto(datagrams[i], (host, int(port)))
+    finally:
+        sock.close()
+    return time.perf_counter() - start
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Decodes, checks and times a corpus of recorded WSJT-X datagrams.")
+    parser.add_argument("--corpus", default=os.path.join(CORPUS_DIRECTORY, "corpus.bin"), help="corpus file")
+    parser.add_argument("--expected", default=os.path.join(CORPUS_DIRECTORY, "expected.jsonl"),
+                        help="expected decoded fields, one JSON line per datagram ('' to skip the check)")
+    parser.add_argument("--repeat", type=int, default=3, help="decoding runs, the best time is kept (default 3)")
+    parser.add_argument("--send", metavar="HOST:PORT", help="also send the datagrams to a WSJT-X UDP listener")
+    parser.add_argument("--rate", type=float, default=0, help="datagrams per second sent (default: as fast as possible)")
+    args = parser.parse_args(argv)
+    datagrams = read_corpus(args.corpus)
+    result = {"benchmark": "wsjt_decode", "messages": len(datagrams)}
+    result["seconds"] = round(time_decoding(datagrams, args.repeat), 6)
+    result["repeat"] = args.repeat
+    mismatches = []
+    if (args.expected):
+        with open(args.expected, encoding='utf-8') as file:
+            expected = [json.loads(line) for line in file if line.strip() != ""]
+        if (len(expected) != len(datagrams)):
+            print("Expected file holds " + str(len(expected)) + " messages, corpus " + str(len(datagrams)), file=sys.stderr)
+            return 1
+        mismatches = check_corpus(datagrams, expected)
+        result["mismatches"] = len(mismatches)
+    if (args.send): result["send_seconds"] = round(send_corpus(datagrams, args.send, args.rate), 6)
+    result["python"] = platform.python_version()
+    print(json.dumps(result))
+    for i, differences in mismatches[0:10]:
+        print("Message " + str(i) + ": " + str(differences), file=sys.stderr)
+    return 1 if (len(mismatches) > 0) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
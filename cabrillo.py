@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Cabrillo log file writer. Builds the Cabrillo file submitted to the contest sponsor from the QSO records, without
+# any window, so it can be used by the logger and by the command-line tools. The QSO: lines are streamed to the file
+# in one pass, which also checks each QSO against the contest bands, modes and grid square length.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import os
+import re
+
+from contest_tables import CONTEST_CABRILLO_TITLE, CONTEST_BANDS, CONTEST_MODES, CONTEST_DIST
+
+CABRILLO_EXTENSION = ".cablog"
+WRITE_BUFFER_SIZE = 1 << 20     # The QSO: lines are written in 1 MB blocks
+GRIDSQUARE_PATTERN = re.compile(r"[A-R]{2}[0-9]{2}([A-X]{2})?")
+DATE_PATTERN = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+TIME_PATTERN = re.compile(r"[0-9]{4}")
+
+# Header fields left empty, to be filled in by the operator before submitting the log
+CABRILLO_EMPTY_FIELDS = ['CATEGORY-ASSISTED', 'CATEGORY-BAND', 'CATEGORY-MODE', 'CATEGORY-OPERATOR', 'CATEGORY-POWER',
+                         'CATEGORY-STATION', 'CATEGORY-TRANSMITTER', 'NAME', 'ADDRESS', 'ADDRESS-CITY',
+                         'ADDRESS-STATE-PROVINCE', 'ADDRESS-POSTALCODE', 'ADDRESS-COUNTRY', 'EMAIL']
+
+
+# Cabrillo QSO: line of a QSO record
+def cabrillo_qso_line(record, own_callsign):
+    return ("QSO: " + record.band + " " + record.mode + " " + record.date + " " + record.time + " " + own_callsign.upper()
+            + " " + record.own_gridsquare + " " + record.callsign + " " + record.gridsquare + "\n")
+
+# Cabrillo file name of a log file: the log file name with the .cablog extension (the dots of the directories are kept)
+def cabrillo_filename(log_filename):
+    return os.path.splitext(log_filename)[0] + CABRILLO_EXTENSION
+
+# Checks a QSO record against the Cabrillo format and the rules of a contest. Returns the error message, "" if none.
+# The contests with distance points require 6-character grid squares.
+def cabrillo_qso_error(record, contest_number):
+    if (contest_number > 0):
+        if (record.band not in CONTEST_BANDS[contest_number]): return "Band not in contest: " + record.band
+        if (record.mode not in CONTEST_MODES[contest_number]): return "Mode not in contest: " + record.mode
+    if not(DATE_PATTERN.fullmatch(record.date)) or not(TIME_PATTERN.fullmatch(record.time)): return "Invalid date or time"
+    if (record.callsign == "") or (" " in record.callsign): return "Invalid call sign"
+    for gridsquare in (record.gridsquare, record.own_gridsquare):
+        if not(GRIDSQUARE_PATTERN.fullmatch(gridsquare)): return "Invalid grid square: " + gridsquare
+        if (CONTEST_DIST[contest_number]) and (len(gridsquare) != 6): return "6-character grid square required: " + gridsquare
+    return ""
+
+# Yields the Cabrillo QSO: lines of the records. If errors is a list, the records that fail cabrillo_qso_error()
+# are appended to it as (record, message) pairs; they are written all the same.
+def cabrillo_qso_lines(records, own_callsign, contest_number, errors=None):
+    own_callsign = own_callsign.upper()
+    for record in records:
+        if (errors is not None):
+            error = cabrillo_qso_error(record, contest_number)
+            if (error != ""): errors.append((record, error))
+        yield cabrillo_qso_line(record, own_callsign)
+
+# Writes a complete Cabrillo log (header, QSO: lines, end) to an open text file. The QSO errors are appended to
+# errors, if given (see cabrillo_qso_lines()).
+def write_cabrillo(file, records, own_callsign, contest_number, claimed_score, own_gridsquare="", errors=None):
+    file.write("START-OF-LOG: 3.0\n")
+    file.write("LOCATION: \n")
+    file.write("CALLSIGN: " + own_callsign + "\n")
+    file.write("CONTEST: " + CONTEST_CABRILLO_TITLE[contest_number] + "\n")
+    if (own_gridsquare != ""): file.write("GRID-LOCATOR: " + own_gridsquare + "\n")
+    for field in CABRILLO_EMPTY_FIELDS: file.write(field + ": \n")
+    file.write("CLAIMED-SCORE: " + str(claimed_score) + "\n")
+    file.writelines(cabrillo_qso_lines(records, own_callsign, contest_number, errors))
+    file.write("END-OF-LOG:\n")
+
+# Writes a Cabrillo log file. Returns the list of (record, message) QSO errors.
+# Raises OSError if the file cannot be written.
+def export_cabrillo(filename, records, own_callsign, contest_number, claimed_score, own_gridsquare=""):
+    errors = []
+    with open(filename, 'w', buffering=WRITE_BUFFER_SIZE) as file:
+        write_cabrillo(file, records, own_callsign, contest_number, claimed_score, own_gridsquare, errors)
+    return errors
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Contest definition tables: contest names, bands, modes, QSO points and band factors.
+# Shared by the logger and the command-line tools. Each table is indexed by the contest number.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+CONTESTS = ['Please Select Contest',                       # 0
+            'ARRL January VHF Contest',                    # 1
+            'ARRL June VHF Contest',                       # 2
+            'ARRL September VHF Contest',                  # 3            
+            'NA VHF/UHF Sprint',                           # 4
+            'NA Microwave Sprint (6-char. Grid Sq.)',      # 5
+            'ARRL 222 MHz+ Contest (6-char. Grid Sq.)',    # 6
+            'ARRL 10 GHz+ Contest (6-char. Grid Sq.)',     # 7
+            'CQ World Wide VHF Contest SSB/CW',            # 8
+            'CQ World Wide VHF Contest Digital']           # 9
+
+CONTEST_BANDS = [[''],																												# 0
+                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 1
+                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 2
+                 ['50','144','222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],	# 3
+                 ['50','144','222','432'],																							# 4
+                 ['902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],							# 5
+                 ['222','432','902','1.2G','2.3G','3.4G','5.7G','10G','24G','47G','75G','122G','134G','241G','LIGHT'],				# 6
+                 ['10G','24G','47G','75G','122G','134G','241G','LIGHT'],															# 7
+                 ['50','144'],																										# 8
+                 ['50','144']]																										# 9
+
+# Band Factor only applies to "10 GHz and Up" and the "222 and Up" contests
+BAND_FACTOR =    [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 0
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 1
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 2
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           # 3                                       # 3
+                  [0, 0, 0, 0],                       							 # 4
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],           			 # 5
+                  [2, 1, 4, 2, 6, 10, 10, 6, 20, 20, 20, 20, 20, 20, 0],         # 6
+                  [1, 2, 3, 4, 5, 5, 5, 0],                                      # 7
+                  [0, 0],           											 # 8
+                  [0, 0]]           										     # 9
+
+QSO_POINTS_TBL = [[0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],      # 0
+                  [1, 1, 2, 2, 4, 4, 8, 8, 8, 8, 8, 8, 8, 8, 8, 8, 8],      # 1
+                  [1, 1, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],      # 2
+                  [1, 1, 2, 2, 3, 3, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4],      # 3
+                  [1, 1, 1, 1],                								# 4
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],                	# 5
+                  [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],            # 6
+                  [100, 100, 100, 100, 100, 100, 100, 0],  					# 7
+                  [1, 2],                									# 8
+                  [1, 2]]                									# 9
+
+CONTEST_MODES = [[''],							# 0																					# 0
+                 ['CW','PH','FM','RY','DG'],	# 1
+                 ['CW','PH','FM','RY','DG'],	# 2
+                 ['CW','PH','FM','RY','DG'],	# 3
+                 ['CW','PH','FM','RY','DG'],	# 4																						# 4
+                 ['CW','PH','FM','RY','DG'],	# 5
+                 ['CW','PH','FM','RY','DG'],	# 6
+                 ['CW','PH','FM','RY','DG'],	# 7
+                 ['CW','PH','FM'],				# 8
+                 ['RY','DG']]					# 9
+
+CONTEST_CABRILLO_TITLE = ['',                  # 0
+                          'ARRL-VHF-JAN',      # 1
+                          'ARRL-VHF-JUN',      # 2
+                          'ARRL-VHF-SEP',      # 3
+                          '',                  # 4
+                          '',                  # 5
+                          'ARRL-222',          # 6
+                          'ARRL-10-GHZ',       # 7
+                          'CQ-VHF-SSBCW',      # 8
+                          'CQ-VHF-DIGI']       # 9
+
+# Distance factor: Contests with "True" will take the distance into account for score calculation
+CONTEST_DIST =  [False,   # 0
+                 False,   # 1
+                 False,   # 2
+                 False,   # 3
+                 False,   # 4
+                 True,    # 5                
+                 True,    # 6         
+                 True,    # 7
+                 False,   # 8
+                 False]   # 9
+
+# Contest period length in hours, from the start date and time (UTC), used to filter the imported QSOs.
+# 0: no fixed period (local time periods, or contest spread over two weekends), only the start is checked.
+CONTEST_HOURS = [0,     # 0
+                 33,    # 1
+                 33,    # 2
+                 33,    # 3
+                 4,     # 4
+                 0,     # 5
+                 24,    # 6
+                 0,     # 7
+                 27,    # 8
+                 27]    # 9
+
+# ADIF contest identifier (CONTEST_ID field of the ADIF exports), '' when the contest has none
+CONTEST_ADIF_ID = ['',                  # 0
+                   'ARRL-VHF-JAN',      # 1
+                   'ARRL-VHF-JUN',      # 2
+                   'ARRL-VHF-SEP',      # 3
+                   '',                  # 4
+                   '',                  # 5
+                   'ARRL-222',          # 6
+                   'ARRL-10-GHZ',       # 7
+                   'CQ-VHF',            # 8
+                   'CQ-VHF']            # 9
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Duplicate QSO ("dupe") index. QSOs are grouped in a dictionary by their contest-specific identity, so finding
+# the dupes of a whole log is O(n) and adding, editing or erasing one QSO is O(1).
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+ANALOG_MODES = ['CW','PH','FM']
+DIGITAL_MODES = ['RY','DG']
+
+# Dupe states of a QSO
+FIRST_QSO = 'first'     # Valid QSO that has later dupes (shown in orange)
+DUPE_QSO = 'dupe'       # Duplicate of a previous QSO (shown in red)
+
+
+# Returns the identity of a QSO for dupe checking, or None if the contest does not check dupes.
+# Two QSOs with the same identity are dupes of each other.
+def dupe_key(contest_number, band, mode, callsign, gridsquare, own_gridsquare):
+    if (callsign == "") or (gridsquare == "") or (band == ""): return None
+    if (contest_number in [1, 2, 3, 6, 8, 9]):     # Regular VHF Contests: call + band + 4-char grids
+        return (band, callsign, gridsquare[0:4], own_gridsquare[0:4])
+    elif (contest_number in [4, 5]):        # NA Sprints: a station can be worked both in analog and digital
+        if (mode in ANALOG_MODES): mode_class = 'A'
+        elif (mode in DIGITAL_MODES): mode_class = 'D'
+        else: mode_class = mode
+        return (band, callsign, gridsquare[0:4], own_gridsquare[0:4], mode_class)
+    elif (contest_number == 7):             # 10G+ Contest: call + band, the grid squares are compared within the group
+        return (band, callsign)
+    return None
+
+# Same as dupe_key(), for a QSO_Record
+def record_dupe_key(contest_number, record):
+    return dupe_key(contest_number, record.band, record.mode, record.callsign, record.gridsquare, record.own_gridsquare)
+
+
+# Incremental dupe index over a QSO_Store. It follows the store changes through a store listener.
+# Within a group of QSOs sharing the same identity, the chronologically earliest one is the valid QSO (see
+# _grid_cross_states() for the 10G+ Contest).
+class Dupe_Index:
+
+    def __init__(self, store, contest_number=0):
+        self.store = store
+        self.contest_number = contest_number
+        self.groups = {}        # dupe key -> list of QSO records with that key
+        self.keys = {}          # record id -> dupe key
+        self.states = {}        # record id -> FIRST_QSO or DUPE_QSO. QSOs without dupes are not listed.
+        self.number_dupes = 0
+        self.changed_ids = set()    # ids of records whose dupe state changed since the last take_changed_ids()
+        store.add_listener(self.store_changed)
+        self.rebuild()
+
+    # Changes the contest rules used for the identity, and rebuilds the index
+    def set_contest(self, contest_number):
+        if (contest_number != self.contest_number):
+            self.contest_number = contest_number
+            self.rebuild()
+
+    # Rebuilds the whole index from the store content. O(n).
+    def rebuild(self):
+        self.changed_ids.update(self.states.keys())
+        self.groups = {}
+        self.keys = {}
+        self.states = {}
+        self.number_dupes = 0
+        for record in self.store:
+            key = record_dupe_key(self.contest_number, record)
+            if key is None: continue
+            self.keys[record.id] = key
+            self.groups.setdefault(key, []).append(record)
+        for group in self.groups.values():
+            if len(group) > 1: self._update_group_states(group)
+
+    # Recalculates the dupe states of one group of same-identity QSOs
+    def _update_group_states(self, group):
+        if (self.contest_number == 7): new_states = self._grid_cross_states(group)
+        else: new_states = self._first_qso_states(group)
+        for record in group:
+            new_state = new_states.get(record.id)
+            old_state = self.states.get(record.id)
+            if new_state != old_state:
+                if old_state == DUPE_QSO: self.number_dupes -= 1
+                if new_state == DUPE_QSO: self.number_dupes += 1
+                if new_state is None: del self.states[record.id]
+                else: self.states[record.id] = new_state
+                self.changed_ids.add(record.id)
+
+    # Dupe states of a group of QSOs that are all dupes of each other: the earliest one is the first QSO
+    def _first_qso_states(self, group):
+        if len(group) < 2: return {}
+        first = min(group, key=lambda record: (record.date, record.time))
+        return {record.id: FIRST_QSO if record is first else DUPE_QSO for record in group}
+
+    # Dupe states of a group of 10G+ Contest QSOs (same call sign, same band). A QSO is a dupe of an older QSO when
+    # its grid square is the own grid square of the older QSO (6 characters), and that older QSO is then a first QSO,
+    # unless it is itself a dupe. QSOs of the same date and time are ordered as in the log (newest first).
+    def _grid_cross_states(self, group):
+        if len(group) < 2: return {}
+        group = sorted(group, key=lambda record: (record.date, record.time, -self.store.index_of(record.id)),
+                       reverse=True)    # Newest first
+        dupe_ids = set()
+        first_ids = set()
+        for i in range(0, len(group)):
+            for j in range(i + 1, len(group)):
+                if (group[i].gridsquare[0:6] == group[j].own_gridsquare[0:6]):
+                    dupe_ids.add(group[i].id)
+                    first_ids.add(group[j].id)
+        states = {record_id: FIRST_QSO for record_id in first_ids}
+        states.update({record_id: DUPE_QSO for record_id in dupe_ids})
+        return states
+
+    def _add(self, record):
+        key = record_dupe_key(self.contest_number, record)
+        if key is None: return
+        self.keys[record.id] = key
+        group = self.groups.setdefault(key, [])
+        group.append(record)
+        self._update_group_states(group)
+
+    def _remove(self, record):
+        key = self.keys.pop(record.id, None)
+        if key is None: return
+        group = self.groups[key]
+        for i in range(0, len(group)):
+            if group[i].id == record.id:
+                del group[i]
+                break
+        if self.states.get(record.id) == DUPE_QSO: self.number_dupes -= 1
+        self.states.pop(record.id, None)
+        self.changed_ids.add(record.id)
+        if len(group) == 0: del self.groups[key]
+        else: self._update_group_states(group)
+
+    # QSO_Store listener: keeps the index in sync with the log
+    def store_changed(self, action, record, old_record, index):
+        if (action == 'insert'): self._add(record)
+        elif (action == 'delete'): self._remove(record)
+        elif (action == 'replace'):
+            self._remove(old_record)
+            self._add(record)
+        else: self.rebuild()
+
+    # Returns FIRST_QSO, DUPE_QSO or None for a record id
+    def state(self, record_id):
+        return self.states.get(record_id)
+
+    def is_dupe(self, record_id):
+        return self.states.get(record_id) == DUPE_QSO
+
+    # Returns the list of logged QSO records having this dupe key (empty list if none)
+    def find(self, key):
+        if key is None: return []
+        return self.groups.get(key, [])
+
+    # Returns the set of record ids whose dupe state changed since the last call, and clears it
+    def take_changed_ids(self):
+        changed_ids = self.changed_ids
+        self.changed_ids = set()
+        return changed_ids
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Grid square (Maidenhead locator) geometry: center coordinates, distance and heading between two grid squares.
+# Each locator is decoded once and kept in a bounded cache along with the sine and cosine of its latitude,
+# so a distance or heading calculation only costs a few multiplications. Whole-log distance calculations are done in
+# one vectorized pass with NumPy when it is installed, or with a plain Python loop otherwise.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from functools import lru_cache
+from math import sin, cos, sqrt, atan2, radians, degrees
+try:
+    import numpy        # Optional, speeds up the whole-log distance calculations
+except ImportError:
+    numpy = None
+
+EARTH_RADIUS = 6373.0       # Approximate radius of earth in km
+LOCATOR_CACHE_SIZE = 4096   # Number of decoded locators kept. The least recently used ones are evicted first.
+NUMPY_BATCH_MIN_SIZE = 64   # Below this number of distances, the Python loop is faster than NumPy
+
+
+# Decodes a 6-character grid square (4-character grid squares must be stuffed with 'LL', the center of the grid)
+# and returns (latitude, longitude, latitude in radians, longitude in radians, sin(latitude), cos(latitude)).
+# Raises IndexError or ValueError if the grid square is invalid.
+@lru_cache(maxsize=LOCATOR_CACHE_SIZE)
+def _locator_geometry(gs):
+    #Decode Latitude: 2nd character (a letter)
+    gs_lat = (ord(gs[1]) - 65) * 10
+    #Decode Latitude: 4th character (a digit)
+    gs_lat += int(gs[3])
+    #Decode Latitude: 6th character (a letter)
+    gs_lat += ((ord(gs[5]) - 65)/24) + (1/48) - 90
+    #Decode Longitude: 1st character (a letter)
+    gs_lon = (ord(gs[0]) - 65) * 20
+    #Decode Longitude: 3rd character (a digit)
+    gs_lon += int(gs[2]) * 2
+    #Decode Longitude: 5th character (a letter)
+    gs_lon += ((ord(gs[4]) - 65)/12) + (1/24) - 180
+    gs_lat = round(gs_lat,4)
+    gs_lon = round(gs_lon,4)
+    lat = radians(gs_lat)
+    return (gs_lat, gs_lon, lat, radians(gs_lon), sin(lat), cos(lat))
+
+# Only the first 6 characters of a grid square locate it
+def locator_geometry(gs):
+    return _locator_geometry(gs[0:6])
+
+# Derives the latitude and longitude of the center of a grid square
+def GridSquare_2_LatLong(gs):
+    geometry = locator_geometry(gs)
+    return [geometry[0], geometry[1]]
+
+# Haversine formula on two decoded grid squares, which assumes the earth is a sphere. Returns the distance in km.
+def _haversine(geometry1, geometry2):
+    _, _, lat1, lon1, _, cos_lat1 = geometry1
+    _, _, lat2, lon2, _, cos_lat2 = geometry2
+    dlon = lon2 - lon1
+    dlat = lat2 - lat1
+    a = sin(dlat / 2)**2 + cos_lat1 * cos_lat2 * sin(dlon / 2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    return round(EARTH_RADIUS * c)
+
+# Calculates the distance between two grid squares, based on the haversine formula, which assumes the earth is a sphere.
+def Dist_Between_2_GridSquares(gs1,gs2):
+    return _haversine(locator_geometry(gs1), locator_geometry(gs2))
+
+# Distance of a QSO between the station and the worked grid squares, 4-character grid squares being taken at their
+# center, as calculated by the logger for a typed-in QSO. Raises IndexError or ValueError if a grid square is invalid.
+def qso_distance(own_gridsquare, gridsquare):
+    stuffed_gridsquare = gridsquare.ljust(8, ' ').strip()
+    stuffed_own_gridsquare = own_gridsquare.ljust(8, ' ').strip()
+    if (len(stuffed_gridsquare) == 4): stuffed_gridsquare = stuffed_gridsquare + 'LL'  # Assumes the center of the grid
+    if (len(stuffed_own_gridsquare) == 4): stuffed_own_gridsquare = stuffed_own_gridsquare + 'LL'  # Assumes the center of the grid
+    return Dist_Between_2_GridSquares(stuffed_own_gridsquare, stuffed_gridsquare)
+
+# Calculates the distances between two lists of grid squares, item by item. Returns a list of distances in km,
+# with None where one of the two grid squares is invalid.
+def batch_distances(gs1_list, gs2_list):
+    distances = [None] * len(gs1_list)
+    valid_indexes = []
+    geometries1 = []
+    geometries2 = []
+    for i in range(0, len(gs1_list)):
+        try:
+            geometry1 = locator_geometry(gs1_list[i])
+            geometry2 = locator_geometry(gs2_list[i])
+        except (IndexError, ValueError):
+            continue
+        valid_indexes.append(i)
+        geometries1.append(geometry1)
+        geometries2.append(geometry2)
+    if (numpy is None) or (len(valid_indexes) < NUMPY_BATCH_MIN_SIZE):
+        for k in range(0, len(valid_indexes)):
+            distances[valid_indexes[k]] = _haversine(geometries1[k], geometries2[k])
+    else:
+        array1 = numpy.array(geometries1)     # Columns: lat, lon, lat (rad), lon (rad), sin(lat), cos(lat)
+        array2 = numpy.array(geometries2)
+        dlon = array2[:,3] - array1[:,3]
+        dlat = array2[:,2] - array1[:,2]
+        a = numpy.sin(dlat / 2)**2 + array1[:,5] * array2[:,5] * numpy.sin(dlon / 2)**2
+        c = 2 * numpy.arctan2(numpy.sqrt(a), numpy.sqrt(1 - a))
+        batch = numpy.round(EARTH_RADIUS * c).astype(int).tolist()
+        for k in range(0, len(valid_indexes)):
+            distances[valid_indexes[k]] = batch[k]
+    return distances
+
+def heading_between_grids(gs1, gs2):
+    _, lon1, _, _, sin_phi1, cos_phi1 = locator_geometry(gs1)
+    _, lon2, _, _, sin_phi2, cos_phi2 = locator_geometry(gs2)
+    delta_lambda = radians(lon2 - lon1)
+    x = sin(delta_lambda) * cos_phi2
+    y = cos_phi1 * sin_phi2 - \
+        sin_phi1 * cos_phi2 * cos(delta_lambda)
+    bearing = degrees(atan2(x, y))
+    return (bearing + 360) % 360  # Normalize to 0–360
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Grid map geometry: canvas position of the grid squares worked on a band. Kept apart from the map window so that it
+# can be used (and timed) without any display.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+
+# Grid squares (4 characters) worked on a band, each listed once, in log order
+def band_grid_squares(records, band):
+    grids = {}
+    for record in records:
+        if (record.band == band): grids[record.gridsquare[0:4]] = True
+    return list(grids)
+
+# Canvas coordinates of the lower left corner of a grid square box. The map covers the whole earth, with
+# long_grid_pitch and lat_grid_pitch pixels per grid square.
+def grid_box_corner(gridsquare, long_grid_pitch, lat_grid_pitch, map_height):
+    coord_x = 10 * (ord(gridsquare[0]) - 65) * long_grid_pitch
+    coord_x = coord_x + ((ord(gridsquare[2]) - 48) * long_grid_pitch)
+    coord_y = map_height - (10 * (ord(gridsquare[1]) - 65) * lat_grid_pitch)
+    coord_y = coord_y - ((ord(gridsquare[3]) - 48) * lat_grid_pitch)
+    return coord_x, coord_y
+
+# Polygon points of the box of a grid square. inset (pixels) keeps the boxes of the different bands apart.
+def grid_box(gridsquare, inset, long_grid_pitch, lat_grid_pitch, map_height):
+    x, y = grid_box_corner(gridsquare, long_grid_pitch, lat_grid_pitch, map_height)
+    return [x+inset, y-inset, x+long_grid_pitch-inset, y-inset, x+long_grid_pitch-inset, y-lat_grid_pitch+inset,
+            x+inset, y-lat_grid_pitch+inset]
+
+# Polygon points of the boxes of the grid squares worked on a band
+def band_grid_boxes(records, band, inset, long_grid_pitch, lat_grid_pitch, map_height):
+    return [grid_box(gridsquare, inset, long_grid_pitch, lat_grid_pitch, map_height)
+            for gridsquare in band_grid_squares(records, band)]
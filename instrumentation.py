@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Hot path timing. Records the call count and latency of the main event handlers, the main loop stalls (periodic
+# callbacks running late because the Tk thread was busy) and the keystroke-to-repaint latency of the QSO entry fields.
+# A small overlay window can show the statistics live, and the statistics of the sessions where they were looked at are
+# kept in a session file (the latest SESSIONS_KEPT sessions). The cost is two clock readings per timed call.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+import functools
+import json
+import os
+import time
+from collections import deque
+from tkinter import Toplevel, Label, LEFT
+
+HISTOGRAM_BOUNDS_MS = [0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000]   # Upper bounds of the buckets
+RECENT_SAMPLES = 1000           # Number of latest samples kept for the percentiles
+STALL_PROBE_INTERVAL_MS = 50    # Period of the main loop stall probe
+STALL_THRESHOLD_MS = 100        # A probe this late (ms) counts as a main loop stall
+OVERLAY_REFRESH_MS = 500
+SESSIONS_KEPT = 20              # Number of latest sessions kept in the session file
+KEYSTROKE = 'keystroke_to_repaint'
+STALLS = 'main_loop_stalls'
+
+
+# Latency statistics of one handler: count, total, maximum, histogram and latest samples, in milliseconds
+class Latency_Stats:
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)     # The last bucket is for the larger latencies
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def add(self, milliseconds):
+        self.count += 1
+        self.total += milliseconds
+        self.max = max(self.max, milliseconds)
+        i = 0
+        while (i < len(HISTOGRAM_BOUNDS_MS)) and (milliseconds > HISTOGRAM_BOUNDS_MS[i]): i += 1
+        self.histogram[i] += 1
+        self.recent.append(milliseconds)
+
+    # Percentile (0 to 100) of the latest samples, 0 if none
+    def percentile(self, percent):
+        if (len(self.recent) == 0): return 0.0
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(len(samples) * percent / 100))]
+
+    def summary(self):
+        return {"count": self.count, "total_ms": round(self.total, 3), "max_ms": round(self.max, 3),
+                "p50_ms": round(self.percentile(50), 3), "p99_ms": round(self.percentile(99), 3),
+                "histogram_bounds_ms": HISTOGRAM_BOUNDS_MS, "histogram": self.histogram}
+
+
+# Timing statistics of a program session
+class Instrumentation:
+
+    def __init__(self):
+        self.stats = {}                 # handler name -> Latency_Stats
+        self.session_start = datetime.datetime.now(datetime.UTC)
+        self._keystroke_start = None    # Time of the keystroke being processed
+        self._probe_due = 0.0
+
+    def record(self, name, milliseconds):
+        if name not in self.stats: self.stats[name] = Latency_Stats()
+        self.stats[name].add(milliseconds)
+
+    # Function decorator timing each call of a handler, e.g. @Timing.timed('dupe_check')
+    def timed(self, name):
+        def decorator(function):
+            @functools.wraps(function)
+            def timed_function(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.record(name, (time.perf_counter() - start) * 1000)
+            return timed_function
+        return decorator
+
+    # Starts the main loop stall probe: a callback scheduled every STALL_PROBE_INTERVAL_MS measures how late it runs
+    def start_stall_probe(self, widget):
+        self._probe_due = time.perf_counter() + STALL_PROBE_INTERVAL_MS / 1000
+        widget.after(STALL_PROBE_INTERVAL_MS, lambda: self._stall_probe(widget))
+
+    def _stall_probe(self, widget):
+        late = (time.perf_counter() - self._probe_due) * 1000
+        if (late >= STALL_THRESHOLD_MS): self.record(STALLS, late)
+        self.start_stall_probe(widget)
+
+    # Times the keystrokes of entry widgets, from the key press until the display is updated after the key release
+    # (the idle callbacks queued by the key handlers, redraws included, are done). The timing bindings are placed
+    # before and after all the other bindings of each widget.
+    def watch_keystrokes(self, widgets):
+        for widget in widgets:
+            widget.bindtags(("VCL_Key_Start",) + widget.bindtags() + ("VCL_Key_End",))
+            widget.bind_class("VCL_Key_Start", "<KeyPress>", self._key_pressed)
+            widget.bind_class("VCL_Key_End", "<KeyRelease>", lambda event: event.widget.after_idle(self._key_repainted))
+
+    def _key_pressed(self, event):
+        if (self._keystroke_start is None): self._keystroke_start = time.perf_counter()
+
+    def _key_repainted(self):
+        if (self._keystroke_start is None): return
+        self.record(KEYSTROKE, (time.perf_counter() - self._keystroke_start) * 1000)
+        self._keystroke_start = None
+
+    def summary(self):
+        return {"session_start": self.session_start.strftime('%Y-%m-%d %H:%M:%S'),
+                "session_end": datetime.datetime.now(datetime.UTC).strftime('%Y-%m-%d %H:%M:%S'),
+                "handlers": {name: self.stats[name].summary() for name in sorted(self.stats)}}
+
+    # Adds the session statistics to a session file, one JSON line per session, and drops the sessions older than the
+    # latest SESSIONS_KEPT. The file is replaced in one step. Raises OSError if it fails.
+    def save(self, filename, sessions_kept=SESSIONS_KEPT):
+        try:
+            with open(filename, 'r') as file:
+                sessions = [line for line in file if (line.strip() != "")]
+        except FileNotFoundError:
+            sessions = []
+        sessions = sessions[max(0, len(sessions) - sessions_kept + 1):] + [json.dumps(self.summary()) + "\n"]
+        with open(filename + ".tmp", 'w') as file:
+            file.writelines(sessions)
+        os.replace(filename + ".tmp", filename)
+
+    # Text lines of the overlay window: keystroke latency, stalls, then the handlers taking the most time
+    def report_lines(self, handlers=8):
+        lines = []
+        key = self.stats.get(KEYSTROKE, Latency_Stats())
+        lines.append("Key to repaint  p50 %6.1f ms  p99 %6.1f ms" % (key.percentile(50), key.percentile(99)))
+        stalls = self.stats.get(STALLS, Latency_Stats())
+        lines.append("Main loop stalls %5d       max %6.0f ms" % (stalls.count, stalls.max))
+        lines.append("")
+        lines.append("%-22s %6s %8s %8s" % ("Handler", "Calls", "p50 ms", "p99 ms"))
+        names = [name for name in self.stats if name not in (KEYSTROKE, STALLS)]
+        names.sort(key=lambda name: self.stats[name].total, reverse=True)
+        for name in names[0:handlers]:
+            stats = self.stats[name]
+            lines.append("%-22s %6d %8.1f %8.1f" % (name[0:22], stats.count, stats.percentile(50), stats.percentile(99)))
+        return lines
+
+
+# Small window showing the timing statistics live, refreshed every OVERLAY_REFRESH_MS while it is shown.
+# It is created hidden.
+class Latency_Overlay(Toplevel):
+
+    def __init__(self, master, instrumentation, **options):
+        Toplevel.__init__(self, master, **options)
+        self.instrumentation = instrumentation
+        self.title("VCL - Latency")
+        self.attributes('-topmost', True)
+        self.resizable(False, False)
+        self.label = Label(self, font=("Consolas", 9), justify=LEFT, anchor="w", bg=self.cget("bg"))
+        self.label.pack(padx=4, pady=4)
+        self.protocol('WM_DELETE_WINDOW', self.withdraw)
+        self._refresh_pending = None
+        self.shown = False      # True once the window was shown in the session
+        self.withdraw()
+
+    # Shows the window if hidden, hides it otherwise
+    def toggle(self, event=None):
+        if (self.state() == 'withdrawn'):
+            self.deiconify()
+            self.shown = True
+            self._refresh()
+        else: self.withdraw()
+
+    def _refresh(self):
+        if (self._refresh_pending is not None): self.after_cancel(self._refresh_pending)
+        self._refresh_pending = None
+        if (self.state() == 'withdrawn'): return
+        self.label.config(text="\n".join(self.instrumentation.report_lines()))
+        self._refresh_pending = self.after(OVERLAY_REFRESH_MS, self._refresh)
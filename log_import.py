@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# QSO import: reads the QSOs of an ADIF file (e.g. the wsjtx_log.adi of WSJT-X) or of a CSV file in the .VHFlog
+# format, keeps the ones of the contest period and bands that are not already in the logbook, and returns them as
+# QSO records, to be inserted in the logbook in one batch. The file is read one record at a time.
+# The ADIF record mapping is shared with the ADIF-to-Cabrillo converter.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+
+from adif import read_records
+from band_plan import adif_to_cabrillo, cabrillo_band
+from contest_tables import CONTEST_BANDS, CONTEST_HOURS
+from grid_geometry import qso_distance
+from qso_sort import date_time_key
+from qso_store import QSO_Record
+
+# Cabrillo mode of the ADIF modes that are not digital. All the other ADIF modes (FT8, FT4, MSK144, Q65, JT65...)
+# are digital (DG).
+ADIF_TO_CAB_MODE = {"CW": "CW", "SSB": "PH", "AM": "PH", "FM": "FM", "RTTY": "RY"}
+ADIF_EXTENSIONS = (".adi", ".adif")     # The other files are read as CSV (.VHFlog format)
+START_FORMAT = "%Y-%m-%d %H%M"          # Contest start, e.g. 2025-06-14 1800
+
+
+# Raised when the contest start is not a START_FORMAT date and time
+class Contest_Start_Error(ValueError):
+    pass
+
+
+# Import counters
+class Import_Stats:
+
+    def __init__(self):
+        self.imported = 0
+        self.duplicates = 0     # Already in the logbook, or twice in the file
+        self.out_of_period = 0
+        self.out_of_band = 0    # Not a band of the contest
+        self.invalid = 0        # Records without call sign, date or band (CSV header lines included)
+
+
+# QSO record of an ADIF record, None if the record lacks the call sign, the date or the band.
+# own_gridsquare is used when the record has no my_gridsquare field.
+def adif_qso_record(fields, own_gridsquare=""):
+    callsign = fields.get('call', "").strip().upper()
+    date = fields.get('qso_date', "").strip()
+    band = adif_to_cabrillo(fields.get('band', "").strip())
+    if (band == "") and (fields.get('freq', "").strip() != ""):
+        try:
+            band = cabrillo_band(fields['freq'], 'MHz', "")
+        except ValueError:
+            band = ""
+    if (callsign == "") or (len(date) != 8) or not(date.isdigit()) or (band == ""): return None
+    mode = fields.get('mode', "").strip().upper()
+    mode = ADIF_TO_CAB_MODE.get(mode, "DG" if (mode != "") else "")
+    gridsquare = fields.get('gridsquare', "").strip().upper()[0:6]
+    own_grid = (fields.get('my_gridsquare', "").strip() or own_gridsquare).upper()[0:6]
+    record = QSO_Record(date[0:4] + "-" + date[4:6] + "-" + date[6:8], fields.get('time_on', "").strip()[0:4], band,
+                        mode, callsign, gridsquare, own_grid)
+    update_distance(record)
+    return record
+
+# Calculates the distance of a record from its grid squares, or marks it stale if they are not valid
+def update_distance(record):
+    if (len(record.gridsquare) in (4, 6)) and (len(record.own_gridsquare) in (4, 6)):
+        try:
+            record.distance = qso_distance(record.own_gridsquare, record.gridsquare)
+            record.distance_stale = False
+            return
+        except (IndexError, ValueError):
+            pass
+    record.distance_stale = True
+
+# QSO record of a CSV line in the .VHFlog format, None if the line lacks the call sign, the date or the band
+def csv_qso_record(line, own_gridsquare=""):
+    if (line.strip() == ""): return None
+    record = QSO_Record.from_csv_line(line)
+    if (record.callsign == "") or (record.band == "") or (date_time_key(record) == 0): return None
+    if (record.own_gridsquare == ""): record.own_gridsquare = own_gridsquare
+    if (record.distance_stale): update_distance(record)
+    return record
+
+# Yields the QSO records of an ADIF or CSV file, and None for each record that is not a complete QSO
+def file_records(filename, own_gridsquare=""):
+    if (filename.lower().endswith(ADIF_EXTENSIONS)):
+        with open(filename, 'rb') as file:
+            for fields in read_records(file):
+                yield adif_qso_record(fields, own_gridsquare)
+    else:
+        with open(filename, 'r', errors='replace') as file:
+            for line in file:
+                if (line.strip() != ""): yield csv_qso_record(line, own_gridsquare)
+
+# Fields that make two QSOs exact duplicates
+def qso_key(record):
+    return (record.date, record.time, record.band, record.mode, record.callsign, record.gridsquare,
+            record.own_gridsquare)
+
+# Contest period as a (first, last) pair of date_time_key() numbers. start is a START_FORMAT string, "" for no
+# period. Raises Contest_Start_Error if start is not valid.
+def contest_period(start, contest_number):
+    if (start.strip() == ""): return 0, 0
+    try:
+        start = datetime.datetime.strptime(start.strip(), START_FORMAT)
+    except ValueError:
+        raise Contest_Start_Error("Invalid contest start: " + start) from None
+    first = int(start.strftime("%Y%m%d%H%M"))
+    hours = CONTEST_HOURS[contest_number]
+    if (hours == 0): return first, 0
+    return first, int((start + datetime.timedelta(hours=hours, minutes=-1)).strftime("%Y%m%d%H%M"))
+
+# Reads the QSOs of an ADIF or CSV file to add to a logbook (a QSO_Store, or any list of QSO records): the QSOs
+# of the contest bands, from the contest start (START_FORMAT string, "" for all dates) to the end of the contest period,
+# not already in the logbook. Returns the list of QSO records in the file order and the Import_Stats.
+# Raises Contest_Start_Error if start is not valid (before the file is read), OSError if the file cannot be read, and
+# ValueError if it cannot be parsed.
+def import_qsos(filename, logbook, contest_number, own_gridsquare="", start=""):
+    first, last = contest_period(start, contest_number)
+    bands = set(CONTEST_BANDS[contest_number]) - {''}
+    seen = {qso_key(record) for record in logbook}
+    records = []
+    stats = Import_Stats()
+    for record in file_records(filename, own_gridsquare):
+        if (record is None):
+            stats.invalid += 1
+            continue
+        if (bands) and (record.band not in bands):
+            stats.out_of_band += 1
+            continue
+        date_time = date_time_key(record)
+        if (date_time < first) or ((last > 0) and (date_time > last)):
+            stats.out_of_period += 1
+            continue
+        key = qso_key(record)
+        if (key in seen):
+            stats.duplicates += 1
+            continue
+        seen.add(key)
+        records.append(record)
+    stats.imported = len(records)
+    return records, stats
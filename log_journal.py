@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Append-only journal of the logbook changes. Each QSO add, edit or erase is appended to a small journal file next to
+# the .VHFlog file, so saving one QSO costs a single short write whatever the log size. The journal is periodically
+# compacted into the classic .VHFlog CSV format, and replayed on top of the .VHFlog file when the log is loaded
+# (e.g. after a crash). The files can be written by a background Log_Writer thread, or directly.
+#
+# Journal file format (<logfile>.VHFlog.journal), one entry per line:
+#   #VCL-JOURNAL,<crc>          Header. crc is the CRC-32 of the .VHFlog file the journal applies to.
+#   I,<index>,<QSO CSV line>    QSO inserted at a QSO list position
+#   D,<index>                   QSO erased at a QSO list position
+#   R,<index>,<QSO CSV line>    QSO edited at a QSO list position
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import os
+import zlib
+
+from qso_store import QSO_Record
+from log_writer import write_file
+
+JOURNAL_EXTENSION = ".journal"
+JOURNAL_HEADER = "#VCL-JOURNAL"
+JOURNAL_COMPACT_THRESHOLD = 200     # Number of journal entries after which the log is compacted at the next save
+
+
+# True if a .VHFlog file or its journal is not empty
+def _holds_qsos(filename):
+    for name in (filename, filename + JOURNAL_EXTENSION):
+        if (os.path.exists(name)) and (os.path.getsize(name) > 0): return True
+    return False
+
+
+# CRC-32 of the .VHFlog file of a list of records, as written by Log_Journal.compact()
+def records_crc(records):
+    return zlib.crc32("".join(record.to_csv_line() for record in records).replace("\n", os.linesep).encode())
+
+
+# Journals the changes of a QSO_Store to its log file
+class Log_Journal:
+
+    def __init__(self, store, writer=None, compact_threshold=JOURNAL_COMPACT_THRESHOLD):
+        self.store = store
+        self.writer = writer        # Log_Writer thread doing the file writes, or None to write them directly
+        self.compact_threshold = compact_threshold
+        self.filename = ""          # .VHFlog file journaled, empty if the store content was never saved or loaded
+        self.base_crc = 0           # CRC-32 of the .VHFlog file content
+        self.entries = 0            # Number of entries in the journal file
+        self.unsaved = False        # True when a store change could not be journaled. A compaction is then required.
+        self.loading = False
+        store.add_listener(self.store_changed)
+
+    def journal_filename(self):
+        return self.filename + JOURNAL_EXTENSION
+
+    # QSO_Store listener: appends each QSO change to the journal
+    def store_changed(self, action, record, old_record, index):
+        if (self.loading): return
+        if (action == 'insert'): self._append("I," + str(index) + "," + record.to_csv_line())
+        elif (action == 'delete'): self._append("D," + str(index) + "\n")
+        elif (action == 'replace'): self._append("R," + str(index) + "," + record.to_csv_line())
+        else: self.unsaved = True   # Whole log cleared or reloaded
+
+    # Queues or does a file write. Returns False if it failed or could not be queued.
+    def _write(self, action, filename, text=""):
+        data = text.replace("\n", os.linesep).encode()  # Same line endings as a file written in text mode
+        if (self.writer is not None): return self.writer.queue(action, filename, data)
+        try:
+            write_file(action, filename, data)
+        except OSError:
+            return False
+        return True
+
+    def _append(self, line):
+        if (self.filename == "") or (self.unsaved):
+            self.unsaved = True
+            return
+        if (self.entries == 0): line = JOURNAL_HEADER + "," + str(self.base_crc) + "\n" + line
+        if (self._write('append', self.journal_filename(), line)): self.entries += 1
+        else: self.unsaved = True
+
+    # Loads a .VHFlog file into the store and replays its journal, if any. Raises IOError if the file cannot be read.
+    # A replayed journal is compacted right away, so the .VHFlog file is again complete. So is a log of an older
+    # version, to save the distances calculated by the score engine. With compact False, no file is ever written
+    # (e.g. when checking the log of another station).
+    def load(self, filename, compact=True):
+        if (self.writer is not None): self.writer.flush()   # The files on disk must be up to date
+        # Until the file is read, the store holds no log: a failed load must not save it over the previous log file
+        self.filename = ""
+        self.unsaved = False
+        with open(filename, 'rb') as file:
+            data = file.read()
+        records = [QSO_Record.from_csv_line(line) for line in data.decode(errors='replace').splitlines() if line.strip() != ""]
+        self.filename = filename
+        self.base_crc = zlib.crc32(data)
+        self.entries = 0
+        self.unsaved = False
+        replayed = self._replay(records)
+        stale_records = [record for record in records if (record.distance_stale)]
+        self.loading = True
+        try:
+            self.store.reset(records)
+        finally:
+            self.loading = False
+        # The distances that cannot be calculated (invalid grid squares) stay stale, and do not require a compaction
+        distances_updated = any(not(record.distance_stale) for record in stale_records)
+        if (compact) and ((replayed > 0) or (distances_updated)): self.compact(filename)
+        return replayed
+
+    # Applies the journal entries to a list of records. Returns the number of entries applied.
+    # Replay starts after the last header written for this version of the .VHFlog file: a journal that was not removed
+    # after a compaction (failed write) gets the header of the next compaction appended in its middle. A header of a
+    # compaction whose log file write failed is passed over if it matches the records replayed so far. Replay stops at
+    # any other header, and at the first incomplete or invalid entry (crash during an append).
+    def _replay(self, records):
+        try:
+            with open(self.journal_filename(), 'r') as file:
+                lines = file.readlines()
+        except OSError:
+            return 0
+        base_header = JOURNAL_HEADER + "," + str(self.base_crc)
+        start = len(lines) - 1
+        while (start >= 0) and (lines[start].strip() != base_header): start -= 1
+        if (start < 0): return 0
+        replayed = 0
+        for line in lines[start + 1:]:
+            if not(line.endswith("\n")): break
+            if (line.startswith(JOURNAL_HEADER + ",")):
+                if (line.strip() != JOURNAL_HEADER + "," + str(records_crc(records))): break
+                continue
+            fields = line.rstrip("\n").split(",", 2)
+            try:
+                index = int(fields[1])
+                if (fields[0] == "I") and (len(fields) == 3) and (0 <= index <= len(records)):
+                    records.insert(index, QSO_Record.from_csv_line(fields[2]))
+                elif (fields[0] == "D") and (0 <= index < len(records)):
+                    del records[index]
+                elif (fields[0] == "R") and (len(fields) == 3) and (0 <= index < len(records)):
+                    records[index] = QSO_Record.from_csv_line(fields[2])
+                else: break
+            except (IndexError, ValueError):
+                break
+            replayed += 1
+        return replayed
+
+    # True when the next save must rewrite the whole log file
+    def needs_compaction(self, filename):
+        if (self.writer is not None) and (self.writer.error is not None): return True   # Last background write failed
+        return (self.unsaved) or (filename != self.filename) or (self.entries >= self.compact_threshold)
+
+    # Saves the log. Single QSO changes are already in the journal, so the whole .VHFlog file is only rewritten
+    # when compact is True or when needs_compaction() says so.
+    def save(self, filename, compact=False):
+        if (compact) or (self.needs_compaction(filename)): self.compact(filename)
+
+    # Rewrites the .VHFlog file with the store content and empties the journal. The new file is written to a temporary
+    # file first and then renamed, so a crash leaves either the old or the new log file, never a partial one.
+    # An empty store is never written over a log that it was not loaded from or saved to, if that log holds QSOs
+    # (in the .VHFlog file or in its journal).
+    def compact(self, filename):
+        if (len(self.store) == 0) and (filename != self.filename) and (_holds_qsos(filename)): return
+        data = "".join(record.to_csv_line() for record in self.store)
+        written = self._write('write', filename, data)
+        # After the write, an old journal no longer matches the CRC of the log file and would be ignored at load
+        if (written): written = self._write('remove', filename + JOURNAL_EXTENSION)
+        self.filename = filename
+        self.base_crc = zlib.crc32(data.replace("\n", os.linesep).encode())
+        self.entries = 0
+        self.unsaved = not(written)
+
+    # Compacts the journal if it holds changes. Called at program exit.
+    def close(self):
+        if (self.filename != "") and ((self.entries > 0) or (self.unsaved)): self.compact(self.filename)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Background log file writer. The log file writes are queued by the program and done by a separate thread, so the
+# windows never wait for the disk (slow SD card, network share). Writes still pending when a newer version of the same
+# file is queued are dropped, so a burst of QSOs ends up in a single write.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+import os
+import threading
+from shutil import copy
+
+LOG_WRITER_MAX_PENDING = 500    # Maximum number of queued writes
+
+
+# Does one file write. action is:
+#   'write'  : replaces the file with data (bytes), atomically (temporary file, fsync, rename). A .bak copy of the
+#              previous file is made first.
+#   'append' : appends data (bytes) to the file, followed by an fsync
+#   'remove' : deletes the file
+# Raises OSError if the write fails.
+def write_file(action, filename, data=b""):
+    if (action == 'write'):
+        try:   # Catches a shutil.SameFileError bug that occurs only in Windows
+            if os.path.exists(filename): copy(filename, filename + ".bak") # copies original log to a backup file before any modification.
+        except:
+            pass     # Catches a file copy error.
+        temp_filename = filename + ".tmp"
+        with open(temp_filename, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_filename, filename)
+        # Makes the rename itself durable (not possible on Windows, where directories cannot be opened)
+        if hasattr(os, 'O_DIRECTORY'):
+            try:
+                directory = os.open(os.path.dirname(os.path.abspath(filename)), os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(directory)
+                finally:
+                    os.close(directory)
+            except OSError:
+                pass     # Some file systems (network shares) do not support it. The file itself is written.
+    elif (action == 'append'):
+        with open(filename, 'ab') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+    elif (action == 'remove'):
+        if os.path.exists(filename): os.remove(filename)
+
+
+# Writes the files from a queue in a background thread. Each queued write is (action, filename, data), as for
+# write_file().
+class Log_Writer(threading.Thread):
+
+    def __init__(self, max_pending=LOG_WRITER_MAX_PENDING):
+        threading.Thread.__init__(self, name="Log_Writer", daemon=True)
+        self.max_pending = max_pending
+        self.pending = []               # Queued writes, oldest first
+        self.writing = False            # True while the thread writes a batch of files
+        self.last_flushed = None        # UTC date and time of the last completed batch of writes
+        self.error = None               # Last write error (OSError), None after a successful batch
+        self.stopping = False
+        self.condition = threading.Condition()
+
+    # Queues a write. A 'write' or 'remove' cancels the writes still pending for the same file, and consecutive appends
+    # to the same file are merged. Returns False, without queuing, if the queue is full.
+    def queue(self, action, filename, data=b""):
+        with self.condition:
+            if (action != 'append'):
+                self.pending = [write for write in self.pending if write[1] != filename]
+            if (action == 'append') and (len(self.pending) > 0) and (self.pending[-1][0:2] == ('append', filename)):
+                self.pending[-1] = ('append', filename, self.pending[-1][2] + data)
+            elif (len(self.pending) >= self.max_pending): return False
+            else: self.pending.append((action, filename, data))
+            self.condition.notify_all()
+        return True
+
+    # True when writes are queued or in progress
+    def dirty(self):
+        with self.condition:
+            return (len(self.pending) > 0) or (self.writing)
+
+    # Waits until all queued writes are done (e.g. at program exit). Returns False if the timeout (s) expired.
+    def flush(self, timeout=None):
+        with self.condition:
+            return self.condition.wait_for(lambda: (len(self.pending) == 0) and not(self.writing), timeout)
+
+    # Writes the pending files, then ends the thread
+    def stop(self, timeout=None):
+        with self.condition:
+            self.stopping = True
+            self.condition.notify_all()
+        self.join(timeout)
+
+    def run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: (len(self.pending) > 0) or (self.stopping))
+                if (len(self.pending) == 0): return     # Stopping, with nothing left to write
+                batch = self.pending
+                self.pending = []
+                self.writing = True
+            error = None
+            for action, filename, data in batch:
+                if (error is not None) and (action == 'remove'): continue  # Never delete a file after a failed write
+                try:
+                    write_file(action, filename, data)
+                except OSError as write_error:
+                    error = write_error
+            with self.condition:
+                self.writing = False
+                self.error = error
+                if (error is None): self.last_flushed = datetime.datetime.now(datetime.UTC)
+                self.condition.notify_all()
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Virtualized QSO list. The listbox only holds the lines visible on screen, built from the QSO_Store when displayed,
+# with their stripe and dupe colors. Scrolling or changing a 20,000-QSO log costs the same as a 50-QSO one.
+# The selection follows the QSO record (its id), not a listbox line. Sorting the list only changes the display
+# order: the QSO_Store, and so the log file, keep the QSOs in log order. The list remembers its sort, and an added or
+# edited QSO is placed in it with a binary search on the sort keys, without sorting the list again.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from tkinter import Frame, Listbox, Scrollbar, VERTICAL, HORIZONTAL, RIGHT, BOTTOM, BOTH, END
+from tkinter import font as tkfont
+from bisect import bisect_left
+
+from qso_sort import Sort_Order
+
+STRIPE_COLORS = ["lightcyan2", "lightcyan3"]    # Background colors of the even and odd QSO lines
+WHEEL_SCROLL_LINES = 3
+
+
+# Scrollable list of the QSOs of a QSO_Store. color_function(record_id) returns the font color of a QSO.
+# The selection methods take and return QSO positions in the store (not display lines), like the ones of a Listbox.
+class QSO_List_View(Frame):
+
+    def __init__(self, master, store, color_function, **listbox_options):
+        Frame.__init__(self, master)
+        self.store = store
+        self.color_function = color_function
+        self.top = 0                # Display line of the first displayed QSO
+        self.rows = 1               # Number of lines that fit in the listbox
+        self.selected_id = 0        # Id of the selected QSO record, 0 if none
+        self._line_height = 0       # Height of a listbox line in pixels, 0 when it must be measured again
+        self._render_pending = None
+        self.sort_order = Sort_Order()
+        self.order = None           # QSO records in display order when sorted, None for log order
+        self.keys = []              # Sort keys of the records of self.order
+        self._order_stale = False   # True when the list must be sorted again (log reloaded, distances recalculated)
+        self._rows = None           # Display line of each record id, built when needed
+        self.listbox = Listbox(self, exportselection=False, **listbox_options)
+        self.listbox.pack(fill=BOTH, expand=True)
+        self.yscrollbar = Scrollbar(self.listbox, orient=VERTICAL, command=self.yview)
+        self.yscrollbar.pack(side = RIGHT, fill = BOTH)
+        self.xscrollbar = Scrollbar(self.listbox, orient=HORIZONTAL, command=self.listbox.xview)
+        self.xscrollbar.pack(side = BOTTOM, fill = BOTH)
+        self.listbox.configure(xscrollcommand = self.xscrollbar.set)
+        self.listbox.bind('<<ListboxSelect>>', self._listbox_selected)
+        self.listbox.bind('<Configure>', lambda event: self._render())
+        self.listbox.bind('<MouseWheel>', self._mouse_wheel)     # Windows and macOS
+        self.listbox.bind('<Button-4>', lambda event: self._scroll(-WHEEL_SCROLL_LINES))    # Linux
+        self.listbox.bind('<Button-5>', lambda event: self._scroll(WHEEL_SCROLL_LINES))
+        self.listbox.bind('<Up>', lambda event: self._scroll(-1))
+        self.listbox.bind('<Down>', lambda event: self._scroll(1))
+        self.listbox.bind('<Prior>', lambda event: self._scroll(-self.rows))
+        self.listbox.bind('<Next>', lambda event: self._scroll(self.rows))
+        store.add_listener(self.store_changed)
+
+    # QSO_Store listener: the display is redrawn once the program is idle, so a burst of changes is drawn only once
+    def store_changed(self, action, record, old_record, index):
+        if (action == 'delete') and (record.id == self.selected_id): self.selected_id = 0
+        if (action == 'reset'): self.selected_id = 0
+        self._rows = None
+        if (self.order is not None) and not(self._order_stale):
+            if (action in ('delete', 'replace')):
+                self._remove(old_record if (action == 'replace') else record)
+            if (action in ('insert', 'replace')):
+                key = self.sort_order.key(record)
+                i = bisect_left(self.keys, key)    # A new QSO comes first among the QSOs of equal keys, as in log order
+                self.order.insert(i, record)
+                self.keys.insert(i, key)
+            elif (action == 'reset'): self._order_stale = True
+        self.refresh()
+
+    # Removes a record from the sorted list
+    def _remove(self, record):
+        key = self.sort_order.key(record)
+        i = bisect_left(self.keys, key)
+        while (i < len(self.keys)) and (self.keys[i] == key):
+            if (self.order[i].id == record.id):
+                del self.order[i]
+                del self.keys[i]
+                return
+            i += 1
+        self._order_stale = True    # Its key changed without a store change: the list must be sorted again
+
+    # Sorts the list again on the same columns, e.g. after a recalculation of the QSO distances
+    def resort(self):
+        if (self.order is not None): self._order_stale = True
+        self.refresh()
+
+    # Redraws the displayed QSOs when the program is idle (e.g. after a sort or a dupe color change)
+    def refresh(self):
+        if (self._render_pending is None): self._render_pending = self.after_idle(self._render)
+
+    # Sorts the list on a column. The previous sort columns are kept as tie-breakers.
+    def sort_by(self, column):
+        self.sort_order.select(column)
+        self._sort()
+        self.top = 0
+        if (self.selected_id != 0): self.see(self.store.index_of(self.selected_id))
+        else: self._render()
+
+    # Back to log order
+    def unsort(self):
+        self.sort_order.clear()
+        self.order = None
+        self.keys = []
+        self._order_stale = False
+        self._rows = None
+        self.refresh()
+
+    def _sort(self):
+        self.order, self.keys = self.sort_order.sort(self.store)
+        self._order_stale = False
+        self._rows = None
+
+    # QSO record at a display line
+    def record_at(self, row):
+        if (self.order is None): return self.store[row]
+        if (self._order_stale): self._sort()
+        return self.order[row]
+
+    # Display line of a QSO record, -1 if not in the list
+    def row_of(self, record_id):
+        if (self.order is None): return self.store.index_of(record_id)
+        if (self._order_stale): self._sort()
+        if (self._rows is None): self._rows = {self.order[i].id: i for i in range(0, len(self.order))}
+        return self._rows.get(record_id, -1)
+
+    def set_font(self, font):
+        self.listbox.configure(font=font)
+        self._line_height = 0
+        self._render()
+
+    # Number of QSO lines that fit in the listbox, including a partly visible last one
+    def _fit_rows(self):
+        if (self._line_height == 0):
+            self._line_height = (tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1
+                                 + 2 * int(self.listbox.cget("selectborderwidth")))
+        border = 2 * (int(self.listbox.cget("borderwidth")) + int(self.listbox.cget("highlightthickness")))
+        return max(1, (self.listbox.winfo_height() - border) // self._line_height + 1)
+
+    # Fills the listbox with the visible QSOs only
+    def _render(self):
+        if (self._render_pending is not None):
+            self.after_cancel(self._render_pending)
+            self._render_pending = None
+        self.rows = self._fit_rows()
+        total = len(self.store)
+        self.top = max(0, min(self.top, total - self.rows + 1))
+        bottom = min(self.top + self.rows, total)
+        xview = self.listbox.xview()[0]
+        self.listbox.delete(0, END)
+        records = [self.record_at(i) for i in range(self.top, bottom)]
+        if (len(records) > 0): self.listbox.insert(0, *[record.to_listbox_line() for record in records])
+        for i in range(0, len(records)): # Color the QSO backgrounds in the listbox with alternate colors
+            self.listbox.itemconfigure(i, bg = STRIPE_COLORS[(self.top + i)%2], foreground = self.color_function(records[i].id))
+            if (records[i].id == self.selected_id): self.listbox.selection_set(i)
+        self.listbox.yview_moveto(0)
+        self.listbox.xview_moveto(xview)
+        if (total == 0): self.yscrollbar.set(0, 1)
+        else: self.yscrollbar.set(self.top / total, min(1, (self.top + self.rows - 1) / total))
+
+    def _scroll(self, lines):
+        self.top = max(0, self.top + lines)
+        self._render()
+        return "break"  # The listbox holds the visible lines only, it must not scroll by itself
+
+    def _mouse_wheel(self, event):
+        if (event.delta > 0): return self._scroll(-WHEEL_SCROLL_LINES)
+        return self._scroll(WHEEL_SCROLL_LINES)
+
+    # Scrollbar command
+    def yview(self, *args):
+        total = len(self.store)
+        if (len(args) == 0) or (total == 0): return
+        if (args[0] == 'moveto'): self.top = int(float(args[1]) * total)
+        elif (args[0] == 'scroll'):
+            if (args[2] == 'pages'): self.top += int(args[1]) * max(1, self.rows - 1)
+            else: self.top += int(args[1])
+        self.top = max(0, self.top)
+        self._render()
+
+    def _listbox_selected(self, event):
+        selection = self.listbox.curselection()
+        if (len(selection) > 0) and (self.top + selection[0] < len(self.store)):
+            self.selected_id = self.record_at(self.top + selection[0]).id
+        else: self.selected_id = 0
+
+    # Same as Listbox.curselection(): a tuple with the store position of the selected QSO, or an empty tuple
+    def curselection(self):
+        if (self.selected_id == 0): return ()
+        selected = self.store.index_of(self.selected_id)
+        if (selected < 0): return ()
+        return (selected,)
+
+    def selection_set(self, index):
+        if (0 <= index < len(self.store)): self.selected_id = self.store[index].id
+        self.refresh()
+
+    # All QSOs are deselected, whatever the arguments (kept for compatibility with Listbox.selection_clear())
+    def selection_clear(self, first=0, last=None):
+        self.selected_id = 0
+        self.listbox.selection_clear(0, END)
+
+    # Scrolls the list so that the QSO at this store position is visible
+    def see(self, index):
+        if not(0 <= index < len(self.store)): return
+        row = self.row_of(self.store[index].id)
+        if (row < self.top): self.top = row
+        elif (row >= self.top + self.rows - 1): self.top = row - self.rows + 2
+        self._render()
+
+    def size(self):
+        return len(self.store)
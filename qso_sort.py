@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# QSO list sort order. A sort key is computed once per QSO: date and time as one number, bands in frequency order
+# (not alphabetical), distance as a number. Sorting on a column keeps the previous sort columns as tie-breakers,
+# so sorting by call and then by band lists the calls in alphabetical order within each band.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from band_plan import CABRILLO_BANDS
+
+BANDS_BY_FREQUENCY = CABRILLO_BANDS
+BAND_RANK = {BANDS_BY_FREQUENCY[i]: i for i in range(0, len(BANDS_BY_FREQUENCY))}
+
+SORT_COLUMNS = ['date_time', 'band', 'mode', 'callsign', 'gridsquare', 'own_gridsquare', 'distance']
+MAX_SORT_COLUMNS = 3        # Number of sort columns remembered (the last one selected and 2 tie-breakers)
+
+
+# Date and time of a QSO as a single number (YYYYMMDDHHMM), 0 if not valid
+def date_time_key(record):
+    try:
+        return int(record.date.replace("-", "")) * 10000 + int(record.time)
+    except ValueError:
+        return 0
+
+# Position of a band in frequency order. Unknown bands come after the known ones.
+def band_key(band):
+    return BAND_RANK.get(band, len(BANDS_BY_FREQUENCY))
+
+# Sort key of a QSO for one column. Date/time sorts the newest QSOs first, the other columns in increasing order.
+# The QSOs with a stale distance (not calculated yet, or from invalid grid squares) come after the others.
+def column_key(column, record):
+    if (column == 'date_time'): return -date_time_key(record)
+    elif (column == 'band'): return band_key(record.band)
+    elif (column == 'distance'): return (record.distance_stale, record.distance)
+    return getattr(record, column)
+
+
+# Active sort of the QSO list. columns holds the sort columns, most significant first. No column means log order.
+class Sort_Order:
+
+    def __init__(self):
+        self.columns = []
+
+    def active(self):
+        return len(self.columns) > 0
+
+    # Makes a column the main sort column. The previous sort columns become tie-breakers.
+    def select(self, column):
+        if column not in SORT_COLUMNS: raise ValueError("Unknown sort column: " + str(column))
+        if column in self.columns: self.columns.remove(column)
+        self.columns = ([column] + self.columns)[0:MAX_SORT_COLUMNS]
+
+    def clear(self):
+        self.columns = []
+
+    # Sort key of a QSO, for all the sort columns at once
+    def key(self, record):
+        return tuple(column_key(column, record) for column in self.columns)
+
+    # Returns the records in sort order along with their keys, as two lists. The sort is stable: QSOs with equal
+    # keys stay in log order.
+    def sort(self, records):
+        keyed = sorted(((self.key(records[i]), i) for i in range(0, len(records))))
+        return [records[i] for key, i in keyed], [key for key, i in keyed]
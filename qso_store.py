@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# QSO record store: holds the QSOs of the open logbook as typed records.
+# The QSO listbox of the main window is only a view of this store.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from dataclasses import dataclass
+
+# Field positions in a .VHFlog CSV line (also the column order of the QSO listbox)
+DATE_POS = 0
+TIME_POS = 1
+BAND_POS = 2
+MODE_POS = 3
+CALLSIGN_POS = 4
+GRIDSQUARE_POS = 5
+OWN_GRIDSQUARE_POS = 6
+DISTANCE_POS = 7
+
+
+# One QSO of the logbook
+@dataclass(slots=True)
+class QSO_Record:
+    date: str               # YYYY-MM-DD
+    time: str               # HHMM, UTC
+    band: str               # Cabrillo band name ('50', '144', '1.2G',...)
+    mode: str               # Cabrillo mode ('CW', 'PH', 'FM', 'RY', 'DG')
+    callsign: str
+    gridsquare: str         # Other station's grid square, 4 or 6 characters
+    own_gridsquare: str     # Operator's grid square at the time of the QSO (rovers)
+    distance: int = 0       # Distance between the two grid squares in km
+    id: int = 0             # Unique record id, assigned by the store
+    distance_stale: bool = False    # True when the distance was not calculated from the current grid squares
+
+    # Builds a record from one line of a .VHFlog file. Older logs may lack the own grid square and distance fields,
+    # in which case the distance is marked stale.
+    @classmethod
+    def from_csv_line(cls, line):
+        fields = line.strip().split(",")
+        while len(fields) < 8: fields.append("")
+        distance_stale = False
+        try:
+            distance = int(fields[DISTANCE_POS])
+        except ValueError:
+            distance = 0
+            distance_stale = True
+        return cls(fields[DATE_POS], fields[TIME_POS], fields[BAND_POS], fields[MODE_POS], fields[CALLSIGN_POS],
+                   fields[GRIDSQUARE_POS], fields[OWN_GRIDSQUARE_POS], distance, distance_stale=distance_stale)
+
+    # Returns the distance as text, empty if it is stale
+    def distance_text(self):
+        if (self.distance_stale): return ""
+        return str(self.distance)
+
+    # Returns the record as one line of a .VHFlog file
+    def to_csv_line(self):
+        return (self.date + "," + self.time + "," + self.band + "," + self.mode + "," + self.callsign + ","
+                + self.gridsquare + "," + self.own_gridsquare + "," + self.distance_text() + "\n")
+
+    # Returns the record as a fixed-width line of the QSO listbox
+    def to_listbox_line(self):
+        return (self.date.ljust(12, ' ') + self.time.ljust(6, ' ') + self.band.ljust(6, ' ') + self.mode.ljust(4, ' ')
+                + self.callsign.ljust(10, ' ') + self.gridsquare.ljust(8, ' ') + self.own_gridsquare.ljust(8, ' ')
+                + self.distance_text().ljust(7, ' '))
+
+    # Returns the record fields as a list indexed by the *_POS constants
+    def fields(self):
+        return [self.date, self.time, self.band, self.mode, self.callsign, self.gridsquare, self.own_gridsquare, self.distance_text()]
+
+
+# The in-memory logbook. Records are kept in log order, newest first (index 0 is the newest QSO). The QSO list sorts
+# its own view of them.
+class QSO_Store:
+
+    def __init__(self):
+        self.records = []
+        self._next_id = 1
+        self._listeners = []
+        self._positions = None      # record id -> log position, rebuilt on demand after a change
+
+    # Registers a function called on every change of the store content, as listener(action, record, old_record, index).
+    # action is 'insert', 'delete', 'replace' or 'reset' (whole store reloaded or cleared, record is None).
+    # index is the log position of the change (-1 for a reset).
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def _notify(self, action, record, old_record=None, index=-1):
+        self._positions = None
+        for listener in self._listeners: listener(action, record, old_record, index)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    # Gives the record a unique id if it does not have one yet
+    def _assign_id(self, record):
+        if record.id == 0:
+            record.id = self._next_id
+            self._next_id += 1
+        return record
+
+    # Inserts a record at a log position and returns it
+    def insert(self, index, record):
+        if (index > len(self.records)): index = len(self.records)   # Same as list.insert(), the index is needed by the listeners
+        self.records.insert(index, self._assign_id(record))
+        self._notify('insert', record, None, index)
+        return record
+
+    # Inserts a list of records at a log position, in the list order, e.g. an import. The listeners are notified
+    # once, with a reset, so the dupe index, the score and the logbook file are each updated once for the whole batch.
+    def insert_many(self, index, records):
+        self.records[index:index] = [self._assign_id(record) for record in records]
+        self._notify('reset', None)
+        return records
+
+    # Removes the record at a log position and returns it
+    def delete(self, index):
+        record = self.records.pop(index)
+        self._notify('delete', record, None, index)
+        return record
+
+    # Replaces the record at a log position. The new record keeps the id of the one it replaces.
+    def replace(self, index, record):
+        old_record = self.records[index]
+        record.id = old_record.id
+        self.records[index] = record
+        self._notify('replace', record, old_record, index)
+        return record
+
+    def clear(self):
+        self.records = []
+        self._notify('reset', None)
+
+    # Returns the log position of a record id, or -1 if not found.
+    # The position map is rebuilt once after a change, so repeated lookups (e.g. at each keystroke) are O(1).
+    def index_of(self, record_id):
+        if self._positions is None:
+            self._positions = {self.records[i].id: i for i in range(0, len(self.records))}
+        return self._positions.get(record_id, -1)
+
+    # Replaces the store content with a list of records
+    def reset(self, records):
+        self.records = [self._assign_id(record) for record in records]
+        self._notify('reset', None)
+
+    # Replaces the store content with the QSOs of a .VHFlog file. Raises IOError if the file cannot be read.
+    def load(self, filename):
+        with open(filename, 'r') as file:
+            self.reset([QSO_Record.from_csv_line(line) for line in file if line.strip() != ""])
+
+    # Writes all records to a .VHFlog file
+    def save(self, filename):
+        with open(filename, 'w') as file:
+            file.writelines(record.to_csv_line() for record in self.records)
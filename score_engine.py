@@ -0,0 +1,240 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Incremental contest score engine. It keeps running counters (QSO points, worked grids per band, activated grids,
+# distances) that follow the QSO_Store changes, so adding, editing or erasing one QSO updates the score in O(1)
+# and nothing is recalculated while the log is idle. Interested windows register a listener to be told of changes.
+# A whole-log recalculation (log loaded, contest changed) computes all the distances in one batch.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from collections import Counter
+
+from contest_tables import CONTEST_BANDS, BAND_FACTOR, QSO_POINTS_TBL, CONTEST_DIST
+from dupe_index import record_dupe_key
+from grid_geometry import batch_distances, qso_distance
+
+
+# Score of the QSOs of a QSO_Store, as per the ARRL rules. The dupe index must be registered on the store before
+# the score engine, so that the dupe states are up to date when the engine sees a store change.
+class Score_Engine:
+
+    def __init__(self, store, dupe_index, contest_number=0):
+        self.store = store
+        self.dupe_index = dupe_index
+        self.contest_number = contest_number
+        self._listeners = []
+        self.reset_counters()
+        store.add_listener(self.store_changed)
+        self.rebuild()
+
+    def reset_counters(self):
+        # Counters over all QSOs, dupes included
+        self.own_grids = Counter()      # activated grid square (4 characters) -> number of QSOs
+        self.bands = Counter()          # band -> number of QSOs
+        self.grids = Counter()          # (band, worked grid square) -> number of QSOs. Each key is a multiplier.
+        self.band_calls = Counter()     # (band, callsign) -> number of QSOs. 10G+ Contest QSO points.
+        self.band_error_ids = set()     # ids of QSOs whose band is not part of the contest
+        # Contributions of the non-dupe QSOs
+        self.counted = {}               # record id -> (QSO points, distance, band factor distance)
+        self.dist_error_ids = set()     # ids of non-dupe QSOs whose distance cannot be calculated
+        self.qso_points = 0
+        self.band_calls_points = 0
+        self.total_dist = 0
+        self.tot_band_factor_dist = 0
+
+    # Changes the contest rules and recalculates the whole score
+    def set_contest(self, contest_number):
+        if (contest_number != self.contest_number):
+            self.contest_number = contest_number
+            self.dupe_index.set_contest(contest_number)
+            self.rebuild()
+            self._notify()
+
+    # Recalculates the whole score from the store content. O(n), with the distances calculated in one batch.
+    def rebuild(self):
+        self.reset_counters()
+        for record in self.store: self._add(record, False)
+        valid_records = [record for record in self.store if not self.dupe_index.is_dupe(record.id)]
+        distances = self._distances(valid_records)
+        for i in range(0, len(valid_records)): self._count(valid_records[i], distances[i])
+
+    # Registers a function, called without parameters every time the score changes
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self._listeners: self._listeners.remove(listener)
+
+    def _notify(self):
+        for listener in self._listeners: listener()
+
+    # Returns the position of a band in the contest tables, or -1 if the contest does not include that band
+    def _band_index(self, band):
+        bands = CONTEST_BANDS[self.contest_number]
+        if band in bands: return bands.index(band)
+        return -1
+
+    # Adds a QSO to the counters. count_qso is False during a rebuild, where the QSO points and distances are
+    # counted afterwards for the whole log.
+    def _add(self, record, count_qso=True):
+        self.own_grids[record.own_gridsquare[0:4]] += 1
+        self.bands[record.band] += 1
+        if (self.contest_number == 7): self.grids[(record.band, record.gridsquare[0:6])] += 1  # 10G+ Contest
+        else: self.grids[(record.band, record.gridsquare[0:4])] += 1   # Only consider first 4 grid square characters
+        band_index = self._band_index(record.band)
+        if (band_index < 0): self.band_error_ids.add(record.id)
+        # 10G+ Contest: QSO points are given once per callsign per band, dupes or not
+        self.band_calls[(record.band, record.callsign)] += 1
+        if (self.band_calls[(record.band, record.callsign)] == 1) and (band_index >= 0):
+            self.band_calls_points += QSO_POINTS_TBL[self.contest_number][band_index]
+        if (count_qso): self._update_group(record, True)
+
+    def _remove(self, record):
+        self.own_grids[record.own_gridsquare[0:4]] -= 1
+        if (self.own_grids[record.own_gridsquare[0:4]] == 0): del self.own_grids[record.own_gridsquare[0:4]]
+        self.bands[record.band] -= 1
+        if (self.bands[record.band] == 0): del self.bands[record.band]
+        if (self.contest_number == 7): grid_key = (record.band, record.gridsquare[0:6])
+        else: grid_key = (record.band, record.gridsquare[0:4])
+        self.grids[grid_key] -= 1
+        if (self.grids[grid_key] == 0): del self.grids[grid_key]
+        band_index = self._band_index(record.band)
+        self.band_error_ids.discard(record.id)
+        self.band_calls[(record.band, record.callsign)] -= 1
+        if (self.band_calls[(record.band, record.callsign)] == 0):
+            del self.band_calls[(record.band, record.callsign)]
+            if (band_index >= 0): self.band_calls_points -= QSO_POINTS_TBL[self.contest_number][band_index]
+        self._uncount(record.id)
+        self._update_group(record, False)
+
+    # Re-evaluates which QSOs count for points and distance, among the QSOs that share the dupe identity of a record.
+    # A QSO that turns dupe (or valid) after a change is removed from (or added to) the counts.
+    def _update_group(self, record, record_in_log):
+        group = self.dupe_index.find(record_dupe_key(self.contest_number, record))
+        if (len(group) == 0) and (record_in_log): group = [record]   # QSO without dupe identity
+        for group_record in group:
+            if self.dupe_index.is_dupe(group_record.id): self._uncount(group_record.id)
+            elif (group_record.id not in self.counted): self._count(group_record, self._distances([group_record])[0])
+
+    # Returns the scoring distances of a list of QSOs, with None where the distance cannot be calculated.
+    # The distance stored with a QSO is used as is, unless it is stale or was calculated from other grid squares than
+    # the scoring rules use. The other distances are calculated in one batch, and stale ones are stored back.
+    def _distances(self, records):
+        distances = [None] * len(records)
+        reusable = [False] * len(records)
+        stale_indexes = []
+        gs1_list = []
+        gs2_list = []
+        for i in range(0, len(records)):
+            record = records[i]
+            if (len(record.gridsquare) == 4):   # 4-character grid square: assumes the center of the grid squares
+                gs1 = record.own_gridsquare + 'LL'
+                gs2 = record.gridsquare + 'LL'
+                reusable[i] = len(record.own_gridsquare) in [4, 6]
+            else:
+                gs1 = record.own_gridsquare
+                gs2 = record.gridsquare
+                reusable[i] = (len(record.gridsquare) == 6) and (len(record.own_gridsquare) == 6)
+            if (reusable[i]) and not(record.distance_stale): distances[i] = record.distance
+            else:
+                stale_indexes.append(i)
+                gs1_list.append(gs1)
+                gs2_list.append(gs2)
+        if (len(stale_indexes) > 0):
+            batch = batch_distances(gs1_list, gs2_list)
+            for k in range(0, len(stale_indexes)):
+                i = stale_indexes[k]
+                distances[i] = batch[k]
+                if (batch[k] is not None) and (reusable[i]):
+                    records[i].distance = batch[k]
+                    records[i].distance_stale = False
+                elif (records[i].distance_stale):
+                    # Not the scoring distance: stores the one the logger saves for a typed-in QSO, so it is not
+                    # calculated again at each load
+                    try:
+                        records[i].distance = qso_distance(records[i].own_gridsquare, records[i].gridsquare)
+                        records[i].distance_stale = False
+                    except (IndexError, ValueError):
+                        pass
+        for i in range(0, len(records)):
+            # A QSO between two stations in the same 6-character grid square counts for 1 km
+            if (len(records[i].gridsquare) != 4) and (records[i].own_gridsquare == records[i].gridsquare): distances[i] = 1
+        return distances
+
+    # Adds the QSO points and distance of a non-dupe QSO
+    def _count(self, record, dist):
+        points = 0
+        band_factor_dist = 0
+        band_index = self._band_index(record.band)
+        if (band_index >= 0): points = QSO_POINTS_TBL[self.contest_number][band_index]
+        if (dist is None):
+            self.dist_error_ids.add(record.id)
+            dist = 0
+        elif (len(record.gridsquare) != 4) and (band_index >= 0):
+            # Calculate band factor distance for ARRL 222+ and 10G+ contests (full 6-character grid squares)
+            band_factor_dist = dist * BAND_FACTOR[self.contest_number][band_index]
+        self.counted[record.id] = (points, dist, band_factor_dist)
+        self.qso_points += points
+        self.total_dist += dist
+        self.tot_band_factor_dist += band_factor_dist
+
+    def _uncount(self, record_id):
+        if record_id not in self.counted: return
+        points, dist, band_factor_dist = self.counted.pop(record_id)
+        self.dist_error_ids.discard(record_id)
+        self.qso_points -= points
+        self.total_dist -= dist
+        self.tot_band_factor_dist -= band_factor_dist
+
+    # QSO_Store listener: keeps the counters in sync with the log
+    def store_changed(self, action, record, old_record, index):
+        if (action == 'insert'): self._add(record)
+        elif (action == 'delete'): self._remove(record)
+        elif (action == 'replace'):
+            self._remove(old_record)
+            self._add(record)
+        else: self.rebuild()
+        self._notify()
+
+    # True when the score cannot be calculated for the contest (QSO on a band outside of the contest or bad grid square)
+    def error(self):
+        return (len(self.band_error_ids) > 0) or (len(self.dist_error_ids) > 0)
+
+    def number_qsos(self):
+        return len(self.store)
+
+    def number_dupes(self):
+        return self.dupe_index.number_dupes
+
+    # The sum of unique grids contacted per band
+    def number_grids(self):
+        return len(self.grids)
+
+    def number_activ_grids(self):
+        return len(self.own_grids)
+
+    def number_bands(self):
+        return len(self.bands)
+
+    def points(self):
+        if (self.contest_number == 7): return self.band_calls_points    # 10G+ Contest: unique callsigns per band
+        return self.qso_points
+
+    def multiplier(self):
+        multiplier = len(self.grids)
+        # For ARRL VHF contests, add rover multipliers (1 additional for each grid square worked from)
+        if (1 <= self.contest_number <= 3) and (len(self.own_grids) > 1): multiplier += len(self.own_grids)
+        return multiplier
+
+    # Final score, depending on contest
+    def score(self):
+        if not(CONTEST_DIST[self.contest_number]): return self.points() * self.multiplier()
+        elif (self.contest_number == 5): return self.total_dist              # NA Microwave Sprint (6-char. Grid Sq.)
+        elif (self.contest_number == 6): return self.tot_band_factor_dist    # ARRL 222 MHz+ Contest (6-char. Grid Sq.)
+        elif (self.contest_number == 7): return self.tot_band_factor_dist + self.points()  # ARRL 10 GHz+ Contest
+        return 0
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# Station settings saved by the logger in its config.sav file (open log file, contest, call sign and grid square),
+# read without any window so the command-line tools can use the same settings as the logger.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+from dataclasses import dataclass
+
+CONFIG_FILE = "./config.sav"
+NO_LOG_LOADED = "No Log loaded..."  # Log file name saved when no log is open
+
+# Line positions in config.sav (see process_app_exit() in the logger)
+LOG_FILE_LINE = 0
+CONTEST_NUMBER_LINE = 7
+CALLSIGN_LINE = 8
+GRIDSQUARE_LINE = 9
+
+
+@dataclass(slots=True)
+class Station_Settings:
+    log_file: str = ""          # "" when no log is open
+    contest_number: int = 0
+    callsign: str = ""
+    gridsquare: str = ""
+
+
+# Reads the station settings of a config.sav file. Raises OSError if the file cannot be read, ValueError if it is
+# not a complete config file.
+def read_station_settings(filename=CONFIG_FILE):
+    with open(filename, 'r') as file:
+        lines = [line.rstrip("\n") for line in file]
+    if (len(lines) <= GRIDSQUARE_LINE): raise ValueError("Incomplete config file: " + filename)
+    log_file = lines[LOG_FILE_LINE]
+    return Station_Settings("" if (log_file == NO_LOG_LOADED) else log_file, int(lines[CONTEST_NUMBER_LINE]),
+                            lines[CALLSIGN_LINE], lines[GRIDSQUARE_LINE])
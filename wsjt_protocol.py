@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# WSJT-X UDP message decoder (see NetworkMessage.hpp in the WSJT-X sources). Each datagram starts with a header: magic
+# number 0xADBCCBDA, schema number and message type (32-bit big-endian unsigned integers), followed by the id of the
+# sending WSJT-X instance and the message fields, in Qt QDataStream format. Strings are UTF-8 byte arrays prefixed
+# with their length (0xFFFFFFFF for a null string).
+# The fields are read in place from a memoryview of the datagram; only the returned values are copied.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import datetime
+import struct
+from dataclasses import dataclass
+
+WSJT_MAGIC = 0xADBCCBDA
+HEARTBEAT = 0
+STATUS = 1
+DECODE = 2
+QSO_LOGGED = 5
+CLOSE = 6
+LOGGED_ADIF = 12
+
+NULL_LENGTH = 0xFFFFFFFF        # Length of a null QDataStream string
+JULIAN_DAY_1970 = 2440588       # Julian day number of 1970-01-01
+
+_UINT8 = struct.Struct(">B")
+_UINT32 = struct.Struct(">I")
+_INT32 = struct.Struct(">i")
+_UINT64 = struct.Struct(">Q")
+_INT64 = struct.Struct(">q")
+_DOUBLE = struct.Struct(">d")
+_HEADER = struct.Struct(">III")
+
+
+# Raised for a datagram that is not a valid WSJT-X message (ValueError subclass)
+class WSJT_Protocol_Error(ValueError):
+    pass
+
+
+# Message types. client_id is the id of the WSJT-X instance (e.g. "WSJT-X" or "WSJT-X - 2m").
+@dataclass(slots=True)
+class Message:
+    schema: int
+    type: int
+    client_id: str
+
+@dataclass(slots=True)
+class Heartbeat(Message):
+    max_schema: int = 0
+    version: str = ""
+    revision: str = ""
+
+@dataclass(slots=True)
+class Status(Message):
+    dial_frequency: int = 0     # Hz
+    mode: str = ""
+    dx_call: str = ""
+    report: str = ""
+    tx_mode: str = ""
+    tx_enabled: bool = False
+    transmitting: bool = False
+    decoding: bool = False
+    rx_df: int = 0
+    tx_df: int = 0
+    de_call: str = ""
+    de_grid: str = ""
+    dx_grid: str = ""
+    tx_watchdog: bool = False
+    sub_mode: str = ""
+    fast_mode: bool = False
+    special_operation_mode: int = 0
+    frequency_tolerance: int = 0
+    tr_period: int = 0
+    configuration_name: str = ""
+    tx_message: str = ""
+
+@dataclass(slots=True)
+class Decode(Message):
+    new: bool = False
+    time: int = 0               # ms since midnight, UTC
+    snr: int = 0
+    delta_time: float = 0.0     # s
+    delta_frequency: int = 0    # Hz
+    mode: str = ""
+    message: str = ""
+    low_confidence: bool = False
+    off_air: bool = False
+
+@dataclass(slots=True)
+class QSO_Logged(Message):
+    date_time_off: datetime.datetime = None
+    dx_call: str = ""
+    dx_grid: str = ""
+    tx_frequency: int = 0       # Hz
+    mode: str = ""
+    report_sent: str = ""
+    report_received: str = ""
+    tx_power: str = ""
+    comments: str = ""
+    name: str = ""
+    date_time_on: datetime.datetime = None
+    operator_call: str = ""
+    my_call: str = ""
+    my_grid: str = ""
+    exchange_sent: str = ""
+    exchange_received: str = ""
+    propagation_mode: str = ""
+
+@dataclass(slots=True)
+class Close(Message):
+    pass
+
+@dataclass(slots=True)
+class Logged_ADIF(Message):
+    adif: str = ""
+
+
+# Reads the QDataStream fields of a message, in order
+class _Reader:
+
+    def __init__(self, data, offset=0):
+        self.data = data
+        self.offset = offset
+
+    def _unpack(self, unpacker):
+        try:
+            value = unpacker.unpack_from(self.data, self.offset)[0]
+        except struct.error:
+            raise WSJT_Protocol_Error("Truncated WSJT-X message")
+        self.offset += unpacker.size
+        return value
+
+    def at_end(self):
+        return self.offset >= len(self.data)
+
+    def uint8(self): return self._unpack(_UINT8)
+    def boolean(self): return self._unpack(_UINT8) != 0
+    def uint32(self): return self._unpack(_UINT32)
+    def int32(self): return self._unpack(_INT32)
+    def uint64(self): return self._unpack(_UINT64)
+    def int64(self): return self._unpack(_INT64)
+    def double(self): return self._unpack(_DOUBLE)
+
+    def utf8(self):
+        length = self._unpack(_UINT32)
+        if (length == NULL_LENGTH): return ""
+        end = self.offset + length
+        if (end > len(self.data)): raise WSJT_Protocol_Error("Truncated WSJT-X message")
+        value = str(self.data[self.offset:end], 'utf-8', 'replace')
+        self.offset = end
+        return value
+
+    # QDateTime: Julian day, ms since midnight and time spec (0: local time, 1: UTC, 2: UTC offset in s follows).
+    # Returns a datetime (timezone-aware unless local time), or None for a null date.
+    def date_time(self):
+        julian_day = self.int64()
+        milliseconds = self.uint32()
+        time_spec = self.uint8()
+        offset = self.int32() if (time_spec == 2) else 0
+        if (time_spec == 3): raise WSJT_Protocol_Error("Unsupported QDateTime time zone")
+        if (milliseconds == NULL_LENGTH) or not(1 <= julian_day - JULIAN_DAY_1970 + 719163 <= 3652059): return None
+        value = (datetime.datetime(1970, 1, 1) + datetime.timedelta(days=julian_day - JULIAN_DAY_1970,
+                                                                     milliseconds=milliseconds))
+        if (time_spec == 1): return value.replace(tzinfo=datetime.UTC)
+        elif (time_spec == 2): return value.replace(tzinfo=datetime.timezone(datetime.timedelta(seconds=offset)))
+        return value
+
+    # The remaining optional fields (added by later schema versions), as many as present
+    def optional(self, readers):
+        values = []
+        for reader in readers:
+            if (self.at_end()): break
+            values.append(reader())
+        return values
+
+
+# Decodes a WSJT-X datagram (bytes, bytearray or memoryview). Returns a message object: Heartbeat, Status, Decode,
+# QSO_Logged, Close, Logged_ADIF, or Message (header only) for the other message types.
+# Raises WSJT_Protocol_Error if the datagram is not a valid WSJT-X message.
+def decode_message(datagram):
+    data = memoryview(datagram)
+    try:
+        magic, schema, message_type = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        raise WSJT_Protocol_Error("Datagram too short for a WSJT-X message")
+    if (magic != WSJT_MAGIC): raise WSJT_Protocol_Error("Not a WSJT-X message")
+    reader = _Reader(data, _HEADER.size)
+    client_id = reader.utf8()
+    if (message_type == HEARTBEAT):
+        return Heartbeat(schema, message_type, client_id, reader.uint32(), *reader.optional([reader.utf8, reader.utf8]))
+    elif (message_type == STATUS):
+        return Status(schema, message_type, client_id, reader.uint64(), reader.utf8(), reader.utf8(), reader.utf8(),
+                      reader.utf8(), reader.boolean(), reader.boolean(), reader.boolean(), reader.uint32(),
+                      reader.uint32(), reader.utf8(), reader.utf8(), reader.utf8(),
+                      *reader.optional([reader.boolean, reader.utf8, reader.boolean, reader.uint8, reader.uint32,
+                                        reader.uint32, reader.utf8, reader.utf8]))
+    elif (message_type == DECODE):
+        return Decode(schema, message_type, client_id, reader.boolean(), reader.uint32(), reader.int32(),
+                      reader.double(), reader.uint32(), reader.utf8(), reader.utf8(), reader.boolean(),
+                      *reader.optional([reader.boolean]))
+    elif (message_type == QSO_LOGGED):
+        return QSO_Logged(schema, message_type, client_id, reader.date_time(), reader.utf8(), reader.utf8(),
+                          reader.uint64(), reader.utf8(), reader.utf8(), reader.utf8(), reader.utf8(), reader.utf8(),
+                          reader.utf8(), reader.date_time(),
+                          *reader.optional([reader.utf8, reader.utf8, reader.utf8, reader.utf8, reader.utf8,
+                                            reader.utf8]))
+    elif (message_type == CLOSE):
+        return Close(schema, message_type, client_id)
+    elif (message_type == LOGGED_ADIF):
+        return Logged_ADIF(schema, message_type, client_id, reader.utf8())
+    return Message(schema, message_type, client_id)
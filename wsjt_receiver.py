@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+# Designed for Python 3
+#
+# VCL - VHF & Microwave Contest Logger Software
+# WSJT-X UDP receiver. A background thread waits on the WSJT-X UDP sockets and reads every datagram as soon as it
+# arrives, so bursts from several WSJT-X instances never back up in the socket buffers. Logged QSOs are parsed into QSO
+# records in the thread and handed to the program main loop through a thread-safe queue. The windows never wait for
+# the network. The datagrams are decoded with wsjt_protocol.py; only the Logged ADIF messages are used.
+# Any number of UDP sources can be listened to: unicast ports (one per WSJT-X or JTDX instance) and multicast groups.
+# All the sockets are multiplexed by one selector in the same thread. Each source counts its datagrams, its recent
+# packet rate and, on Linux, the datagrams dropped by the system because its receive buffer was full.
+#
+#  This software, along with all accompanying files and scripts, is free software: you can redistribute it
+#  and/or modify it under the terms of the GNU General Public License as published by the Free Software Foundation,
+#  either version 3 of the License, or any later version. see https://www.gnu.org/licenses/ . When modifying the
+#  software, a mention of the original author, namely Bert-VE2ZAZ, would be a gracious consideration.
+
+import errno
+import queue
+import selectors
+import socket
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+from qso_store import QSO_Record
+from wsjt_protocol import decode_message, Logged_ADIF
+from grid_geometry import qso_distance
+from band_plan import cabrillo_band
+from adif import read_records
+
+DATAGRAM_MAX_SIZE = 65535       # A logged QSO ADIF record may not fit in 1024 bytes
+LOGGED_ADIF_FIELDS = ['call', 'gridsquare', 'qso_date', 'time_on', 'freq']    # ADIF fields of a logged QSO
+SOCKET_BUFFER_SIZE = 1048576   # Socket receive buffer, in bytes, to absorb the bursts while the thread is not running
+SELECT_TIMEOUT = 0.5            # s, how often the thread checks if it must stop
+UDP_IP = ''                     # Unicast ports listen on all the interfaces
+RATE_WINDOW = 10.0              # s, period of the packet rates
+RATE_SAMPLES = 4096             # Number of latest datagram times kept per source for its packet rate
+SOCKET_GONE_ERRORS = (errno.EBADF, errno.ENOTSOCK)  # The socket was closed: no datagram will ever be read from it
+# Linux socket option adding the count of datagrams dropped by the system to each received datagram
+SO_RXQ_OVFL = getattr(socket, 'SO_RXQ_OVFL', 40) if sys.platform.startswith('linux') else None
+_DROP_COUNT = struct.Struct("=I")
+
+
+# QSO record of a WSJT-X logged ADIF record. Raises ValueError if the record is incomplete or invalid.
+def parse_logged_adif(log_string, own_gridsquare):
+    fields = next(read_records(log_string), None)
+    if (fields is None): raise ValueError("No ADIF record")
+    missing = [name for name in LOGGED_ADIF_FIELDS if (fields.get(name, "") == "")]
+    if (len(missing) > 0): raise ValueError("Missing ADIF fields: " + ", ".join(missing))
+    wsjt_date = fields['qso_date'][0:8]
+    wsjt_date = wsjt_date[0:4] + '-' + wsjt_date[4:6] + '-' + wsjt_date[6:8]
+    wsjt_band = cabrillo_band(fields['freq'], 'MHz')     # "???" if out of the band plan
+    return QSO_Record(wsjt_date, fields['time_on'][0:4], wsjt_band, 'DG', fields['call'], fields['gridsquare'],
+                      own_gridsquare, qso_distance(own_gridsquare, fields['gridsquare']))
+
+
+# A UDP source of WSJT-X messages: a unicast port, or a multicast group and port. The datagrams of a disabled source
+# are read and ignored. The counters are updated by the receiver thread.
+class UDP_Source:
+
+    def __init__(self, port, group="", enabled=True):
+        self.port = port
+        self.group = group          # Multicast group address, "" for a unicast port
+        self.enabled = enabled
+        self.socket = None
+        self.error = ""             # Why the socket could not be opened, "" if none
+        self.packets = 0            # Number of datagrams received
+        self.ignored = 0            # Number of datagrams received while disabled
+        self.errors = 0             # Number of invalid datagrams and logged QSOs that could not be parsed
+        self.dropped = 0            # Number of datagrams dropped by the system (Linux only, 0 elsewhere)
+        self.times = deque(maxlen=RATE_SAMPLES)     # Arrival times of the latest datagrams
+
+    # Source as written in the listener list: "2237" or "239.255.0.1:2237"
+    def name(self):
+        if (self.group == ""): return str(self.port)
+        return self.group + ":" + str(self.port)
+
+    # Opens and binds the socket. Returns False, with the reason in self.error, if it fails.
+    def open(self):
+        self.error = ""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            if (self.group != ""):  # Other programs may listen to the same multicast group
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                if hasattr(socket, 'SO_REUSEPORT'): sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                sock.bind((UDP_IP, self.port))
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                                socket.inet_aton(self.group) + socket.inet_aton("0.0.0.0"))
+            else: sock.bind((UDP_IP, self.port))
+            sock.setblocking(False)
+        except OSError as error:
+            sock.close()
+            self.error = error.strerror or str(error)
+            return False
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_BUFFER_SIZE)
+        except OSError:
+            pass    # The system default buffer size is kept
+        if (SO_RXQ_OVFL is not None):
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, SO_RXQ_OVFL, 1)
+            except OSError:
+                pass
+        self.socket = sock
+        return True
+
+    def close(self):
+        if (self.socket is not None): self.socket.close()
+        self.socket = None
+
+    # Packet rate (datagrams per second) of the last RATE_WINDOW seconds
+    def rate(self):
+        since = time.monotonic() - RATE_WINDOW
+        return sum(1 for arrival in list(self.times) if arrival >= since) / RATE_WINDOW
+
+    # One-line status of the source, for the settings window
+    def status(self):
+        if (self.error != ""): return "Error: " + self.error
+        return "%d pkts  %.1f/s  %d dropped" % (self.packets, self.rate(), self.dropped)
+
+
+# Returns the UDP sources of a listener list: port numbers and multicast group:port pairs, separated by commas or
+# spaces, e.g. "2237, 2239, 239.255.0.1:2237". Raises ValueError if the list is not valid.
+def parse_udp_sources(text):
+    sources = []
+    names = set()
+    for item in text.replace(",", " ").split():
+        group, separator, port = item.rpartition(":")
+        if not(port.isdigit()) or not(0 < int(port) < 65536): raise ValueError("Invalid UDP port: " + item)
+        port = int(port)
+        if (group != ""):
+            try:
+                first_byte = socket.inet_aton(group)[0]
+            except OSError:
+                raise ValueError("Invalid multicast group: " + item)
+            if not(224 <= first_byte <= 239) or (len(group.split(".")) != 4):
+                raise ValueError("Invalid multicast group: " + item)
+        source = UDP_Source(port, group)
+        if source.name() in names: continue
+        names.add(source.name())
+        sources.append(source)
+    return sources
+
+# Listener list of UDP sources, as parsed by parse_udp_sources()
+def format_udp_sources(sources):
+    return ", ".join(source.name() for source in sources)
+
+
+# Reads the WSJT-X UDP sources in a background thread. The logged QSOs are put in self.queue as QSO records.
+# own_gridsquare_function() returns the station grid square. The sources can be changed while the thread runs.
+class WSJT_Receiver(threading.Thread):
+
+    def __init__(self, sources, own_gridsquare_function):
+        threading.Thread.__init__(self, name="WSJT_Receiver", daemon=True)
+        self.own_gridsquare_function = own_gridsquare_function
+        self.queue = queue.Queue()
+        self.sources = []
+        self.stopping = False
+        self.selector = selectors.DefaultSelector()
+        self._lock = threading.Lock()
+        self._pending_sources = None
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()     # Wakes the thread up from select()
+        self._wakeup_receiver.setblocking(False)
+        self.selector.register(self._wakeup_receiver, selectors.EVENT_READ, None)
+        self.set_sources(sources)
+
+    # Replaces the UDP sources. The sources kept from the previous list keep their socket and counters.
+    def set_sources(self, sources):
+        with self._lock:
+            self._pending_sources = list(sources)
+        self._wake_up()
+
+    def _wake_up(self):
+        try:
+            self._wakeup_sender.send(b"\0")
+        except OSError:
+            pass    # Already awake
+
+    def run(self):
+        self._apply_sources()
+        while not(self.stopping):
+            for key, events in self.selector.select(SELECT_TIMEOUT):
+                if (key.data is None):
+                    try:
+                        while self._wakeup_receiver.recv(64): pass
+                    except OSError:
+                        pass
+                    self._apply_sources()
+                else: self._drain(key.data)
+        for source in self.sources: source.close()
+        self.selector.close()
+        self._wakeup_receiver.close()
+        self._wakeup_sender.close()
+
+    # Opens the sockets of the new sources and closes the ones of the removed sources
+    def _apply_sources(self):
+        with self._lock:
+            sources, self._pending_sources = self._pending_sources, None
+        if (sources is None): return
+        for source in self.sources:
+            if source not in sources: self._close(source)
+        for source in sources:
+            if (source.socket is None) and source.open():
+                self.selector.register(source.socket, selectors.EVENT_READ, source)
+        self.sources = sources
+
+    def _close(self, source):
+        if (source.socket is None): return
+        try:
+            self.selector.unregister(source.socket)
+        except (KeyError, ValueError):
+            pass
+        source.close()
+
+    # Reads all the datagrams waiting on the socket of a source
+    def _drain(self, source):
+        while True:
+            try:
+                if (SO_RXQ_OVFL is not None):
+                    data, ancillary, flags, addr = source.socket.recvmsg(DATAGRAM_MAX_SIZE, socket.CMSG_SPACE(_DROP_COUNT.size))
+                    for level, option, value in ancillary:
+                        if (level == socket.SOL_SOCKET) and (option == SO_RXQ_OVFL) and (len(value) >= _DROP_COUNT.size):
+                            source.dropped = _DROP_COUNT.unpack_from(value)[0]
+                else: data, addr = source.socket.recvfrom(DATAGRAM_MAX_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as error:
+                # Errors such as ConnectionResetError (an ICMP port unreachable reported by Windows) only concern one
+                # datagram: the next ones are read. A closed socket is removed and reported in the source status.
+                if (error.errno not in SOCKET_GONE_ERRORS): continue
+                self._close(source)
+                source.error = "Socket closed (" + (error.strerror or str(error)) + ")"
+                return
+            source.packets += 1
+            source.times.append(time.monotonic())
+            if not(source.enabled):
+                source.ignored += 1
+                continue
+            try:
+                message = decode_message(data)
+                if isinstance(message, Logged_ADIF):
+                    self.queue.put(parse_logged_adif(message.adif, self.own_gridsquare_function()))
+            except (IndexError, ValueError):    # WSJT_Protocol_Error included
+                source.errors += 1
+
+    # Stops the thread, which closes the sockets
+    def stop(self, timeout=None):
+        self.stopping = True
+        self._wake_up()
+        self.join(timeout)